@@ -21,7 +21,7 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from app.db.base import Base
-from app.models import Contract, WeeklyReport, WeeklyPrice, DailyPrice, WhaleAlert, ContractStatistics
+from app.models import Contract, WeeklyReport, WeeklyPrice, DailyPrice, WhaleAlert, ContractStatistics, RadarSnapshot, ConvictionScore, HistoricalEdgeStat, ForwardReturn, RollingCotIndex, DataVersion
 
 target_metadata = Base.metadata
 
@@ -0,0 +1,32 @@
+"""add_whale_alerts_feed_index
+
+Revision ID: 18b0d2f4a674
+Revises: 07a9c1e3f563
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '18b0d2f4a674'
+down_revision: Union[str, Sequence[str], None] = '07a9c1e3f563'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_whale_alerts_feed', 'whale_alerts',
+        ['report_date', sa.text('coalesce(confidence_score, 1000)'), 'id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_whale_alerts_feed', table_name='whale_alerts')
@@ -0,0 +1,41 @@
+"""create_radar_snapshots_table
+
+Revision ID: a1c3e5f7b901
+Revises: 3214786bd6cf
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f7b901'
+down_revision: Union[str, Sequence[str], None] = '3214786bd6cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('radar_snapshots',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.Date(), nullable=True),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('etag', sa.String(length=64), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('staleness_refreshed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_radar_snapshots_id'), 'radar_snapshots', ['id'], unique=False)
+    op.create_index(op.f('ix_radar_snapshots_report_date'), 'radar_snapshots', ['report_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_radar_snapshots_report_date'), table_name='radar_snapshots')
+    op.drop_index(op.f('ix_radar_snapshots_id'), table_name='radar_snapshots')
+    op.drop_table('radar_snapshots')
@@ -0,0 +1,49 @@
+"""create_conviction_scores_table
+
+Revision ID: b2d4f6a8c013
+Revises: a1c3e5f7b901
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2d4f6a8c013'
+down_revision: Union[str, Sequence[str], None] = 'a1c3e5f7b901'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('conviction_scores',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('rank', sa.Integer(), nullable=True),
+    sa.Column('sentiment_gap', sa.Float(), nullable=True),
+    sa.Column('net_change', sa.BigInteger(), nullable=True),
+    sa.Column('win_rate', sa.Float(), nullable=True),
+    sa.Column('signal_quality', sa.Float(), nullable=True),
+    sa.Column('sentiment_divergence', sa.Float(), nullable=True),
+    sa.Column('capital_momentum', sa.Float(), nullable=True),
+    sa.Column('historical_edge', sa.Float(), nullable=True),
+    sa.Column('concentration', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'report_date', name='uq_contract_conviction')
+    )
+    op.create_index(op.f('ix_conviction_scores_id'), 'conviction_scores', ['id'], unique=False)
+    op.create_index(op.f('ix_conviction_scores_report_date'), 'conviction_scores', ['report_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_conviction_scores_report_date'), table_name='conviction_scores')
+    op.drop_index(op.f('ix_conviction_scores_id'), table_name='conviction_scores')
+    op.drop_table('conviction_scores')
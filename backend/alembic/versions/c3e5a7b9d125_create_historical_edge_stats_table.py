@@ -0,0 +1,45 @@
+"""create_historical_edge_stats_table
+
+Revision ID: c3e5a7b9d125
+Revises: b2d4f6a8c013
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e5a7b9d125'
+down_revision: Union[str, Sequence[str], None] = 'b2d4f6a8c013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('historical_edge_stats',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('threshold', sa.Float(), nullable=False),
+    sa.Column('forward_weeks', sa.Integer(), nullable=False),
+    sa.Column('lookback_years', sa.Integer(), nullable=False),
+    sa.Column('sample_size', sa.Integer(), nullable=True),
+    sa.Column('win_rate', sa.Float(), nullable=True),
+    sa.Column('avg_return', sa.Float(), nullable=True),
+    sa.Column('computed_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'threshold', 'forward_weeks', 'lookback_years', name='uq_contract_edge_stat')
+    )
+    op.create_index(op.f('ix_historical_edge_stats_id'), 'historical_edge_stats', ['id'], unique=False)
+    op.create_index(op.f('ix_historical_edge_stats_contract_id'), 'historical_edge_stats', ['contract_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_historical_edge_stats_contract_id'), table_name='historical_edge_stats')
+    op.drop_index(op.f('ix_historical_edge_stats_id'), table_name='historical_edge_stats')
+    op.drop_table('historical_edge_stats')
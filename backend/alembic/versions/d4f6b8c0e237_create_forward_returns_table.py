@@ -0,0 +1,46 @@
+"""create_forward_returns_table
+
+Revision ID: d4f6b8c0e237
+Revises: c3e5a7b9d125
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4f6b8c0e237'
+down_revision: Union[str, Sequence[str], None] = 'c3e5a7b9d125'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('forward_returns',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.Column('close_price', sa.DECIMAL(precision=16, scale=6), nullable=False),
+    sa.Column('ret_1w', sa.Float(), nullable=True),
+    sa.Column('ret_2w', sa.Float(), nullable=True),
+    sa.Column('ret_4w', sa.Float(), nullable=True),
+    sa.Column('ret_8w', sa.Float(), nullable=True),
+    sa.Column('ret_13w', sa.Float(), nullable=True),
+    sa.Column('ret_26w', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'report_date', name='uq_contract_forward_return')
+    )
+    op.create_index(op.f('ix_forward_returns_id'), 'forward_returns', ['id'], unique=False)
+    op.create_index(op.f('ix_forward_returns_report_date'), 'forward_returns', ['report_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_forward_returns_report_date'), table_name='forward_returns')
+    op.drop_index(op.f('ix_forward_returns_id'), table_name='forward_returns')
+    op.drop_table('forward_returns')
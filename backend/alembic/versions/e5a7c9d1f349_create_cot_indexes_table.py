@@ -0,0 +1,48 @@
+"""create_cot_indexes_table
+
+Revision ID: e5a7c9d1f349
+Revises: d4f6b8c0e237
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7c9d1f349'
+down_revision: Union[str, Sequence[str], None] = 'd4f6b8c0e237'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('cot_indexes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=False),
+    sa.Column('report_date', sa.Date(), nullable=False),
+    sa.Column('dealer_26w', sa.Float(), nullable=True),
+    sa.Column('dealer_52w', sa.Float(), nullable=True),
+    sa.Column('dealer_156w', sa.Float(), nullable=True),
+    sa.Column('asset_mgr_26w', sa.Float(), nullable=True),
+    sa.Column('asset_mgr_52w', sa.Float(), nullable=True),
+    sa.Column('asset_mgr_156w', sa.Float(), nullable=True),
+    sa.Column('lev_money_26w', sa.Float(), nullable=True),
+    sa.Column('lev_money_52w', sa.Float(), nullable=True),
+    sa.Column('lev_money_156w', sa.Float(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('contract_id', 'report_date', name='uq_contract_cot_index')
+    )
+    op.create_index(op.f('ix_cot_indexes_id'), 'cot_indexes', ['id'], unique=False)
+    op.create_index(op.f('ix_cot_indexes_report_date'), 'cot_indexes', ['report_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_cot_indexes_report_date'), table_name='cot_indexes')
+    op.drop_index(op.f('ix_cot_indexes_id'), table_name='cot_indexes')
+    op.drop_table('cot_indexes')
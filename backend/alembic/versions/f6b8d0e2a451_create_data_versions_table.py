@@ -0,0 +1,37 @@
+"""create_data_versions_table
+
+Revision ID: f6b8d0e2a451
+Revises: e5a7c9d1f349
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b8d0e2a451'
+down_revision: Union[str, Sequence[str], None] = 'e5a7c9d1f349'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('data_versions',
+    sa.Column('scope', sa.String(length=50), nullable=False),
+    sa.Column('contract_id', sa.Integer(), nullable=True),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['contract_id'], ['contracts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('scope')
+    )
+    op.create_index(op.f('ix_data_versions_contract_id'), 'data_versions', ['contract_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_data_versions_contract_id'), table_name='data_versions')
+    op.drop_table('data_versions')
@@ -0,0 +1,91 @@
+"""
+Conditional GET helpers: ETags derived from data versions, 304 on If-None-Match
+"""
+import hashlib
+import inspect
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session
+
+from app.services.data.data_version import DataVersionService
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True when the request's If-None-Match lists the (quoted) etag, weak or strong"""
+    if_none_match = request.headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+def versioned_etag(request: Request, version: int, state: Any = None) -> str:
+    """Quoted ETag for this path + query string at a given data version (and extra state)"""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    resource = f"{request.url.path}?{query}" if state is None else f"{request.url.path}?{query}#{state}"
+    digest = hashlib.sha1(resource.encode()).hexdigest()[:16]
+    return f'"v{version}-{digest}"'
+
+
+def conditional_get(
+    contract_param: Optional[str] = None,
+    state: Optional[Callable[[Session], Any]] = None
+) -> Callable:
+    """
+    Emit an ETag from the global data version (or the contract's version when
+    contract_param names the endpoint's contract id parameter) and answer a matching
+    If-None-Match with 304 before the endpoint runs. Only data_versions is queried,
+    plus `state` when given: a cheap query for data that changes without a data
+    version bump (e.g. the radar snapshot etag), folded into the ETag.
+
+    The endpoint must declare `request: Request`, `response: Response` and `db`
+    (a Session, or an AsyncSession for `async def` endpoints). An AsyncSession is
+    closed after the version read, releasing its connection until the next statement.
+    """
+    def decorator(func: Callable) -> Callable:
+        def versions_query(kwargs) -> Callable[[Session], Tuple[Tuple[int, int], Any]]:
+            contract_id = kwargs.get(contract_param) if contract_param else None
+            return lambda db: (
+                DataVersionService(db).get_versions(contract_id),
+                state(db) if state else None
+            )
+
+        def etag_for(kwargs, versions: Tuple[Tuple[int, int], Any]) -> str:
+            (global_version, contract_version), extra = versions
+            return versioned_etag(
+                kwargs["request"], contract_version if contract_param else global_version, extra
+            )
+
+        def with_etag(result, etag: str):
+            if isinstance(result, Response):
+                # Returned responses don't inherit headers set on the injected one
+                result.headers.setdefault("ETag", etag)
+            return result
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                etag = etag_for(kwargs, await kwargs["db"].run_sync(versions_query(kwargs)))
+                # End the version read's transaction: the endpoint may fan out on
+                # other pooled connections (run_concurrently) and must not hold this one
+                await kwargs["db"].close()
+                if etag_matches(kwargs["request"], etag):
+                    return Response(status_code=304, headers={"ETag": etag})
+
+                kwargs["response"].headers["ETag"] = etag
+                return with_etag(await func(*args, **kwargs), etag)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            etag = etag_for(kwargs, versions_query(kwargs)(kwargs["db"]))
+            if etag_matches(kwargs["request"], etag):
+                return Response(status_code=304, headers={"ETag": etag})
+
+            kwargs["response"].headers["ETag"] = etag
+            return with_etag(func(*args, **kwargs), etag)
+        return wrapper
+    return decorator
@@ -0,0 +1,30 @@
+"""
+Shared FastAPI dependencies
+"""
+from typing import AsyncIterator, Iterator
+from fastapi import HTTPException, Request
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import is_admin
+from app.db.session import AsyncSessionLocal, SessionLocal
+
+
+def get_db() -> Iterator[Session]:
+    """Sync session for endpoints that run in the threadpool (blocking I/O)"""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def require_admin(request: Request) -> None:
+    """Dependency of admin-only endpoints: 403 without a valid X-Admin-Token"""
+    if not is_admin(request.headers):
+        raise HTTPException(status_code=403, detail="Requires a valid X-Admin-Token")
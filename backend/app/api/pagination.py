@@ -0,0 +1,64 @@
+"""
+Keyset pagination helpers: opaque cursors and optional total counts.
+
+A cursor holds the sort key of the last row of a page; the next page is the
+rows strictly after it in the same order, read from a matching index instead
+of skipping `offset` rows. Total counts are optional and by default computed
+once per data version (response cache) rather than on every page.
+"""
+import base64
+import json
+from typing import Any, Callable, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.core import cache
+from app.core.config import settings
+
+# Accepted values of the endpoints' `total` parameter
+TOTAL_MODES = "^(cached|exact|none)$"
+
+
+def encode_cursor(*values: Any) -> str:
+    raw = json.dumps([str(v) for v in values], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, types: Sequence[Callable[[str], Any]]) -> Tuple:
+    """Sort key values of a cursor, converted with `types`; 400 when it doesn't parse"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(types):
+            raise ValueError("wrong number of values")
+        return tuple(convert(value) for convert, value in zip(types, values))
+    except (ValueError, TypeError, ArithmeticError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def total_count(
+    db: AsyncSession,
+    mode: str,
+    namespace: str,
+    params: dict,
+    count: Callable[[Session], int]
+) -> Optional[int]:
+    """
+    Total rows matching a listing's filters: None for "none", counted now for
+    "exact", and for "cached" counted once per data version.
+    """
+    if mode == "none":
+        return None
+    if mode == "exact" or not settings.CACHE_ENABLED:
+        return await db.run_sync(count)
+
+    key = await run_in_threadpool(cache.response_cache.make_key, f"count:{namespace}", params)
+    hit = await run_in_threadpool(cache.response_cache.get, key)
+    if hit is not None:
+        return hit
+    value = await db.run_sync(count)
+    await run_in_threadpool(cache.response_cache.set, key, value)
+    return value
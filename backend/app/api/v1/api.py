@@ -1,7 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import alerts, contracts, analysis
+from app.api.v1.endpoints import alerts, contracts, analysis, export, dashboard, events, sync
 
 api_router = APIRouter()
 api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
 api_router.include_router(contracts.router, prefix="/contracts", tags=["contracts"])
 api_router.include_router(analysis.router, prefix="/analysis", tags=["analysis"])
+api_router.include_router(export.router, prefix="/export", tags=["export"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(events.router, prefix="/events", tags=["events"])
+api_router.include_router(sync.router, prefix="/sync", tags=["sync"])
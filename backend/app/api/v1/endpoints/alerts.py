@@ -1,50 +1,149 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from functools import partial
+from datetime import date
+from decimal import Decimal
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, tuple_
+from loguru import logger
 
-from app.db.session import SessionLocal
-from app.models.alert import WhaleAlert
+from app.api.deps import get_async_db
+from app.api.conditional import conditional_get
+from app.api.pagination import TOTAL_MODES, decode_cursor, encode_cursor, total_count
+from app.db.session import run_concurrently, run_in_threads
+from app.db.repository import get_reports_by_date, get_previous_alert_z_scores
+from app.models.alert import WhaleAlert, FEED_ORDER, NULL_CONFIDENCE_SORT_KEY
 from app.models.contract import Contract
+from app.models.daily_price import DailyPrice
 from app.models.report import WeeklyReport
 from app.schemas.alert import WhaleAlertSchema
-from app.services.analysis.technical import TechnicalAnalyzer
 
 router = APIRouter()
 
-def get_db():
+# Cursor values: FEED_ORDER key of the last alert on a page
+ALERT_CURSOR_TYPES = (date.fromisoformat, Decimal, int)
+
+def _contracts_with_daily_prices(db: Session, contract_ids: Set[int]) -> Set[int]:
+    if not contract_ids:
+        return set()
+    return {
+        row.contract_id for row in db.query(DailyPrice.contract_id).filter(
+            DailyPrice.contract_id.in_(contract_ids)
+        ).distinct()
+    }
+
+def _timing_signal(db: Session, contract_id: int) -> Optional[dict]:
+    """Technical timing signal, None when the analysis fails"""
+    # pandas_ta loads on the first alert with daily prices, not at startup
+    from app.services.analysis.technical import TechnicalAnalyzer
+
     try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+        return TechnicalAnalyzer(db).generate_timing_signal(contract_id)
+    except Exception as e:
+        # If technical analysis fails, don't break the entire response
+        logger.warning(f"Technical analysis failed for contract {contract_id}: {e}")
+        return None
 
 @router.get("/", response_model=List[WhaleAlertSchema])
-def get_alerts(
-    db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 50,
+@conditional_get()
+async def get_alerts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    skip: int = Query(0, description="Offset pagination (deprecated: use cursor)"),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    total: str = Query("cached", pattern=TOTAL_MODES, description="X-Total-Count: cached per data version, exact or none"),
     level: Optional[str] = Query(None, description="Filter by Alert Level (High, Medium, Low)"),
     min_confidence: Optional[float] = Query(0, description="Minimum Confidence Score (0-100)")
 ):
     """
     Get latest Whale Alerts with technical timing signals.
+    Keyset pagination: pass the X-Next-Cursor response header as `cursor` for the
+    next page (absent on the last page). X-Total-Count holds the filtered total.
     """
-    query = db.query(WhaleAlert).join(Contract)
-    
+    after = decode_cursor(cursor, ALERT_CURSOR_TYPES) if cursor else None
+    alerts, next_cursor = await alerts_page(db, skip, limit, level, min_confidence, after=after)
+
+    count = await total_count(
+        db, total, "alerts", {"level": level, "min_confidence": min_confidence},
+        lambda s: s.scalar(_filtered(select(func.count(WhaleAlert.id)), level, min_confidence))
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if count is not None:
+        response.headers["X-Total-Count"] = str(count)
+    return alerts
+
+
+def _filtered(query, level: Optional[str], min_confidence: Optional[float]):
     if level:
-        query = query.filter(WhaleAlert.alert_level == level)
-        
+        query = query.where(WhaleAlert.alert_level == level)
     if min_confidence > 0:
-        query = query.filter(WhaleAlert.confidence_score >= min_confidence)
+        query = query.where(WhaleAlert.confidence_score >= min_confidence)
+    return query
 
-    alerts = query.order_by(
-        WhaleAlert.report_date.desc(), 
-        WhaleAlert.confidence_score.desc()
-    ).offset(skip).limit(limit).all()
-    
-    # Initialize TechnicalAnalyzer
-    tech_analyzer = TechnicalAnalyzer(db)
+
+async def alerts_page(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 50,
+    level: Optional[str] = None,
+    min_confidence: Optional[float] = 0,
+    latest_reports: Optional[Dict[int, List[WeeklyReport]]] = None,
+    after: Optional[Tuple] = None
+) -> Tuple[List[WhaleAlertSchema], Optional[str]]:
+    """
+    One page of enriched alerts in FEED_ORDER (descending), and the cursor of the
+    next page (None on the last page). Also used by the dashboard bundle.
+    `after` is a decoded cursor: the page starts after that key (ix_whale_alerts_feed).
+    latest_reports ({contract_id: [newest, ...]}, already loaded by the caller)
+    covers alerts of the latest week; only the other reports are queried.
+    """
+    query = _filtered(
+        select(WhaleAlert).join(Contract).options(contains_eager(WhaleAlert.contract)),
+        level, min_confidence
+    )
+    if after is not None:
+        query = query.where(tuple_(*FEED_ORDER) < tuple_(*after))
+    elif skip:
+        query = query.offset(skip)
+
+    # One extra row tells whether there is a next page
+    rows = (await db.execute(query.order_by(
+        *(column.desc() for column in FEED_ORDER)
+    ).limit(limit + 1))).scalars().all()
+    alerts = rows[:limit]
+    next_cursor = None
+    if len(rows) > limit:
+        last = alerts[-1]
+        next_cursor = encode_cursor(
+            last.report_date,
+            last.confidence_score if last.confidence_score is not None else NULL_CONFIDENCE_SORT_KEY,
+            last.id
+        )
+
+    # Batch lookups for the whole page (reports, previous z-scores, daily data availability), run concurrently
+    contract_ids = {a.contract_id for a in alerts}
+    known = {
+        (r.contract_id, r.report_date): r
+        for reports in (latest_reports or {}).values() for r in reports
+    }
+    missing = [(a.contract_id, a.report_date) for a in alerts if (a.contract_id, a.report_date) not in known]
+    reports_map, prev_z_scores, contracts_with_daily = await run_concurrently(
+        lambda s: {**known, **get_reports_by_date(s, missing)},
+        lambda s: get_previous_alert_z_scores(s, [a.id for a in alerts]),
+        lambda s: _contracts_with_daily_prices(s, contract_ids),
+        release=db
+    )
+
+    # Signal depends only on the contract: compute once per contract on the page
+    timing_ids = sorted(contracts_with_daily)
+    # (pandas_ta: off the event loop)
+    timing_signals = dict(zip(timing_ids, await run_in_threads(
+        *(partial(_timing_signal, contract_id=cid) for cid in timing_ids)
+    )))
     
     # Enrich with contract_name, delta, report, and technical signals
     results = []
@@ -52,34 +151,20 @@ def get_alerts(
         alert_data = WhaleAlertSchema.model_validate(alert)
         alert_data.contract_name = alert.contract.contract_name if alert.contract else "Unknown"
 
-        # Fetch Weekly Report
-        report = db.query(WeeklyReport).filter(
-            WeeklyReport.contract_id == alert.contract_id,
-            WeeklyReport.report_date == alert.report_date
-        ).first()
-        alert_data.report = report
+        # Weekly Report
+        alert_data.report = reports_map.get((alert.contract_id, alert.report_date))
 
         # Calculate Z-Score Delta
-        prev_alert = db.query(WhaleAlert).filter(
-            WhaleAlert.contract_id == alert.contract_id,
-            WhaleAlert.report_date < alert.report_date
-        ).order_by(WhaleAlert.report_date.desc()).first()
-
-        if prev_alert and alert.z_score is not None and prev_alert.z_score is not None:
-            alert_data.z_score_delta = float(alert.z_score) - float(prev_alert.z_score)
+        prev_z_score = prev_z_scores.get(alert.id)
+        if alert.z_score is not None and prev_z_score is not None:
+            alert_data.z_score_delta = float(alert.z_score) - float(prev_z_score)
         else:
             alert_data.z_score_delta = None
 
         # Add Technical Timing Signal (only if daily data exists)
-        try:
-            # Check if any daily prices exist for this contract
-            from app.models.daily_price import DailyPrice
-            has_daily_data = db.query(DailyPrice).filter(
-                DailyPrice.contract_id == alert.contract_id
-            ).limit(1).first() is not None
-            
-            if has_daily_data:
-                timing_signal = tech_analyzer.generate_timing_signal(alert.contract_id)
+        if alert.contract_id in contracts_with_daily:
+            timing_signal = timing_signals.get(alert.contract_id)
+            if timing_signal is not None:
                 alert_data.technical_signal = timing_signal.get('signal', 'Unknown')
                 alert_data.technical_context = {
                     'rsi': timing_signal.get('rsi'),
@@ -88,16 +173,13 @@ def get_alerts(
                     'ema_200': timing_signal.get('ema_200')
                 }
             else:
-                # No daily price data available yet
-                alert_data.technical_signal = "No Data"
+                alert_data.technical_signal = "N/A"
                 alert_data.technical_context = {}
-        except Exception as e:
-            # If technical analysis fails, don't break the entire response
-            from loguru import logger
-            logger.warning(f"Technical analysis failed for contract {alert.contract_id}: {e}")
-            alert_data.technical_signal = "N/A"
+        else:
+            # No daily price data available yet
+            alert_data.technical_signal = "No Data"
             alert_data.technical_context = {}
 
         results.append(alert_data)
         
-    return results
+    return results, next_cursor
@@ -1,153 +1,122 @@
-from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+import math
+from functools import partial
+from typing import List, Any, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, extract, desc
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 
-from app.db.session import SessionLocal
+from app.core.cache import cached, response_cache
+from app.api.conditional import conditional_get, etag_matches
+from app.api.deps import get_db, get_async_db, require_admin
+from app.db.session import SessionLocal, run_concurrently, run_in_threads
 from app.models.contract import Contract
 from app.models.report import WeeklyReport
-from app.services.analysis.cot_staleness import COTStalenessService
-from app.services.analysis.smart_radar import SmartRadarService
+from app.models.cot_index import COT_WINDOWS, TRADER_NET_COLUMNS
+
+# Analysis services (pandas, numpy, scipy, yfinance) are imported inside the
+# endpoints so the app starts without loading them
 
 router = APIRouter()
 
-def get_db():
-    db = SessionLocal()
+# Upper bound on thresholds x horizons x lookbacks cells per contract
+MAX_SWEEP_CELLS = 500
+# Upper bound on bootstrap resamples x cells x contracts of one sweep
+MAX_SWEEP_RESAMPLES = 1_000_000
+# Accepted ranges of the sweep's forward horizons and lookback windows
+MAX_FORWARD_WEEKS = 52
+MAX_LOOKBACK_YEARS = 30
+
+def _parse_csv(value: Optional[str], cast, default: List):
+    if value is None or value == "":
+        return default
     try:
-        yield db
-    finally:
-        db.close()
+        values = sorted(set(cast(v) for v in value.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid list: {value}")
+    if not values:
+        raise HTTPException(status_code=422, detail=f"Empty list: {value}")
+    return values
 
 @router.get("/heatmap")
-def get_market_heatmap(
+@conditional_get()
+@cached("heatmap")
+async def get_market_heatmap(
+    request: Request,
+    response: Response,
     weeks: int = Query(12, ge=4, le=52),
     category: Optional[str] = None,
-    db: Session = Depends(get_db)
+    trader: str = Query("asset_mgr", pattern="^(dealer|asset_mgr|lev_money)$"),
+    window: int = Query(156, description=f"Rolling COT Index window in weeks ({COT_WINDOWS})"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get Heatmap data: COT Index for all active contracts over the last N weeks.
+    Get Heatmap data: rolling COT Index for all active contracts over the last N weeks.
     Returns matrix: Contracts x Weeks.
     """
+    if window not in COT_WINDOWS:
+        raise HTTPException(status_code=422, detail=f"window must be one of {COT_WINDOWS}")
+
     # 1. Get active contracts
-    query = db.query(Contract).filter(Contract.is_active == True)
+    query = select(Contract).where(Contract.is_active == True)
     if category:
-        query = query.filter(Contract.market_category == category)
+        query = query.where(Contract.market_category == category)
     
-    contracts = query.all()
+    contracts = (await db.execute(query)).scalars().all()
+    return await heatmap_data(db, contracts, weeks, trader, window)
+
+
+async def heatmap_data(db: AsyncSession, contracts: List[Contract], weeks: int, trader: str, window: int) -> Dict[str, Any]:
+    """Heatmap matrix for already loaded contracts (also used by the dashboard bundle)"""
+    import pandas as pd
+    from app.services.analysis.cot_index import CotIndexService
+    from app.services.analysis.heatmap import build_heatmap, build_rolling_heatmap
+
     contract_ids = [c.id for c in contracts]
     
     if not contract_ids:
         return {"weeks": [], "data": []}
 
-    # 2. Calculate date range
     end_date = datetime.now().date()
-    start_date = end_date - timedelta(weeks=weeks + 4) # Buffer for rolling calculations if needed
-    
-    # 3. Fetch Weekly Reports for these contracts
-    # We need to calculate COT Index on the fly or fetch it if stored. 
-    # Since we don't store COT Index in WeeklyReport (it's in WhaleAlert), 
-    # we might need to compute it or fetch from WhaleAlerts if available for every week.
-    # However, WhaleAlerts are only for "Signals". 
-    # A proper heatmap needs values for EVERY week, not just alerts.
-    # So we must calculate COT Index (Term = 0-100 position in range).
-    
-    # Let's fetch Reports
-    reports = db.query(
+    start_date = end_date - timedelta(weeks=weeks + 4)
+
+    # 2. Stored rolling COT Index (each week against its own trailing window).
+    # Frames are read and pivoted in the threadpool, off the event loop
+    indexes, = await run_in_threads(lambda s: CotIndexService(s).load(contract_ids, start_date, trader, window))
+    if not indexes.empty:
+        return await run_in_threadpool(build_rolling_heatmap, contracts, indexes, weeks, end_date)
+
+    # 3. Fallback before the first rebuild: net positions normalized against
+    # one fixed min/max over the last `window` weeks
+    net = getattr(WeeklyReport, TRADER_NET_COLUMNS[trader])
+    reports_query = select(
         WeeklyReport.contract_id,
         WeeklyReport.report_date,
-        WeeklyReport.asset_mgr_net,
-        WeeklyReport.lev_net,
-        WeeklyReport.dealer_net
-    ).filter(
+        net.label("net")
+    ).where(
         WeeklyReport.contract_id.in_(contract_ids),
         WeeklyReport.report_date >= start_date
-    ).order_by(WeeklyReport.report_date.desc()).all()
-    
-    # We need a longer lookback to calculate Min/Max for COT Index (typically 3 years / 156 weeks)
-    # This is expensive to do on-the-fly for all contracts.
-    # ALTERNATIVE: Use `statistics` table which has `all_time_min/max` or calculated stats?
-    # Or just fetch simplified data?
-    
-    # Optimized approach:
-    # 1. Fetch 3-year min/max for each contract (pre-calculated or separate query).
-    # 2. Fetch last N weeks of net positions.
-    # 3. Compute Index = (Current - Min) / (Max - Min) * 100
-    
-    # Let's try to get min/max from last 3 years efficiently
-    lookback_date = end_date - timedelta(weeks=156)
-    
-    min_max_query = db.query(
+    )
+
+    lookback_date = end_date - timedelta(weeks=window)
+
+    min_max_query = select(
         WeeklyReport.contract_id,
-        func.min(WeeklyReport.asset_mgr_net).label('min_net'),
-        func.max(WeeklyReport.asset_mgr_net).label('max_net')
-    ).filter(
+        func.min(net).label('min_net'),
+        func.max(net).label('max_net')
+    ).where(
         WeeklyReport.contract_id.in_(contract_ids),
         WeeklyReport.report_date >= lookback_date
-    ).group_by(WeeklyReport.contract_id).all()
-    
-    min_max_map = {r.contract_id: {'min': r.min_net, 'max': r.max_net} for r in min_max_query}
-    
-    # Organize reports by contract and date
-    heatmap_data = []
-    
-    # Unique dates (weeks) found in the requested range
-    week_dates = sorted(list(set([r.report_date.strftime("%Y-%m-%d") for r in reports if r.report_date >= (end_date - timedelta(weeks=weeks+1))])))
-    # Limit to requested weeks (newest N)
-    week_dates = week_dates[-weeks:]
-    
-    for contract in contracts:
-        c_stats = min_max_map.get(contract.id)
-        if not c_stats:
-            continue
-            
-        if c_stats['min'] is None or c_stats['max'] is None:
-            # Skip contracts with insufficient data
-            heatmap_data.append({
-                "contract_id": contract.id,
-                "contract_name": contract.contract_name,
-                "category": contract.market_category,
-                "data": []
-            })
-            continue
-            
-        c_min = float(c_stats['min'])
-        c_max = float(c_stats['max'])
-        divisor = c_max - c_min if c_max != c_min else 1.0
-        
-        # Get reports for this contract
-        c_reports = [r for r in reports if r.contract_id == contract.id]
-        
-        # Build series
-        series = []
-        for date_str in week_dates:
-            report = next((r for r in c_reports if r.report_date.strftime("%Y-%m-%d") == date_str), None)
-            
-            val = None
-            if report:
-                net = float(report.asset_mgr_net)
-                # Calculate COT Index
-                cot_index = ((net - c_min) / divisor) * 100
-                cot_index = max(0, min(100, cot_index)) # Clamp 0-100
-                val = round(cot_index, 1)
-                
-            series.append({
-                "date": date_str,
-                "value": val
-            })
-            
-        heatmap_data.append({
-            "contract_id": contract.id,
-            "contract_name": contract.contract_name,
-            "category": contract.market_category,
-            "data": series
-        })
-        
+    ).group_by(WeeklyReport.contract_id)
 
-    return {
-        "weeks": week_dates,
-        "heatmap": heatmap_data
-    }
+    reports, min_max = await run_in_threads(
+        lambda s: pd.read_sql(reports_query, s.connection()),
+        lambda s: pd.read_sql(min_max_query, s.connection())
+    )
+
+    return await run_in_threadpool(build_heatmap, contracts, reports, min_max, weeks, end_date, value_column="net")
 
 @router.get("/staleness/{contract_id}")
 def get_cot_staleness(
@@ -157,7 +126,10 @@ def get_cot_staleness(
     """
     Get COT Staleness Confidence Score for a specific contract.
     Calculates reliability based on price movement since last report.
+    Kept sync: the live Yahoo quote blocks, so it runs in the threadpool.
     """
+    from app.services.analysis.cot_staleness import COTStalenessService
+
     service = COTStalenessService(db)
     result = service.calculate_score(contract_id)
     
@@ -168,12 +140,236 @@ def get_cot_staleness(
     
     return result
 
+def _build_radar_snapshot() -> Dict[str, Any]:
+    """Build a fresh snapshot on a sync session (live Yahoo quotes block)"""
+    from app.services.analysis.radar_snapshot import RadarSnapshotService
+
+    db = SessionLocal()
+    try:
+        snapshot = RadarSnapshotService(db).build_snapshot()
+        return {"etag": snapshot.etag, "payload": snapshot.payload}
+    finally:
+        db.close()
+
 @router.get("/radar")
-def get_smart_radar(
-    db: Session = Depends(get_db)
+async def get_smart_radar(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get Smart Money Radar rankings and insights.
+    Served from the latest radar snapshot; supports If-None-Match.
+    """
+    cached_snapshot = await radar_snapshot(db)
+
+    etag = f'"{cached_snapshot["etag"]}"'
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    response.headers["ETag"] = etag
+    return cached_snapshot["payload"]
+
+
+@router.post("/radar/refresh", dependencies=[Depends(require_admin)])
+async def refresh_smart_radar(response: Response):
     """
-    radar_service = SmartRadarService(db)
-    return radar_service.get_radar_rankings()
+    Recompute and store a new radar snapshot (fetches live quotes).
+    Admin only: needs X-Admin-Token.
+    """
+    snapshot = await run_in_threadpool(_build_radar_snapshot)
+    response.headers["ETag"] = f'"{snapshot["etag"]}"'
+    return snapshot["payload"]
+
+
+async def radar_snapshot(db: AsyncSession) -> Dict[str, Any]:
+    """
+    {"etag", "payload"} of the latest radar snapshot: response cache, then the
+    stored snapshot, then a rebuild (also used by the dashboard bundle).
+    """
+    from app.services.analysis.radar_snapshot import RadarSnapshotService
+
+    cache_key = await run_in_threadpool(response_cache.make_key, "radar", {})
+    cached_snapshot = await run_in_threadpool(response_cache.get, cache_key)
+
+    if cached_snapshot is None:
+        snapshot = await db.run_sync(lambda s: RadarSnapshotService(s).get_latest())
+        if snapshot is None:
+            cached_snapshot = await run_in_threadpool(_build_radar_snapshot)
+            cache_key = await run_in_threadpool(response_cache.make_key, "radar", {})
+        else:
+            cached_snapshot = {"etag": snapshot.etag, "payload": snapshot.payload}
+        await run_in_threadpool(response_cache.set, cache_key, cached_snapshot)
+
+    return cached_snapshot
+
+
+@router.get("/radar/history/{contract_id}")
+@conditional_get("contract_id")
+async def get_conviction_history(
+    request: Request,
+    response: Response,
+    contract_id: int,
+    weeks: int = Query(52, ge=1, le=1040),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get stored weekly Conviction Score history (score, rank and components) for a contract.
+    """
+    from app.services.analysis.conviction_history import ConvictionHistoryService
+
+    contract, history = await run_concurrently(
+        lambda s: s.query(Contract).filter(Contract.id == contract_id).first(),
+        lambda s: ConvictionHistoryService(s).get_history(contract_id, weeks=weeks)
+    )
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    return {
+        "contract_id": contract_id,
+        "contract_name": contract.contract_name,
+        "history": [
+            {
+                "report_date": row.report_date.isoformat(),
+                "score": row.score,
+                "rank": row.rank,
+                "rank_change": (prev.rank - row.rank) if prev and prev.rank and row.rank else None,
+                "sentiment_gap": row.sentiment_gap,
+                "net_change": row.net_change,
+                "breakdown": {
+                    "signal_quality": row.signal_quality,
+                    "sentiment_divergence": row.sentiment_divergence,
+                    "capital_momentum": row.capital_momentum,
+                    "historical_edge": row.historical_edge,
+                    "concentration": row.concentration
+                }
+            }
+            for prev, row in zip([None] + history[:-1], history)
+        ]
+    }
+
+
+@router.get("/historical-edge/sweep")
+@conditional_get()
+async def get_historical_edge_sweep(
+    request: Request,
+    response: Response,
+    ids: Optional[str] = Query(None, description="Comma-separated contract ids (default: all active)"),
+    thresholds: Optional[str] = Query(None, description="Comma-separated sentiment gap thresholds (%)"),
+    forward_weeks: Optional[str] = Query(None, description="Comma-separated forward horizons (weeks)"),
+    lookback_years: Optional[str] = Query(None, description="Comma-separated lookback windows (years)"),
+    bootstrap: int = Query(0, ge=0, le=10000, description="Bootstrap resamples for confidence intervals (0 = off)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Backtest parameter sweep: win rate, average return and sample size over
+    thresholds x forward weeks x lookback years, for one contract or many.
+    All cells are evaluated on one preloaded frame.
+    """
+    from app.services.analysis.backtest import BacktestEngine
+
+    threshold_list = _parse_csv(thresholds, float, [5.0, 10.0, 15.0, 20.0, 25.0, 30.0, 40.0])
+    horizon_list = _parse_csv(forward_weeks, int, [1, 2, 4, 8, 13])
+    lookback_list = _parse_csv(lookback_years, int, [1, 3, 5, 10])
+
+    cells = len(threshold_list) * len(horizon_list) * len(lookback_list)
+    if cells > MAX_SWEEP_CELLS:
+        raise HTTPException(status_code=422, detail=f"Sweep grid exceeds {MAX_SWEEP_CELLS} cells")
+    if not all(math.isfinite(t) for t in threshold_list):
+        raise HTTPException(status_code=422, detail="thresholds must be finite numbers")
+    if horizon_list[0] < 1 or horizon_list[-1] > MAX_FORWARD_WEEKS:
+        raise HTTPException(status_code=422, detail=f"forward_weeks must be between 1 and {MAX_FORWARD_WEEKS}")
+    if lookback_list[0] < 1 or lookback_list[-1] > MAX_LOOKBACK_YEARS:
+        raise HTTPException(status_code=422, detail=f"lookback_years must be between 1 and {MAX_LOOKBACK_YEARS}")
+
+    query = select(Contract)
+    if ids:
+        query = query.where(Contract.id.in_(_parse_csv(ids, int, [])))
+    else:
+        query = query.where(Contract.is_active == True)
+    contracts = (await db.execute(query.order_by(Contract.id))).scalars().all()
+
+    if not contracts:
+        raise HTTPException(status_code=404, detail="Contract not found")
+    if bootstrap * cells * len(contracts) > MAX_SWEEP_RESAMPLES:
+        raise HTTPException(
+            status_code=422,
+            detail=f"bootstrap x cells x contracts exceeds {MAX_SWEEP_RESAMPLES}: lower bootstrap or narrow the grid"
+        )
+
+    engine, = await run_in_threads(partial(
+        BacktestEngine.from_db, contract_ids=[c.id for c in contracts],
+        lookback_years=max(lookback_list), horizons=horizon_list
+    ))
+    # Evaluation (and bootstrap resampling) is CPU-bound: keep it off the event loop
+    grid = await run_in_threadpool(
+        engine.evaluate,
+        threshold_list, horizon_list, lookback_list,
+        contract_ids=[c.id for c in contracts], include_occurrences=False,
+        n_bootstrap=bootstrap
+    )
+
+    results = []
+    for contract in contracts:
+        cells = []
+        for ly in lookback_list:
+            for h in horizon_list:
+                for t in threshold_list:
+                    cell = grid[(contract.id, t, h, ly)]
+                    cells.append({
+                        "threshold": t,
+                        "forward_weeks": h,
+                        "lookback_years": ly,
+                        "sample_size": cell["sample_size"],
+                        "win_rate": cell["win_rate"],
+                        "avg_return": cell["avg_return"],
+                        "median_return": cell.get("median_return", 0.0),
+                        "win_rate_ci": cell.get("win_rate_ci"),
+                        "avg_return_ci": cell.get("avg_return_ci")
+                    })
+        results.append({
+            "contract_id": contract.id,
+            "contract_name": contract.contract_name,
+            "grid": cells
+        })
+
+    return {
+        "thresholds": threshold_list,
+        "forward_weeks": horizon_list,
+        "lookback_years": lookback_list,
+        "contracts": results
+    }
+
+
+@router.get("/event-study")
+@conditional_get()
+@cached("event_study")
+async def get_event_study(
+    request: Request,
+    response: Response,
+    level: Optional[str] = Query("High", description="Alert level filter (empty = all levels)"),
+    contract_id: Optional[int] = Query(None),
+    category: Optional[str] = Query(None, description="Market category (sector) filter"),
+    pre: int = Query(8, ge=0, le=52, description="Weeks before the alert"),
+    post: int = Query(13, ge=1, le=52, description="Weeks after the alert"),
+    group_by: str = Query("all", pattern="^(all|contract|sector)$"),
+    signed: bool = Query(False, description="Flip paths of short-side (negative z-score) alerts"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Average price path around Whale Alerts: mean, median and percentile bands
+    of % change vs the alert week close, for offsets t-pre..t+post.
+    """
+    from app.services.analysis.event_study import EventStudyService
+
+    # Builds the price path matrix with pandas: run it off the event loop
+    result, = await run_in_threads(lambda s: EventStudyService(s).run(
+        level=level or None,
+        contract_id=contract_id,
+        category=category,
+        pre=pre,
+        post=post,
+        group_by=group_by,
+        signed=signed
+    ))
+    return result
@@ -1,11 +1,23 @@
-from typing import List, Any
-from fastapi import APIRouter, Depends, HTTPException
+from collections import defaultdict
+from functools import partial
+from datetime import date
+from typing import List, Any, Callable, Dict, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, extract, and_
+from starlette.concurrency import run_in_threadpool
+import orjson
 
 
-from app.db.session import SessionLocal
+from app.core.cache import cached
+from app.api.conditional import conditional_get
+from app.api.pagination import TOTAL_MODES, decode_cursor, encode_cursor, total_count
+from app.api.deps import get_async_db
+from app.db.session import run_concurrently, run_in_threads
+from app.db.repository import get_latest_reports, float_columns
 from app.models.contract import Contract
+from app.models.cot_index import RollingCotIndex, COT_WINDOWS, TRADER_NET_COLUMNS, index_column
 from app.models.statistics import ContractStatistics
 from app.models.report import WeeklyReport
 from app.schemas.contract import ContractSchema, ContractDetailSchema, ContractStatsSchema, ContractReportSummarySchema
@@ -14,183 +26,334 @@ from app.schemas.contract import ContractSchema, ContractDetailSchema, ContractS
 
 router = APIRouter()
 
-def get_db():
-    try:
-        db = SessionLocal()
-        yield db
-    finally:
-        db.close()
+# Upper bound on contracts per batch history request
+MAX_BATCH_CONTRACTS = 50
+# Upper bound on weeks_back of the history endpoints (30 years)
+MAX_HISTORY_WEEKS = 1560
+
+def _get_contract(db: Session, contract_id: int):
+    return db.query(Contract).filter(Contract.id == contract_id).first()
 
 @router.get("/", response_model=List[ContractSchema])
-def get_contracts(
-    db: Session = Depends(get_db),
+@conditional_get()
+@cached("contracts")
+async def get_contracts(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
     active_only: bool = True
 ):
     """
     Get list of contracts with their latest report.
     """
-    # Subquery to get latest report date per contract
-    # We need to explicitly order by date to ensure we get the absolute latest
-    subquery = db.query(
-        WeeklyReport.contract_id,
-        func.max(WeeklyReport.report_date).label('max_date')
-    ).group_by(WeeklyReport.contract_id).subquery()
-
-    # Query contracts and join with the specific report that matches the max date
-    results = db.query(Contract, WeeklyReport).outerjoin(
-        subquery, Contract.id == subquery.c.contract_id
-    ).outerjoin(
-        WeeklyReport,
-        (WeeklyReport.contract_id == Contract.id) & 
-        (WeeklyReport.report_date == subquery.c.max_date)
-    )
+    query = select(Contract)
 
     if active_only:
-        results = results.filter(Contract.is_active == True)
+        query = query.where(Contract.is_active == True)
     
     # Sort by market category and then name
-    results = results.order_by(Contract.market_category, Contract.contract_name).all()
+    contracts = (await db.execute(
+        query.order_by(Contract.market_category, Contract.contract_name)
+    )).scalars().all()
+
+    # Latest report per contract in a single window-function query
+    latest_reports = await db.run_sync(get_latest_reports, [c.id for c in contracts], 1)
 
-    # Manually construct response to include nested report
+    return contract_list(contracts, latest_reports)
+
+
+def contract_list(contracts: List[Contract], latest_reports: Dict[int, List[WeeklyReport]]) -> List[ContractSchema]:
+    """Contracts with their nested latest report (also used by the dashboard bundle)"""
     contracts_list = []
-    for contract, report in results:
+    for contract in contracts:
         contract_data = ContractSchema.model_validate(contract)
-        if report:
-            contract_data.latest_report = ContractReportSummarySchema.model_validate(report)
+        reports = latest_reports.get(contract.id)
+        if reports:
+            contract_data.latest_report = ContractReportSummarySchema.model_validate(reports[0])
         contracts_list.append(contract_data)
-        
+
     return contracts_list
 
+@router.get("/history")
+@conditional_get()
+@cached("history_batch")
+async def get_contracts_history(
+    request: Request,
+    response: Response,
+    ids: str = Query(..., description="Comma-separated contract ids"),
+    db: AsyncSession = Depends(get_async_db),
+    weeks_back: int = Query(260, ge=1, le=MAX_HISTORY_WEEKS),
+    cot_window: int = 156,
+    format: str = Query("json", pattern="^(json|columnar)$")
+):
+    """
+    History of several contracts in one round-trip (comparison views).
+    Reports (with the rolling COT Index), alerts and prices of all contracts are
+    fetched with one IN query each and grouped per contract in memory. Contracts
+    come back in the requested order; unknown ids are listed under "missing".
+    format=columnar returns one array per field for each contract.
+    """
+    from datetime import datetime, timedelta
+
+    try:
+        contract_ids = list(dict.fromkeys(int(v) for v in ids.split(",") if v.strip()))
+    except ValueError:
+        raise HTTPException(status_code=422, detail=f"Invalid list: {ids}")
+    if not contract_ids:
+        raise HTTPException(status_code=422, detail="ids must list at least one contract id")
+    if len(contract_ids) > MAX_BATCH_CONTRACTS:
+        raise HTTPException(status_code=422, detail=f"At most {MAX_BATCH_CONTRACTS} contracts per request")
+    if cot_window not in COT_WINDOWS:
+        raise HTTPException(status_code=422, detail=f"cot_window must be one of {COT_WINDOWS}")
+
+    start_date = datetime.now().date() - timedelta(weeks=weeks_back)
+
+    contracts, reports, alerts, prices = await run_concurrently(
+        lambda db: db.query(Contract).filter(Contract.id.in_(contract_ids)).all(),
+        *_columnar_history_queries(contract_ids, start_date, cot_window)
+    )
+    if not contracts:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    by_id = {c.id: c for c in contracts}
+    reports, alerts, prices = _group_by_contract(reports), _group_by_contract(alerts), _group_by_contract(prices)
+    build = _columnar_history if format == "columnar" else _history_records
+
+    return Response(
+        content=orjson.dumps({
+            "cot_window": cot_window,
+            "format": format,
+            "contracts": [
+                build(by_id[cid], cot_window, reports.get(cid, []), alerts.get(cid, []), prices.get(cid, []))
+                for cid in contract_ids if cid in by_id
+            ],
+            "missing": [cid for cid in contract_ids if cid not in by_id]
+        }),
+        media_type="application/json"
+    )
+
 @router.get("/{contract_id}", response_model=ContractDetailSchema)
-def get_contract_detail(
+@conditional_get("contract_id")
+async def get_contract_detail(
+    request: Request,
+    response: Response,
     contract_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get contract details including statistics.
     """
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-        
     # Manual validation to shape the response with nested stats
     # Assuming we don't have a direct relationship back in the model for stats yet...
     # Oh wait, we didn't add relationship in models/contract.py for stats!
-    # Let's fetch manually.
-    
-    stats = db.query(ContractStatistics).filter(ContractStatistics.contract_id == contract_id).all()
+    # Let's fetch manually (concurrently with the contract).
+    contract, stats = await run_concurrently(
+        partial(_get_contract, contract_id=contract_id),
+        lambda s: s.query(ContractStatistics).filter(ContractStatistics.contract_id == contract_id).all()
+    )
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
     
     # Create response object
-    response = ContractDetailSchema.model_validate(contract)
+    detail = ContractDetailSchema.model_validate(contract)
     
     # Map stats to schema
     stats_list = []
     for s in stats:
         stats_list.append(ContractStatsSchema.model_validate(s))
         
-    response.statistics = stats_list
+    detail.statistics = stats_list
     
-    return response
+    return detail
 
 @router.get("/{contract_id}/history")
-def get_contract_history(
+@conditional_get("contract_id")
+@cached("history")
+async def get_contract_history(
+    request: Request,
+    response: Response,
     contract_id: int,
-    db: Session = Depends(get_db),
-    weeks_back: int = 260  # 5 years of historical data
+    db: AsyncSession = Depends(get_async_db),
+    weeks_back: int = Query(260, ge=1, le=MAX_HISTORY_WEEKS),  # 5 years of historical data
+    cot_window: int = 156,
+    format: str = Query("json", pattern="^(json|columnar)$")
 ):
     """
     Get historical data for a specific contract including:
-    - Historical weekly reports (last N weeks)
+    - Historical weekly reports (last N weeks) with the rolling COT Index
     - Historical alerts
     - Price data
+
+    The contract, reports, alerts, prices and COT Index are fetched concurrently.
+    format=columnar returns one array per field (newest first, like the default
+    format), serialized with orjson.
     """
-    from app.models.report import WeeklyReport
-    from app.models.alert import WhaleAlert
-    from app.models.price import WeeklyPrice
     from datetime import datetime, timedelta
     
-    # Verify contract exists
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-    
+    if cot_window not in COT_WINDOWS:
+        raise HTTPException(status_code=422, detail=f"cot_window must be one of {COT_WINDOWS}")
+
     # Calculate date range
     end_date = datetime.now().date()
     start_date = end_date - timedelta(weeks=weeks_back)
-    
-    # Fetch historical weekly reports
-    reports = db.query(WeeklyReport).filter(
-        WeeklyReport.contract_id == contract_id,
-        WeeklyReport.report_date >= start_date
-    ).order_by(WeeklyReport.report_date.desc()).all()
-    
-    # Fetch historical alerts
-    alerts = db.query(WhaleAlert).filter(
-        WhaleAlert.contract_id == contract_id,
-        WhaleAlert.report_date >= start_date
-    ).order_by(WhaleAlert.report_date.desc()).all()
-    
-    # Fetch price data
-    prices = db.query(WeeklyPrice).filter(
-        WeeklyPrice.contract_id == contract_id,
-        WeeklyPrice.report_date >= start_date
-    ).order_by(WeeklyPrice.report_date.desc()).all()
-    
-    # Format response
+
+    contract, *results = await run_concurrently(
+        partial(_get_contract, contract_id=contract_id),
+        *_columnar_history_queries([contract_id], start_date, cot_window)
+    )
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
+
+    grouped = [_group_by_contract(rows).get(contract_id, []) for rows in results]
+    if format == "columnar":
+        return Response(
+            content=orjson.dumps(_columnar_history(contract, cot_window, *grouped)),
+            media_type="application/json"
+        )
+    return _history_records(contract, cot_window, *grouped)
+
+
+HISTORY_REPORT_COLUMNS = [
+    "dealer_long", "dealer_short", "dealer_net",
+    "asset_mgr_long", "asset_mgr_short", "asset_mgr_net",
+    "lev_long", "lev_short", "lev_net",
+    "non_report_long", "non_report_short", "open_interest"
+]
+HISTORY_ALERT_COLUMNS = ["id", "alert_level", "z_score", "cot_index", "price_context", "confidence_score"]
+HISTORY_PRICE_COLUMNS = [
+    "open_price", "high_price", "low_price", "close_price",
+    "reporting_vwap", "close_vs_vwap_pct", "volume"
+]
+
+
+def _to_columns(rows, names: List[str]) -> Dict[str, list]:
+    values = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: list(col) for name, col in zip(names, values)}
+
+
+def _columnar_history_queries(contract_ids: List[int], start_date, cot_window: int) -> List[Callable[[Session], Any]]:
+    """
+    Independent column-only history queries for one or more contracts: reports
+    (+ COT Index), alerts and prices. Rows start with contract_id and are newest
+    first within each contract (see _group_by_contract).
+    """
+    from app.models.alert import WhaleAlert
+    from app.models.price import WeeklyPrice
+
+    cot_names = [f"cot_index_{t}" for t in TRADER_NET_COLUMNS]
+
+    return [
+        lambda db: db.query(
+            WeeklyReport.contract_id,
+            WeeklyReport.report_date,
+            *float_columns(WeeklyReport, HISTORY_REPORT_COLUMNS),
+            *[getattr(RollingCotIndex, index_column(t, cot_window)).label(name)
+              for t, name in zip(TRADER_NET_COLUMNS, cot_names)]
+        ).outerjoin(
+            RollingCotIndex,
+            and_(
+                RollingCotIndex.contract_id == WeeklyReport.contract_id,
+                RollingCotIndex.report_date == WeeklyReport.report_date
+            )
+        ).filter(
+            WeeklyReport.contract_id.in_(contract_ids),
+            WeeklyReport.report_date >= start_date
+        ).order_by(WeeklyReport.contract_id, WeeklyReport.report_date.desc()).all(),
+        lambda db: db.query(
+            WhaleAlert.contract_id, WhaleAlert.report_date, *float_columns(WhaleAlert, HISTORY_ALERT_COLUMNS)
+        ).filter(
+            WhaleAlert.contract_id.in_(contract_ids),
+            WhaleAlert.report_date >= start_date
+        ).order_by(WhaleAlert.contract_id, WhaleAlert.report_date.desc()).all(),
+        lambda db: db.query(
+            WeeklyPrice.contract_id, WeeklyPrice.report_date, *float_columns(WeeklyPrice, HISTORY_PRICE_COLUMNS)
+        ).filter(
+            WeeklyPrice.contract_id.in_(contract_ids),
+            WeeklyPrice.report_date >= start_date
+        ).order_by(WeeklyPrice.contract_id, WeeklyPrice.report_date.desc()).all()
+    ]
+
+
+def _group_by_contract(rows) -> Dict[int, list]:
+    """{contract_id: rows without their leading contract_id}, keeping row order"""
+    grouped = defaultdict(list)
+    for contract_id, *values in rows:
+        grouped[contract_id].append(values)
+    return grouped
+
+
+def _columnar_history(contract: Contract, cot_window: int, reports, alerts, prices) -> Dict[str, Any]:
+    """History as one array per field, from the column-only query rows"""
+    cot_names = [f"cot_index_{t}" for t in TRADER_NET_COLUMNS]
     return {
-        "contract_id": contract_id,
+        "contract_id": contract.id,
         "contract_name": contract.contract_name,
+        "cot_window": cot_window,
+        "format": "columnar",
+        "historical_reports": _to_columns(reports, ["report_date"] + HISTORY_REPORT_COLUMNS + cot_names),
+        "historical_alerts": _to_columns(alerts, ["report_date"] + HISTORY_ALERT_COLUMNS),
+        "price_history": _to_columns(prices, ["report_date"] + HISTORY_PRICE_COLUMNS)
+    }
+
+
+def _history_records(contract: Contract, cot_window: int, reports, alerts, prices) -> Dict[str, Any]:
+    """
+    History as one object per row (the default format), from the column-only
+    query rows. Shared by the single and batch endpoints.
+    """
+    report_names = ["report_date"] + HISTORY_REPORT_COLUMNS
+    alert_names = ["report_date"] + HISTORY_ALERT_COLUMNS
+    price_names = ["report_date"] + HISTORY_PRICE_COLUMNS
+    return {
+        "contract_id": contract.id,
+        "contract_name": contract.contract_name,
+        "cot_window": cot_window,
         "historical_reports": [
             {
-                "report_date": report.report_date.isoformat(),
-                "dealer_long": float(report.dealer_long),
-                "dealer_short": float(report.dealer_short),
-                "dealer_net": float(report.dealer_net),
-                "asset_mgr_long": float(report.asset_mgr_long),
-                "asset_mgr_short": float(report.asset_mgr_short),
-                "asset_mgr_net": float(report.asset_mgr_net),
-                "lev_long": float(report.lev_long),
-                "lev_short": float(report.lev_short),
-                "lev_net": float(report.lev_net),
-                "non_report_long": float(report.non_report_long) if report.non_report_long else 0,
-                "non_report_short": float(report.non_report_short) if report.non_report_short else 0,
-                "open_interest": float(report.open_interest)
-            }
-            for report in reports
-        ],
-        "historical_alerts": [
-            {
-                "id": alert.id,
-                "report_date": alert.report_date.isoformat(),
-                "alert_level": alert.alert_level,
-                "z_score": float(alert.z_score) if alert.z_score else None,
-                "cot_index": float(alert.cot_index) if alert.cot_index else None,
-                "price_context": alert.price_context,
-                "confidence_score": float(alert.confidence_score) if alert.confidence_score else None
+                **_record(report_names, row),
+                "cot_index": _cot_index_record(row[len(report_names):])
             }
-            for alert in alerts
+            for row in reports
         ],
-        "price_history": [
-            {
-                "report_date": price.report_date.isoformat(),
-                "open_price": float(price.open_price) if price.open_price else None,
-                "high_price": float(price.high_price) if price.high_price else None,
-                "low_price": float(price.low_price) if price.low_price else None,
-                "close_price": float(price.close_price),
-                "reporting_vwap": float(price.reporting_vwap) if price.reporting_vwap else None,
-                "close_vs_vwap_pct": float(price.close_vs_vwap_pct) if price.close_vs_vwap_pct else None,
-                "volume": int(price.volume) if price.volume else 0
-            }
-            for price in prices
-        ]
+        "historical_alerts": [_record(alert_names, row) for row in alerts],
+        "price_history": [_record(price_names, row) for row in prices]
     }
 
 
+# Defaults of the per-row format for missing (or zero) values
+RECORD_ZERO_FIELDS = {"non_report_long", "non_report_short", "volume"}
+RECORD_NULL_FIELDS = {
+    "z_score", "cot_index", "confidence_score",
+    "open_price", "high_price", "low_price", "reporting_vwap", "close_vs_vwap_pct"
+}
+
+
+def _record(names: List[str], row) -> Dict[str, Any]:
+    record = dict(zip(names, row))
+    record["report_date"] = record["report_date"].isoformat()
+    for name in RECORD_ZERO_FIELDS.intersection(record):
+        record[name] = record[name] or 0
+    for name in RECORD_NULL_FIELDS.intersection(record):
+        record[name] = record[name] or None
+    return record
+
+
+def _cot_index_record(values) -> Optional[Dict[str, Optional[float]]]:
+    """{trader: index}, or None for weeks without a rolling COT Index row"""
+    if all(v is None for v in values):
+        return None
+    return dict(zip(TRADER_NET_COLUMNS, values))
+
+
 @router.get("/{contract_id}/seasonality")
-def get_contract_seasonality(
+@conditional_get("contract_id")
+@cached("seasonality")
+async def get_contract_seasonality(
+    request: Request,
+    response: Response,
     contract_id: int,
     years: int = 5,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get seasonality pattern for a contract.
@@ -198,27 +361,27 @@ def get_contract_seasonality(
     """
     from datetime import datetime, timedelta
     
-    # Get contract
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
-    if not contract:
-        raise HTTPException(status_code=404, detail="Contract not found")
-    
     # Calculate date range
     end_date = datetime.now()
     start_date = end_date - timedelta(days=365 * years)
     
-    # Query reports grouped by year and week
-    reports = db.query(
-        extract('year', WeeklyReport.report_date).label('year'),
-        extract('week', WeeklyReport.report_date).label('week_of_year'),
-        WeeklyReport.dealer_net,
-        WeeklyReport.asset_mgr_net,
-        WeeklyReport.lev_net
-    ).filter(
-        WeeklyReport.contract_id == contract_id,
-        WeeklyReport.report_date >= start_date,
-        WeeklyReport.report_date <= end_date
-    ).order_by('year', 'week_of_year').all()
+    # Contract and reports grouped by year and week, fetched concurrently
+    contract, reports = await run_concurrently(
+        partial(_get_contract, contract_id=contract_id),
+        lambda db: db.query(
+            extract('year', WeeklyReport.report_date).label('year'),
+            extract('week', WeeklyReport.report_date).label('week_of_year'),
+            WeeklyReport.dealer_net,
+            WeeklyReport.asset_mgr_net,
+            WeeklyReport.lev_net
+        ).filter(
+            WeeklyReport.contract_id == contract_id,
+            WeeklyReport.report_date >= start_date,
+            WeeklyReport.report_date <= end_date
+        ).order_by('year', 'week_of_year').all()
+    )
+    if not contract:
+        raise HTTPException(status_code=404, detail="Contract not found")
     
     # Organize data by year
     years_data = {}
@@ -264,36 +427,54 @@ def get_contract_seasonality(
 
 
 @router.get("/{contract_id}/reports")
-def get_contract_reports(
+@conditional_get("contract_id")
+async def get_contract_reports(
+    request: Request,
+    response: Response,
     contract_id: int,
-    limit: int = 100,
-    offset: int = 0,
-    db: Session = Depends(get_db)
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0, description="Offset pagination (deprecated: use cursor)"),
+    cursor: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    total: str = Query("cached", pattern=TOTAL_MODES, description="total_count: cached per data version, exact or none"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
-    Get paginated list of ALL historical reports for a contract.
+    Get paginated list of ALL historical reports for a contract, newest first.
+    Keyset pagination: pass `next_cursor` back as `cursor` for the next page
+    (null on the last page); pages are read from uq_contract_report_date.
     """
-    # Get contract
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    query = select(WeeklyReport).where(WeeklyReport.contract_id == contract_id)
+    if cursor:
+        (before,) = decode_cursor(cursor, (date.fromisoformat,))
+        query = query.where(WeeklyReport.report_date < before)
+    elif offset:
+        query = query.offset(offset)
+    # One extra row tells whether there is a next page
+    query = query.order_by(WeeklyReport.report_date.desc()).limit(limit + 1)
+
+    # Contract and the requested page, fetched concurrently
+    contract, rows = await run_concurrently(
+        partial(_get_contract, contract_id=contract_id),
+        lambda db: db.scalars(query).all()
+    )
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
-    
-    # Get total count
-    total_count = db.query(func.count(WeeklyReport.id)).filter(
-        WeeklyReport.contract_id == contract_id
-    ).scalar()
-    
-    # Get paginated reports
-    reports = db.query(WeeklyReport).filter(
-        WeeklyReport.contract_id == contract_id
-    ).order_by(WeeklyReport.report_date.desc()).limit(limit).offset(offset).all()
+
+    reports = rows[:limit]
+    count = await total_count(
+        db, total, "reports", {"contract_id": contract_id},
+        lambda db: db.scalar(
+            select(func.count(WeeklyReport.id)).where(WeeklyReport.contract_id == contract_id)
+        )
+    )
     
     return {
         "contract_id": contract_id,
         "contract_name": contract.contract_name,
-        "total_count": total_count,
+        "total_count": count,
         "limit": limit,
         "offset": offset,
+        "next_cursor": encode_cursor(reports[-1].report_date) if len(rows) > limit else None,
         "reports": [
             {
                 "id": report.id,
@@ -315,34 +496,42 @@ def get_contract_reports(
 
 
 @router.get("/{contract_id}/historical-edge")
-def get_historical_edge(
+@conditional_get("contract_id")
+async def get_historical_edge(
+    request: Request,
+    response: Response,
     contract_id: int,
     threshold: float = 20.0,
-    forward_weeks: int = 4,
-    lookback_years: int = 5,
-    db: Session = Depends(get_db)
+    forward_weeks: int = Query(4, ge=1, le=52),
+    lookback_years: int = Query(5, ge=1, le=30),
+    bootstrap: int = Query(2000, ge=0, le=20000, description="Bootstrap resamples for confidence intervals (0 = off)"),
+    confidence: float = Query(0.95, gt=0.5, lt=1.0),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Get historical edge analysis for sentiment gap signals.
     Backtests performance when sentiment gap exceeds threshold.
+    Win rate and average return include bootstrap confidence intervals.
     """
-    from app.services.analysis.historical_edge import analyze_historical_edge
+    from app.services.analysis.backtest import BacktestEngine
     
-    contract = db.query(Contract).filter(Contract.id == contract_id).first()
+    # from_db builds pandas frames: load in the threadpool, off the event loop
+    contract, engine = await run_in_threads(
+        partial(_get_contract, contract_id=contract_id),
+        lambda db: BacktestEngine.from_db(db, [contract_id], lookback_years, horizons=[forward_weeks])
+    )
     if not contract:
         raise HTTPException(status_code=404, detail="Contract not found")
     
-    # Analyze for multiple thresholds
-    results = []
-    for thresh in [10.0, 20.0, 30.0]:
-        analysis = analyze_historical_edge(
-            db=db,
-            contract_id=contract_id,
-            threshold=thresh,
-            forward_weeks=forward_weeks,
-            lookback_years=lookback_years
-        )
-        results.append(analysis)
+    # Analyze for multiple thresholds on a single preloaded frame
+    # (bootstrap resampling is CPU-bound: keep it off the event loop)
+    thresholds = [10.0, 20.0, 30.0]
+    grid = await run_in_threadpool(
+        engine.evaluate,
+        thresholds, [forward_weeks], [lookback_years], contract_ids=[contract_id],
+        n_bootstrap=bootstrap, confidence=confidence
+    )
+    results = [grid[(contract_id, thresh, forward_weeks, lookback_years)] for thresh in thresholds]
     
     return {
         "contract_id": contract_id,
@@ -0,0 +1,63 @@
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+
+from app.core.cache import cached
+from app.api.conditional import conditional_get
+from app.api.deps import get_async_db
+from app.api.v1.endpoints.alerts import alerts_page
+from app.api.v1.endpoints.analysis import heatmap_data, radar_snapshot
+from app.api.v1.endpoints.contracts import contract_list
+from app.db.repository import get_latest_reports
+from app.models.contract import Contract
+
+router = APIRouter()
+
+# Defaults of the individual endpoints the Dashboard page used to call
+ALERTS_LIMIT = 50
+HEATMAP_WEEKS = 12
+HEATMAP_TRADER = "asset_mgr"
+HEATMAP_WINDOW = 156
+
+
+def radar_etag(db: Session) -> Optional[str]:
+    """Latest radar snapshot etag: snapshot refreshes don't bump the data version"""
+    from app.services.analysis.radar_snapshot import RadarSnapshotService
+    return RadarSnapshotService(db).get_latest_etag()
+
+
+@router.get("/")
+@conditional_get(state=radar_etag)
+@cached("dashboard")
+async def get_dashboard(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+) -> Dict[str, Any]:
+    """
+    Everything the Dashboard page shows in one response: active contracts with
+    their latest report, the latest alerts, the heatmap and the radar.
+
+    Active contracts and their latest reports are loaded once and shared by the
+    sections (alerts of the latest week reuse those reports). The bundle is
+    cached and ETagged as a unit under the global data version and the latest
+    radar snapshot, which is refreshed without a data version bump.
+    """
+    contracts = (await db.execute(
+        select(Contract).where(Contract.is_active == True)
+        .order_by(Contract.market_category, Contract.contract_name)
+    )).scalars().all()
+    latest_reports = await db.run_sync(get_latest_reports, [c.id for c in contracts], 1)
+
+    alerts, _ = await alerts_page(db, limit=ALERTS_LIMIT, latest_reports=latest_reports)
+    heatmap = await heatmap_data(db, contracts, HEATMAP_WEEKS, HEATMAP_TRADER, HEATMAP_WINDOW)
+    radar = await radar_snapshot(db)
+
+    return {
+        "contracts": contract_list(contracts, latest_reports),
+        "alerts": alerts,
+        "heatmap": heatmap,
+        "radar": radar["payload"]
+    }
@@ -0,0 +1,49 @@
+from typing import Optional
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.core.events import event_bus, sse_message
+
+router = APIRouter()
+
+# Client reconnection delay sent with the stream (ms)
+RETRY_MS = 5000
+
+# No buffering anywhere on the way: Content-Encoding keeps GZipMiddleware from
+# compressing (and holding back) the stream on Starlette releases that don't
+# exclude text/event-stream, no-transform does the same for proxies
+SSE_HEADERS = {
+    "Cache-Control": "no-cache, no-transform",
+    "Content-Encoding": "identity",
+    "X-Accel-Buffering": "no"
+}
+
+@router.get("/")
+async def stream_events(
+    request: Request,
+    types: Optional[str] = Query(None, description="Comma-separated event types (default: all)")
+):
+    """
+    Server-sent events: `pipeline_stage` (analysis pipeline progress, ending with
+    stage "completed" or "failed"), `reports_loaded` (new COT reports) and `alert` (newly
+    generated Whale Alerts). Each data line is the JSON event
+    {type, data, published_at}; a comment line is sent as keep-alive.
+    """
+    wanted = {t.strip() for t in types.split(",") if t.strip()} if types else None
+
+    async def stream():
+        yield f"retry: {RETRY_MS}\n\n"
+        async for event in event_bus.events(settings.EVENTS_HEARTBEAT_SECONDS):
+            if event is None:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+            elif wanted is None or event["type"] in wanted:
+                yield sse_message(event)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS
+    )
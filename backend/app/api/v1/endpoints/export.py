@@ -0,0 +1,36 @@
+from datetime import date
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from app.db.session import engine
+
+router = APIRouter()
+
+FILE_EXTENSIONS = {"arrow": "arrows", "parquet": "parquet"}
+
+@router.get("/{dataset}")
+def export_dataset(
+    dataset: str,
+    format: str = Query("arrow", pattern="^(arrow|parquet)$"),
+    contract_id: Optional[int] = None,
+    since: Optional[date] = Query(None, description="Only rows with report_date >= since"),
+):
+    """
+    Stream a whole dataset as an Arrow IPC stream or a Parquet file.
+    Datasets: reports (v_weekly_report_changes), prices, alerts, statistics,
+    cot_indexes and conviction. Requires the optional pyarrow package.
+    """
+    from app.services.data.exporter import EXPORT_DATASETS, EXPORT_FORMATS, ExportService, pyarrow_available
+
+    if dataset not in EXPORT_DATASETS:
+        raise HTTPException(status_code=404, detail=f"Unknown dataset. Available: {sorted(EXPORT_DATASETS)}")
+    if not pyarrow_available():
+        raise HTTPException(status_code=501, detail="Export requires pyarrow (pip install pyarrow)")
+
+    filename = f"{dataset}.{FILE_EXTENSIONS[format]}"
+    return StreamingResponse(
+        ExportService(engine).stream(dataset, format, contract_id, since),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
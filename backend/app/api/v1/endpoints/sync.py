@@ -0,0 +1,89 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import orjson
+
+from app.core.cache import cached
+from app.api.conditional import conditional_get
+from app.api.deps import get_async_db
+from app.api.v1.endpoints.contracts import HISTORY_REPORT_COLUMNS, HISTORY_ALERT_COLUMNS, HISTORY_PRICE_COLUMNS
+from app.db.repository import float_columns
+from app.db.session import run_concurrently
+from app.models.alert import WhaleAlert
+from app.models.price import WeeklyPrice
+from app.models.report import WeeklyReport
+from app.services.data.data_version import DataVersionService
+
+router = APIRouter()
+
+# Above this many changed rows a client is told to reload instead
+MAX_SYNC_ROWS = 5000
+
+# Response section -> model and columns (same fields as the history endpoints)
+SYNC_SECTIONS = {
+    "reports": (WeeklyReport, HISTORY_REPORT_COLUMNS),
+    "alerts": (WhaleAlert, HISTORY_ALERT_COLUMNS),
+    "prices": (WeeklyPrice, HISTORY_PRICE_COLUMNS)
+}
+
+
+def _changed_rows(model, names: List[str], keys: List[Tuple[int, date]]) -> Callable[[Session], List[Dict]]:
+    def query(db: Session) -> List[Dict]:
+        if not keys:
+            return []
+        rows = db.query(model.contract_id, model.report_date, *float_columns(model, names)).filter(
+            tuple_(model.contract_id, model.report_date).in_(keys)
+        ).order_by(model.contract_id, model.report_date).all()
+        return [dict(row._mapping) for row in rows]
+    return query
+
+
+@router.get("/")
+@conditional_get()
+@cached("sync")
+async def get_changes(
+    request: Request,
+    response: Response,
+    since: int = Query(..., ge=0, description="Data version of the client's last sync (0 = none)"),
+    ids: Optional[str] = Query(None, description="Comma-separated contract ids (default: all)"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delta sync: reports, alerts and prices changed after data version `since`,
+    from the change log written by the loaders and the analyzer.
+
+    Rows are keyed by (contract_id, report_date): a client replaces its cached
+    row with the same key, then stores `version` for the next call. With
+    since=0, a `since` ahead of the server (database reset) or more than
+    MAX_SYNC_ROWS changes, `full_resync` is true and no rows are returned:
+    reload the full histories and keep `version`.
+    """
+    contract_ids = None
+    if ids:
+        try:
+            contract_ids = sorted({int(v) for v in ids.split(",") if v.strip()})
+        except ValueError:
+            raise HTTPException(status_code=422, detail=f"Invalid list: {ids}")
+
+    version, _ = await db.run_sync(lambda s: DataVersionService(s).get_versions())
+    payload = {"since": since, "version": version, "full_resync": False, **{name: [] for name in SYNC_SECTIONS}}
+
+    if since == 0 or since > version:
+        payload["full_resync"] = True
+    elif since < version:
+        changed = await db.run_sync(
+            lambda s: DataVersionService(s).changes_since(since, contract_ids, limit=MAX_SYNC_ROWS)
+        )
+        if changed is None:
+            payload["full_resync"] = True
+        else:
+            results = await run_concurrently(*(
+                _changed_rows(model, names, changed.get(model.__tablename__, []))
+                for model, names in SYNC_SECTIONS.values()
+            ), release=db)
+            payload.update(zip(SYNC_SECTIONS, results))
+
+    return Response(content=orjson.dumps(payload), media_type="application/json")
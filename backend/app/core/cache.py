@@ -0,0 +1,275 @@
+"""
+Response Cache
+Redis-backed cache for read endpoints, with an in-process LRU fallback.
+
+Keys embed the global data version (bumped by ingestion and the analysis
+pipeline) and a per-namespace version, so a bump invalidates every cached
+response at once without scanning keys.
+"""
+import hashlib
+import inspect
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from starlette.concurrency import run_in_threadpool
+from loguru import logger
+
+from app.core.config import settings
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - redis is in requirements, but the cache must not depend on it
+    redis = None
+
+KEY_PREFIX = "whaleradarr:cache"
+VERSION_KEY = "whaleradarr:data_version"
+
+# Marks a cached pre-serialized response body
+RAW_BODY_FIELD = "__raw_body__"
+
+# Seconds before retrying an unreachable Redis
+RECONNECT_SECONDS = 30
+
+
+class LRUCache:
+    """Thread-safe in-process LRU with per-entry expiry"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: str, ttl: int):
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResponseCache:
+    def __init__(self, redis_url: Optional[str], default_ttl: int, max_entries: int):
+        self.redis_url = redis_url
+        self.default_ttl = default_ttl
+        self.local = LRUCache(max_entries)
+        self._client = None
+        self._next_connect = 0.0
+        # Versions used when Redis is absent (process-local; TTL bounds staleness across processes)
+        self._local_versions: Dict[str, int] = {}
+        self.stats = {"hits": 0, "misses": 0, "errors": 0}
+        self._stats_lock = threading.Lock()
+
+    # --- Backend ---
+
+    def _redis(self):
+        """Connected Redis client, or None (not configured, not installed or unreachable)"""
+        if not self.redis_url or redis is None:
+            return None
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._next_connect:
+            return None
+
+        try:
+            client = redis.Redis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            client.ping()
+            self._client = client
+            logger.info("Response cache connected to Redis")
+        except Exception as e:
+            self._next_connect = time.monotonic() + RECONNECT_SECONDS
+            logger.warning(f"Redis unavailable, using in-process cache: {e}")
+        return self._client
+
+    def _redis_failed(self, e: Exception):
+        self._count("errors")
+        self._client = None
+        self._next_connect = time.monotonic() + RECONNECT_SECONDS
+        logger.warning(f"Redis error, falling back to in-process cache: {e}")
+
+    def _count(self, stat: str):
+        with self._stats_lock:
+            self.stats[stat] += 1
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis() is not None else "memory"
+
+    # --- Versions ---
+
+    def _version_field(self, namespace: Optional[str]) -> str:
+        return namespace or "global"
+
+    def get_versions(self, namespace: str) -> Tuple[int, int]:
+        """(global version, namespace version) in one round trip"""
+        fields = [self._version_field(None), self._version_field(namespace)]
+        client = self._redis()
+        if client is not None:
+            try:
+                values = client.hmget(VERSION_KEY, fields)
+                return tuple(int(v) if v else 0 for v in values)
+            except Exception as e:
+                self._redis_failed(e)
+        return tuple(self._local_versions.get(f, 0) for f in fields)
+
+    def bump_version(self, namespace: Optional[str] = None) -> int:
+        """Invalidate every cached response (or one namespace). Returns the new version."""
+        field = self._version_field(namespace)
+        self._local_versions[field] = self._local_versions.get(field, 0) + 1
+        if namespace is None:
+            self.local.clear()
+
+        client = self._redis()
+        if client is not None:
+            try:
+                return int(client.hincrby(VERSION_KEY, field, 1))
+            except Exception as e:
+                self._redis_failed(e)
+        return self._local_versions[field]
+
+    # --- Entries ---
+
+    def make_key(self, namespace: str, params: Dict[str, Any]) -> str:
+        global_version, ns_version = self.get_versions(namespace)
+        digest = hashlib.sha1(
+            json.dumps(params, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        return f"{KEY_PREFIX}:v{global_version}.{ns_version}:{namespace}:{digest}"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = None
+        client = self._redis()
+        if client is not None:
+            try:
+                raw = client.get(key)
+            except Exception as e:
+                self._redis_failed(e)
+                raw = self.local.get(key)
+        else:
+            raw = self.local.get(key)
+
+        if raw is None:
+            self._count("misses")
+            return None
+        self._count("hits")
+        return json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None):
+        ttl = ttl or self.default_ttl
+        raw = json.dumps(value)
+        client = self._redis()
+        if client is not None:
+            try:
+                client.set(key, raw, ex=ttl)
+                return
+            except Exception as e:
+                self._redis_failed(e)
+        self.local.set(key, raw, ttl)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["backend"] = self.backend
+        stats["local_entries"] = len(self.local)
+        return stats
+
+
+response_cache = ResponseCache(
+    settings.REDIS_URL,
+    default_ttl=settings.CACHE_TTL_SECONDS,
+    max_entries=settings.CACHE_MAX_ENTRIES
+)
+
+
+def bump_data_version(namespace: Optional[str] = None) -> int:
+    """Called by ingestion and the analysis pipeline after writing new data"""
+    version = response_cache.bump_version(namespace)
+    logger.info(f"Data version bumped ({namespace or 'global'} -> {version})")
+    return version
+
+
+def _is_key_param(value: Any) -> bool:
+    return value is None or isinstance(value, (str, int, float, bool))
+
+
+def cached(namespace: str, ttl: Optional[int] = None) -> Callable:
+    """
+    Cache an endpoint's JSON result under its scalar query/path parameters.
+    Dependencies (Session, Request, ...) are left out of the key; errors are not cached.
+    Pre-serialized Response results (e.g. orjson bodies) are cached as body + media type.
+    For `async def` endpoints the (blocking) cache I/O runs in the threadpool.
+    """
+    def decorator(func: Callable) -> Callable:
+        def lookup(kwargs) -> Tuple[str, Any]:
+            params = {k: v for k, v in kwargs.items() if _is_key_param(v)}
+            key = response_cache.make_key(namespace, params)
+            hit = response_cache.get(key)
+            if isinstance(hit, dict) and RAW_BODY_FIELD in hit:
+                hit = Response(content=hit[RAW_BODY_FIELD], media_type=hit["media_type"])
+            return key, hit
+
+        def store(key: str, result: Any) -> Any:
+            if isinstance(result, Response):
+                if result.status_code == 200:
+                    response_cache.set(key, {
+                        RAW_BODY_FIELD: result.body.decode(),
+                        "media_type": result.media_type
+                    }, ttl)
+                return result
+
+            result = jsonable_encoder(result)
+            response_cache.set(key, result, ttl)
+            return result
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not settings.CACHE_ENABLED:
+                    return await func(*args, **kwargs)
+
+                key, hit = await run_in_threadpool(lookup, kwargs)
+                if hit is not None:
+                    return hit
+
+                result = await func(*args, **kwargs)
+                return await run_in_threadpool(store, key, result)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not settings.CACHE_ENABLED:
+                return func(*args, **kwargs)
+
+            key, hit = lookup(kwargs)
+            if hit is not None:
+                return hit
+
+            return store(key, func(*args, **kwargs))
+        return wrapper
+    return decorator
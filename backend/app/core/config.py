@@ -11,10 +11,48 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str = "127.0.0.1"
     POSTGRES_PORT: str = "5433"
     
+    REDIS_URL: Optional[str] = None
+
+    # Connection pools (per engine and per uvicorn worker: each worker holds
+    # up to DB_POOL_SIZE + DB_MAX_OVERFLOW connections for each engine)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: int = 30
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # async API engine only; 0 disables it
+
+    # Response cache (Redis when REDIS_URL is reachable, in-process LRU otherwise)
+    CACHE_ENABLED: bool = True
+    CACHE_TTL_SECONDS: int = 3600
+    CACHE_MAX_ENTRIES: int = 512
+
+    # Request instrumentation (Server-Timing headers and /metrics)
+    METRICS_ENABLED: bool = True
+    # Log requests repeating one statement shape more than N times (0 = off)
+    N_PLUS_ONE_THRESHOLD: int = 0
+
+    # cProfile hooks: every request and pipeline stage, or single requests
+    # sending ?profile=1 with X-Admin-Token when ADMIN_TOKEN is set
+    PROFILE_ENABLED: bool = False
+    PROFILE_DIR: str = "profiles"
+    PROFILE_KEEP: int = 50
+
+    # X-Admin-Token for admin-only endpoints (POST /analysis/radar/refresh) and
+    # on-demand profiling, unset = disabled
+    ADMIN_TOKEN: Optional[str] = None
+
+    # Server-sent events (/events): Redis pub/sub when REDIS_URL is reachable,
+    # in-process broadcast otherwise (publishers must then run in the API process)
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
 
+    @property
+    def ASYNC_DATABASE_URI(self) -> str:
+        return self.SQLALCHEMY_DATABASE_URI.replace("postgresql://", "postgresql+asyncpg://", 1)
+
     class Config:
         case_sensitive = True
         # env_file = ".env"  # Disabled due to macOS permission issues
@@ -0,0 +1,177 @@
+"""
+Server-Sent Events Bus
+Pipeline-stage completion, newly loaded COT reports and newly generated Whale
+Alerts are published as small JSON events and streamed to `/events` clients,
+which then refetch only the resources that changed.
+
+Events go through Redis pub/sub when REDIS_URL is reachable, so publishers in
+other processes (the pipeline scripts) reach every API worker. Without Redis
+an in-process broadcaster is used: only events published by the API process
+itself are delivered.
+"""
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+
+try:
+    import redis
+    import redis.asyncio as redis_async
+except ImportError:  # pragma: no cover - redis is in requirements, but events must not depend on it
+    redis = None
+    redis_async = None
+
+CHANNEL = "whaleradarr:events"
+
+# Event types
+EVENT_PIPELINE_STAGE = "pipeline_stage"
+EVENT_REPORTS_LOADED = "reports_loaded"
+EVENT_ALERT = "alert"
+
+# Events buffered per subscriber; a slow client loses the oldest ones
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Seconds before retrying an unreachable Redis
+RECONNECT_SECONDS = 30
+
+
+class Broadcaster:
+    """In-process fan-out to subscriber queues; publish() is safe from any thread"""
+
+    def __init__(self, queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[asyncio.Queue, asyncio.AbstractEventLoop] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        with self._lock:
+            self._subscribers[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            self._subscribers.pop(queue, None)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def publish(self, event: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+        for queue, loop in subscribers:
+            try:
+                loop.call_soon_threadsafe(self._offer, queue, event)
+            except RuntimeError:  # loop closed
+                self.unsubscribe(queue)
+
+    @staticmethod
+    def _offer(queue: asyncio.Queue, event: Dict[str, Any]):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(event)
+
+
+class EventBus:
+    def __init__(self, redis_url: Optional[str], queue_size: int = SUBSCRIBER_QUEUE_SIZE):
+        self.redis_url = redis_url
+        self.local = Broadcaster(queue_size)
+        self._client = None
+        self._next_connect = 0.0
+        self._listener: Optional[asyncio.Task] = None
+
+    # --- Publishing ---
+
+    def _redis(self):
+        """Connected Redis client for publishing, or None (not configured, not installed or unreachable)"""
+        if not self.redis_url or redis is None:
+            return None
+        if self._client is not None:
+            return self._client
+        if time.monotonic() < self._next_connect:
+            return None
+
+        try:
+            client = redis.Redis.from_url(self.redis_url, socket_timeout=0.5, socket_connect_timeout=0.5)
+            client.ping()
+            self._client = client
+        except Exception as e:
+            self._next_connect = time.monotonic() + RECONNECT_SECONDS
+            logger.warning(f"Redis unavailable, publishing events in-process: {e}")
+        return self._client
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Publish an event; never raises (a lost event must not fail ingestion or the pipeline)"""
+        event = {"type": event_type, "data": data or {}, "published_at": datetime.utcnow().isoformat()}
+        client = self._redis()
+        if client is not None:
+            try:
+                client.publish(CHANNEL, json.dumps(event, default=str))
+                return event
+            except Exception as e:
+                self._client = None
+                self._next_connect = time.monotonic() + RECONNECT_SECONDS
+                logger.warning(f"Redis publish failed, publishing event in-process: {e}")
+        # Same JSON types subscribers get through Redis (dates as strings)
+        self.local.publish(json.loads(json.dumps(event, default=str)))
+        return event
+
+    # --- Subscribing ---
+
+    async def events(self, heartbeat: float) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Events for one subscriber, and None after `heartbeat` seconds without any"""
+        queue = self.local.subscribe()
+        self._ensure_listener()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            self.local.unsubscribe(queue)
+
+    def _ensure_listener(self):
+        if not self.redis_url or redis_async is None:
+            return
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.get_running_loop().create_task(self._listen())
+
+    async def _listen(self):
+        """Forward Redis messages to local subscribers while there are any"""
+        while self.local.subscriber_count:
+            try:
+                client = redis_async.Redis.from_url(self.redis_url, socket_connect_timeout=0.5)
+                pubsub = client.pubsub()
+                try:
+                    await pubsub.subscribe(CHANNEL)
+                    while self.local.subscriber_count:
+                        message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                        if message is not None:
+                            self.local.publish(json.loads(message["data"]))
+                finally:
+                    await pubsub.aclose()
+                    await client.aclose()
+            except Exception as e:
+                logger.warning(f"Event listener lost Redis, retrying in {RECONNECT_SECONDS}s: {e}")
+                await asyncio.sleep(RECONNECT_SECONDS)
+
+
+def sse_message(event: Dict[str, Any]) -> str:
+    """One event in text/event-stream framing"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+event_bus = EventBus(settings.REDIS_URL)
+
+
+def publish_event(event_type: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return event_bus.publish(event_type, data)
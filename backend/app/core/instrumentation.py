@@ -0,0 +1,251 @@
+"""
+Request Instrumentation
+Per-request wall time, DB time, SQL statement count and slowest statement,
+collected by an ASGI middleware plus SQLAlchemy cursor events.
+
+Results go out as a `Server-Timing` header on every response and are
+aggregated per route for `/metrics` (Prometheus text format, per worker
+process). With N_PLUS_ONE_THRESHOLD > 0, a request that runs the same
+statement shape more than N times is logged as a likely N+1 pattern.
+"""
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+from app.core.config import settings
+
+# Request duration histogram buckets (seconds)
+DURATION_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+_IN_LIST = re.compile(r"\bIN\s*\((?:[^()]|\([^()]*\))*\)", re.IGNORECASE)
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?|:\w+|\b\d+(?:\.\d+)?\b|'(?:[^']|'')*'")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with literals, bind parameters and IN lists collapsed, so repeats compare equal"""
+    shape = _IN_LIST.sub("IN (?)", statement)
+    shape = _PARAM.sub("?", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+class RequestStats:
+    """SQL activity of one request (shared by its tasks and threadpool calls)"""
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, statement: str, seconds: float):
+        shape = statement_shape(statement)
+        with self._lock:
+            self.statements += 1
+            self.db_seconds += seconds
+            self.shapes[shape] += 1
+            if seconds >= self.slowest_seconds:
+                self.slowest_seconds = seconds
+                self.slowest_statement = shape
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        with self._lock:
+            return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+
+_current: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+# --- SQLAlchemy hooks ---
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current.get() is not None:
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current.get()
+    if stats is None:
+        return
+    starts = conn.info.get("query_start")
+    if starts:
+        stats.record(statement, time.perf_counter() - starts.pop())
+
+
+def install_sql_hooks():
+    """Time every cursor execution on all engines (sync and the async engine's sync core)"""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+# --- Aggregation ---
+
+class RouteMetrics:
+    def __init__(self):
+        self.buckets = [0] * len(DURATION_BUCKETS)
+        self.count = 0
+        self.seconds = 0.0
+        self.db_seconds = 0.0
+        self.statements = 0
+        self.slowest_statement_seconds = 0.0
+        self.statuses: Counter = Counter()
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str], RouteMetrics] = defaultdict(RouteMetrics)
+        self.n_plus_one = 0
+        self._lock = threading.Lock()
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: RequestStats):
+        with self._lock:
+            m = self.routes[(method, route)]
+            m.count += 1
+            m.seconds += seconds
+            m.db_seconds += stats.db_seconds
+            m.statements += stats.statements
+            m.slowest_statement_seconds = max(m.slowest_statement_seconds, stats.slowest_seconds)
+            m.statuses[status] += 1
+            for i, bound in enumerate(DURATION_BUCKETS):
+                if seconds <= bound:
+                    m.buckets[i] += 1
+
+    def flag_n_plus_one(self):
+        with self._lock:
+            self.n_plus_one += 1
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines = [
+            "# HELP http_requests_total Requests by route and status.",
+            "# TYPE http_requests_total counter",
+        ]
+        with self._lock:
+            routes = sorted(self.routes.items())
+            for (method, route), m in routes:
+                for status, n in sorted(m.statuses.items()):
+                    lines.append(f'http_requests_total{{{_labels(method, route)},status="{status}"}} {n}')
+
+            lines += [
+                "# HELP http_request_duration_seconds Request wall time.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), m in routes:
+                labels = _labels(method, route)
+                for bound, n in zip(DURATION_BUCKETS, m.buckets):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {n}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {m.count}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {m.seconds:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {m.count}")
+
+            for name, help_text, kind, attr in [
+                ("http_request_db_seconds_total", "Time spent in SQL statements.", "counter", "db_seconds"),
+                ("http_request_db_statements_total", "SQL statements executed.", "counter", "statements"),
+                ("http_request_slowest_statement_seconds", "Slowest single SQL statement seen.", "gauge",
+                 "slowest_statement_seconds"),
+            ]:
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+                for (method, route), m in routes:
+                    lines.append(f"{name}{{{_labels(method, route)}}} {getattr(m, attr):.6g}")
+
+            lines += [
+                "# HELP http_request_n_plus_one_total Requests flagged with repeated statement shapes.",
+                "# TYPE http_request_n_plus_one_total counter",
+                f"http_request_n_plus_one_total {self.n_plus_one}",
+            ]
+        return "\n".join(lines) + "\n"
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{method}",route="{route}"'
+
+
+metrics_registry = MetricsRegistry()
+
+
+def server_timing(wall_seconds: float, stats: RequestStats) -> str:
+    return (
+        f"app;dur={wall_seconds * 1000:.1f}, "
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.1f}"
+    )
+
+
+def route_template(scope) -> str:
+    """
+    Full path template of the matched route, e.g. /api/v1/contracts/{contract_id}.
+    Routes of included routers may only know their own tail, so the static
+    prefix is taken from the request path in front of the part the route matched.
+    """
+    route = scope.get("route")
+    if route is None or not hasattr(route, "path_regex"):
+        return "unmatched"
+    path = scope["path"]
+    for i, char in enumerate(path):
+        if char == "/" and route.path_regex.match(path[i:]):
+            return path[:i] + route.path
+    return route.path
+
+
+class TimingMiddleware:
+    """
+    Pure ASGI middleware (headers are added when the response starts, which
+    also works for streaming responses; their timing covers time-to-headers).
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = RequestStats()
+        token = _current.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing(time.perf_counter() - started, stats).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            self._finish(scope, status, time.perf_counter() - started, stats)
+
+    def _finish(self, scope, status: int, seconds: float, stats: RequestStats):
+        route = route_template(scope)
+        method = scope["method"]
+        metrics_registry.observe(method, route, status, seconds, stats)
+
+        threshold = settings.N_PLUS_ONE_THRESHOLD
+        if threshold > 0:
+            repeated = stats.repeated_shapes(threshold)
+            if repeated:
+                metrics_registry.flag_n_plus_one()
+                for shape, n in repeated:
+                    logger.warning(f"Possible N+1 in {method} {route}: {n}x {shape[:300]}")
+
+        if stats.slowest_statement:
+            logger.debug(
+                f"{method} {route} {seconds * 1000:.1f}ms db={stats.db_seconds * 1000:.1f}ms "
+                f"statements={stats.statements} slowest={stats.slowest_seconds * 1000:.1f}ms "
+                f"{stats.slowest_statement[:200]}"
+            )
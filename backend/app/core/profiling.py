@@ -0,0 +1,151 @@
+"""
+Profiling Hooks
+Opt-in cProfile reports for API requests and pipeline stages.
+
+- PROFILE_ENABLED=true profiles every request and every decorated stage.
+- With ADMIN_TOKEN set, a single request is profiled when it sends
+  `?profile=1` (or `X-Profile: 1`) together with `X-Admin-Token: <token>`.
+
+Each run writes `<timestamp>-<name>.prof` (load with pstats or snakeviz) and a
+`.txt` summary sorted by cumulative time to PROFILE_DIR, keeping the newest
+PROFILE_KEEP runs. When disabled nothing is installed: `profile_stage` returns
+the function unchanged and the middleware is not added to the app.
+
+cProfile follows one thread: a request profile covers the event loop (async
+endpoints), and other coroutines interleaving on it show up as well.
+"""
+import cProfile
+import io
+import pstats
+import re
+import threading
+import time
+from contextlib import nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable, Optional
+from urllib.parse import parse_qs
+
+from loguru import logger
+
+from app.core.config import settings
+from app.core.security import is_admin
+
+# Functions listed in the text summary
+SUMMARY_LINES = 40
+
+_active = threading.local()
+
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", name).strip("_")[:80] or "profile"
+
+
+def prune_reports(directory: Path, keep: int):
+    """Delete the oldest reports beyond `keep` (names start with a sortable timestamp)"""
+    reports = sorted(directory.glob("*.prof"))
+    for old in reports[:max(len(reports) - keep, 0)]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".txt").unlink(missing_ok=True)
+
+
+class Profiler:
+    """Context manager profiling the current thread into a report pair"""
+
+    def __init__(self, name: str, directory: Optional[str] = None, keep: Optional[int] = None):
+        self.name = name
+        self.directory = Path(directory or settings.PROFILE_DIR)
+        self.keep = keep or settings.PROFILE_KEEP
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S%f")
+        self.report_name = f"{stamp}-{_slug(name)}"
+        self._profile = cProfile.Profile()
+        self._started = 0.0
+
+    def __enter__(self) -> "Profiler":
+        _active.profiling = True
+        self._started = time.perf_counter()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._profile.disable()
+        _active.profiling = False
+        try:
+            self._write(time.perf_counter() - self._started)
+        except OSError as e:
+            logger.warning(f"Could not write profile {self.report_name}: {e}")
+        return False
+
+    def _write(self, seconds: float):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / self.report_name
+        self._profile.dump_stats(f"{base}.prof")
+
+        summary = io.StringIO()
+        summary.write(f"{self.name}: {seconds * 1000:.1f} ms\n\n")
+        pstats.Stats(self._profile, stream=summary).sort_stats("cumulative").print_stats(SUMMARY_LINES)
+        Path(f"{base}.txt").write_text(summary.getvalue())
+
+        prune_reports(self.directory, self.keep)
+        logger.info(f"Profile written: {base}.prof ({seconds * 1000:.1f} ms)")
+
+
+def profiled(name: str):
+    """Profile a block (e.g. a pipeline stage) when PROFILE_ENABLED, no-op otherwise"""
+    if not settings.PROFILE_ENABLED or getattr(_active, "profiling", False):
+        return nullcontext()
+    return Profiler(name)
+
+
+def profile_stage(name: Optional[str] = None) -> Callable:
+    """
+    Profile every call of a function when PROFILE_ENABLED is set at import time.
+    Otherwise the function is returned as is.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not settings.PROFILE_ENABLED:
+            return func
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with profiled(name or func.__qualname__):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def profiling_installed() -> bool:
+    return settings.PROFILE_ENABLED or bool(settings.ADMIN_TOKEN)
+
+
+def _requested_by_admin(scope) -> bool:
+    headers = {k.decode().lower(): v.decode() for k, v in scope.get("headers", [])}
+    query = parse_qs(scope.get("query_string", b"").decode())
+    asked = query.get("profile", [""])[0] == "1" or headers.get("x-profile") == "1"
+    return asked and is_admin(headers)
+
+
+class ProfilingMiddleware:
+    """Profile whole requests; only added to the app when profiling_installed()"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or getattr(_active, "profiling", False):
+            return await self.app(scope, receive, send)
+        if not (settings.PROFILE_ENABLED or _requested_by_admin(scope)):
+            return await self.app(scope, receive, send)
+
+        profiler = Profiler(f"{scope['method']} {scope['path']}")
+
+        async def send_with_report(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-report", profiler.report_name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        with profiler:
+            await self.app(scope, receive, send_with_report)
@@ -0,0 +1,16 @@
+"""
+Admin access: a shared X-Admin-Token checked against ADMIN_TOKEN
+(admin-only endpoints and on-demand request profiling)
+"""
+import hmac
+from typing import Mapping
+
+from app.core.config import settings
+
+
+def is_admin(headers: Mapping[str, str]) -> bool:
+    """True when the X-Admin-Token header matches ADMIN_TOKEN (never when unset)"""
+    token = settings.ADMIN_TOKEN
+    if not token:
+        return False
+    return hmac.compare_digest(headers.get("x-admin-token", ""), token)
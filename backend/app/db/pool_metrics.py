@@ -0,0 +1,125 @@
+"""
+Connection Pool Metrics
+QueuePool subclasses that time every checkout (waiting for a free connection,
+opening a new one, pre-ping) and count checkouts that had to wait because the
+pool and its overflow were exhausted. Used to size the pool per uvicorn worker:
+sustained waits mean pool_size + max_overflow is too small for the worker's
+concurrency, zero in-use connections most of the time mean it is too large.
+"""
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkout latencies kept for percentiles
+LATENCY_SAMPLES = 2048
+
+
+class PoolMetrics:
+    """Thread-safe checkout counters and a rolling window of latencies (seconds)"""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.waits = 0
+        self.timeouts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float, waited: bool, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self.total_seconds += seconds
+                self.max_seconds = max(self.max_seconds, seconds)
+                self._latencies.append(seconds)
+            if waited:
+                self.waits += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "checkout_ms_avg": round(self.total_seconds / self.checkouts * 1000, 3) if self.checkouts else 0.0,
+                "checkout_ms_max": round(self.max_seconds * 1000, 3),
+            }
+        for pct in (50, 95, 99):
+            value = latencies[min(len(latencies) - 1, len(latencies) * pct // 100)] if latencies else 0.0
+            stats[f"checkout_ms_p{pct}"] = round(value * 1000, 3)
+        return stats
+
+
+class _MeteredPoolMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _exhausted(self) -> bool:
+        """No idle connection and no overflow slot left: the checkout will block"""
+        return self._max_overflow > -1 and self._overflow >= self._max_overflow and self._pool.empty()
+
+    def connect(self):
+        waited = self._exhausted()
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record(time.perf_counter() - started, waited, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started, waited)
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "in_use": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            **self.metrics.snapshot()
+        }
+
+
+class MeteredQueuePool(_MeteredPoolMixin, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_MeteredPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    """Stats for an Engine or AsyncEngine (process-local: one pool per uvicorn worker)"""
+    pool = getattr(engine, "sync_engine", engine).pool
+    if not isinstance(pool, _MeteredPoolMixin):
+        return {"pool": pool.status()}
+    return {"pid": os.getpid(), **pool.stats()}
+
+
+def render_pool_metrics(pools: Dict[str, Dict[str, Any]]) -> str:
+    """Prometheus text lines for pool_stats() results keyed by engine name"""
+    gauges = [
+        ("db_pool_in_use", "gauge", "in_use", "Connections checked out."),
+        ("db_pool_idle", "gauge", "idle", "Idle connections in the pool."),
+        ("db_pool_checkouts_total", "counter", "checkouts", "Connection checkouts."),
+        ("db_pool_waits_total", "counter", "waits", "Checkouts that waited for a free connection."),
+        ("db_pool_timeouts_total", "counter", "timeouts", "Checkouts that timed out."),
+        ("db_pool_checkout_ms_p95", "gauge", "checkout_ms_p95", "Checkout latency p95 (ms)."),
+    ]
+    lines = []
+    for name, kind, key, help_text in gauges:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for engine_name, stats in pools.items():
+            if key in stats:
+                lines.append(f'{name}{{engine="{engine_name}"}} {stats[key]}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,109 @@
+"""
+Shared read queries used across endpoints and services.
+Batch fetches that replace per-contract query loops (N+1).
+"""
+from typing import Dict, List, Iterable, Optional, Tuple
+from datetime import date
+from collections import defaultdict
+from sqlalchemy import Float, Numeric, cast, func, tuple_
+from sqlalchemy.orm import Session, aliased
+
+from app.models.report import WeeklyReport
+from app.models.alert import WhaleAlert
+
+
+def float_columns(model, names: Iterable[str]) -> list:
+    """Model columns by name, DECIMAL cast to float in SQL so rows serialize directly"""
+    columns = []
+    for name in names:
+        column = getattr(model, name)
+        if isinstance(column.type, Numeric) and not isinstance(column.type, Float):
+            column = cast(column, Float)
+        columns.append(column.label(name))
+    return columns
+
+
+def get_latest_reports(
+    db: Session,
+    contract_ids: Optional[Iterable[int]] = None,
+    k: int = 1
+) -> Dict[int, List[WeeklyReport]]:
+    """
+    Latest K weekly reports for every requested contract in one round-trip.
+    Uses ROW_NUMBER() OVER (PARTITION BY contract_id ORDER BY report_date DESC).
+
+    Returns {contract_id: [newest, ..., oldest]}. Contracts without reports are omitted.
+    If contract_ids is None, all contracts are included.
+    """
+    row_number = func.row_number().over(
+        partition_by=WeeklyReport.contract_id,
+        order_by=WeeklyReport.report_date.desc()
+    ).label("rn")
+
+    inner = db.query(WeeklyReport, row_number)
+    if contract_ids is not None:
+        contract_ids = list(contract_ids)
+        if not contract_ids:
+            return {}
+        inner = inner.filter(WeeklyReport.contract_id.in_(contract_ids))
+
+    subq = inner.subquery()
+    ranked = aliased(WeeklyReport, subq)
+
+    reports = db.query(ranked).filter(
+        subq.c.rn <= k
+    ).order_by(subq.c.contract_id, subq.c.rn).all()
+
+    grouped = defaultdict(list)
+    for report in reports:
+        grouped[report.contract_id].append(report)
+    return dict(grouped)
+
+
+def get_reports_by_date(
+    db: Session,
+    keys: Iterable[Tuple[int, date]]
+) -> Dict[Tuple[int, date], WeeklyReport]:
+    """
+    Weekly reports for a set of (contract_id, report_date) pairs in one query.
+    """
+    keys = list(set(keys))
+    if not keys:
+        return {}
+
+    reports = db.query(WeeklyReport).filter(
+        tuple_(WeeklyReport.contract_id, WeeklyReport.report_date).in_(keys)
+    ).all()
+    return {(r.contract_id, r.report_date): r for r in reports}
+
+
+def get_previous_alert_z_scores(
+    db: Session,
+    alert_ids: Iterable[int]
+) -> Dict[int, Optional[float]]:
+    """
+    Z-Score of the previous alert (same contract, earlier date; same-date alerts
+    by id) for each alert id. Uses LAG() over the alerts of the involved
+    contracts in one query.
+    """
+    alert_ids = list(alert_ids)
+    if not alert_ids:
+        return {}
+
+    contract_ids = db.query(WhaleAlert.contract_id).filter(
+        WhaleAlert.id.in_(alert_ids)
+    ).distinct().subquery()
+
+    prev_z = func.lag(WhaleAlert.z_score).over(
+        partition_by=WhaleAlert.contract_id,
+        order_by=(WhaleAlert.report_date, WhaleAlert.id)
+    ).label("prev_z_score")
+
+    subq = db.query(WhaleAlert.id.label("id"), prev_z).filter(
+        WhaleAlert.contract_id.in_(contract_ids.select())
+    ).subquery()
+
+    rows = db.query(subq.c.id, subq.c.prev_z_score).filter(
+        subq.c.id.in_(alert_ids)
+    ).all()
+    return {row.id: row.prev_z_score for row in rows}
@@ -1,13 +1,89 @@
+import asyncio
+from typing import Callable, List, Optional, TypeVar
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
+from starlette.concurrency import run_in_threadpool
 from app.core.config import settings
+from app.db.pool_metrics import MeteredAsyncQueuePool, MeteredQueuePool
+
+T = TypeVar("T")
+
+# Pool settings shared by both engines
+POOL_OPTIONS = dict(
+    pool_pre_ping=True,  # pool_pre_ping=True aiuta a gestire le connessioni cadute
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS
+)
 
 # Creazione dell'engine di connessione
-# pool_pre_ping=True aiuta a gestire le connessioni cadute
 engine = create_engine(
-    settings.SQLALCHEMY_DATABASE_URI, 
-    pool_pre_ping=True
+    settings.SQLALCHEMY_DATABASE_URI,
+    poolclass=MeteredQueuePool,
+    **POOL_OPTIONS
 )
 
 # Fabbrica di sessioni
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Engine asincrono (asyncpg) per gli endpoint async dell'API.
+# Only this engine gets the statement timeout: the sync engine is shared with the
+# pipeline scripts, whose bulk rebuilds legitimately run longer.
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URI,
+    poolclass=MeteredAsyncQueuePool,
+    connect_args={"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}},
+    **POOL_OPTIONS
+)
+
+# expire_on_commit=False: objects stay readable after their session is closed
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+# Upper bound on connections a single run_concurrently() call holds at once
+MAX_CONCURRENT_QUERIES = 4
+
+
+async def run_concurrently(*calls: Callable[[Session], T], release: Optional[AsyncSession] = None) -> List[T]:
+    """
+    Run independent queries concurrently, each on its own AsyncSession (and pooled
+    connection), since a single session cannot execute statements in parallel.
+    Each call receives a sync Session facade (AsyncSession.run_sync), so existing
+    query code and repository helpers run unchanged. Results are returned in order.
+
+    Pass the request's session as `release` when it has already run a statement:
+    it is closed first, so the request doesn't hold one connection while waiting
+    for more (with every request doing that, a full pool deadlocks). The session
+    stays usable and checks out a connection again on its next statement.
+    """
+    if release is not None:
+        await release.close()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    async def run(call):
+        async with semaphore, AsyncSessionLocal() as session:
+            return await session.run_sync(call)
+
+    return await asyncio.gather(*(run(call) for call in calls))
+
+
+async def run_in_threads(*calls: Callable[[Session], T]) -> List[T]:
+    """
+    Like run_concurrently, for calls that also do CPU-bound work (pandas frames,
+    indicators, resampling): each runs on its own sync Session in the threadpool.
+    AsyncSession.run_sync executes on the event loop thread, where such work would
+    stall every other request (SSE heartbeats included). Results are returned in order.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+    def call_in_session(call):
+        with SessionLocal() as session:
+            return call(session)
+
+    async def run(call):
+        async with semaphore:
+            return await run_in_threadpool(call_in_session, call)
+
+    return await asyncio.gather(*(run(call) for call in calls))
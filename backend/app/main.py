@@ -1,6 +1,12 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from app.core.config import settings
+from app.core.cache import response_cache
+from app.core.profiling import ProfilingMiddleware, profiling_installed
+from app.core.instrumentation import TimingMiddleware, install_sql_hooks, metrics_registry
+from app.db.pool_metrics import pool_stats, render_pool_metrics
+from app.db.session import engine, async_engine
 from app.api.v1.api import api_router
 import app.models # Register models
 
@@ -17,14 +23,45 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor", "X-Total-Count"],
 )
 
+# Compress larger responses (history, columnar exports) for clients that accept gzip
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Opt-in cProfile reports (not installed at all unless enabled)
+if profiling_installed():
+    app.add_middleware(ProfilingMiddleware)
+
+# Per-request wall/DB time and statement counts (outermost, so it times everything)
+if settings.METRICS_ENABLED:
+    install_sql_hooks()
+    app.add_middleware(TimingMiddleware)
+
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 @app.get("/health")
 def health_check():
     return {"status": "ok", "version": "2.5.0"}
 
+@app.get("/health/cache")
+def cache_stats():
+    """Response cache hit rate and backend"""
+    return response_cache.get_stats()
+
+@app.get("/health/db")
+def db_pool_stats():
+    """Connection pool usage and checkout latency for this worker process"""
+    return {"sync": pool_stats(engine), "async": pool_stats(async_engine)}
+
+@app.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Request and pool metrics for this worker process, Prometheus text format"""
+    body = metrics_registry.render() + render_pool_metrics(
+        {"sync": pool_stats(engine), "async": pool_stats(async_engine)}
+    )
+    return Response(content=body, media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/")
 def root():
     return {"message": "Welcome to WhaleRadarr API"}
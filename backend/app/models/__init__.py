@@ -4,3 +4,10 @@ from .price import WeeklyPrice
 from .daily_price import DailyPrice
 from .alert import WhaleAlert
 from .statistics import ContractStatistics
+from .radar_snapshot import RadarSnapshot
+from .conviction import ConvictionScore
+from .historical_edge import HistoricalEdgeStat
+from .forward_return import ForwardReturn
+from .cot_index import RollingCotIndex
+from .data_version import DataVersion
+from .change_log import ChangeLog
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DECIMAL, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, DECIMAL, Boolean, ForeignKey, Index, func, literal_column
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from datetime import datetime
@@ -19,3 +19,20 @@ class WhaleAlert(Base):
     created_at = Column(Date, default=datetime.utcnow)
 
     contract = relationship("Contract", back_populates="alerts")
+
+    __table_args__ = (
+        # Keyset pagination of the alert feed (see FEED_ORDER)
+        Index('ix_whale_alerts_feed', 'report_date', func.coalesce(confidence_score, literal_column('1000')), 'id'),
+    )
+
+
+# Alert feed order: newest week, then highest confidence, then id. NULL scores
+# sort above every DECIMAL(5, 2) value, so they come first as with the plain
+# `confidence_score DESC` (NULLS FIRST) order the feed always had.
+# The coalesce must match the ix_whale_alerts_feed expression to use the index.
+NULL_CONFIDENCE_SORT_KEY = 1000
+FEED_ORDER = (
+    WhaleAlert.report_date,
+    func.coalesce(WhaleAlert.confidence_score, literal_column(str(NULL_CONFIDENCE_SORT_KEY))),
+    WhaleAlert.id
+)
@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Integer, BigInteger, String, Date, DateTime, ForeignKey, UniqueConstraint
+from app.db.base import Base
+from datetime import datetime
+
+class ChangeLog(Base):
+    __tablename__ = "change_log"
+
+    id = Column(BigInteger, primary_key=True)
+
+    # Changed row: table ("weekly_reports", "whale_alerts", "weekly_prices") + contract week
+    table_name = Column(String(50), nullable=False)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    report_date = Column(Date, nullable=False)
+
+    # Global data version of the latest change (one entry per row, moved forward on every change)
+    version = Column(BigInteger, nullable=False, index=True)
+    changed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('table_name', 'contract_id', 'report_date', name='uq_change_log_row'),
+    )
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, BigInteger, Date, Float, ForeignKey, UniqueConstraint
+from app.db.base import Base
+
+class ConvictionScore(Base):
+    __tablename__ = "conviction_scores"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    report_date = Column(Date, nullable=False, index=True)
+    
+    # Final score (0-100, confidence assumed 1.0) and weekly rank among active contracts
+    score = Column(Float, nullable=False)
+    rank = Column(Integer, nullable=True)
+    
+    # Raw inputs
+    sentiment_gap = Column(Float, nullable=True)
+    net_change = Column(BigInteger, nullable=True)
+    win_rate = Column(Float, nullable=True)
+    
+    # Components (0-100)
+    signal_quality = Column(Float, nullable=True)
+    sentiment_divergence = Column(Float, nullable=True)
+    capital_momentum = Column(Float, nullable=True)
+    historical_edge = Column(Float, nullable=True)
+    concentration = Column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('contract_id', 'report_date', name='uq_contract_conviction'),
+    )
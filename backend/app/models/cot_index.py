@@ -0,0 +1,40 @@
+from sqlalchemy import Column, Integer, Date, Float, ForeignKey, UniqueConstraint
+from app.db.base import Base
+
+# Rolling windows stored in the cot_indexes table (report weeks)
+COT_WINDOWS = [26, 52, 156]
+
+# Trader category -> net position column (categories match contract_statistics)
+TRADER_NET_COLUMNS = {
+    "dealer": "dealer_net",
+    "asset_mgr": "asset_mgr_net",
+    "lev_money": "lev_net"
+}
+
+
+def index_column(trader: str, window: int) -> str:
+    return f"{trader}_{window}w"
+
+
+class RollingCotIndex(Base):
+    __tablename__ = "cot_indexes"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    report_date = Column(Date, nullable=False, index=True)
+
+    # Rolling COT Index (0-100) of net positions over the last N report weeks
+    # NULL until the window has enough history
+    dealer_26w = Column(Float, nullable=True)
+    dealer_52w = Column(Float, nullable=True)
+    dealer_156w = Column(Float, nullable=True)
+    asset_mgr_26w = Column(Float, nullable=True)
+    asset_mgr_52w = Column(Float, nullable=True)
+    asset_mgr_156w = Column(Float, nullable=True)
+    lev_money_26w = Column(Float, nullable=True)
+    lev_money_52w = Column(Float, nullable=True)
+    lev_money_156w = Column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('contract_id', 'report_date', name='uq_contract_cot_index'),
+    )
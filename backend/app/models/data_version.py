@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey
+from app.db.base import Base
+from datetime import datetime
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    # "global" or "contract:{id}"
+    scope = Column(String(50), primary_key=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # Incremented on every write that changes data served by the read endpoints
+    version = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, Date, Float, DECIMAL, ForeignKey, UniqueConstraint
+from app.db.base import Base
+
+class ForwardReturn(Base):
+    __tablename__ = "forward_returns"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False)
+    report_date = Column(Date, nullable=False, index=True) # Entry week (COT Tuesday)
+    
+    close_price = Column(DECIMAL(16, 6), nullable=False) # Entry close
+    
+    # Raw % return to the first weekly close within 13 days after entry + N weeks
+    # NULL until enough future prices exist
+    ret_1w = Column(Float, nullable=True)
+    ret_2w = Column(Float, nullable=True)
+    ret_4w = Column(Float, nullable=True)
+    ret_8w = Column(Float, nullable=True)
+    ret_13w = Column(Float, nullable=True)
+    ret_26w = Column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('contract_id', 'report_date', name='uq_contract_forward_return'),
+    )
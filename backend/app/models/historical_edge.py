@@ -0,0 +1,25 @@
+from sqlalchemy import Column, Integer, Float, DateTime, ForeignKey, UniqueConstraint
+from app.db.base import Base
+from datetime import datetime
+
+class HistoricalEdgeStat(Base):
+    __tablename__ = "historical_edge_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    contract_id = Column(Integer, ForeignKey("contracts.id", ondelete="CASCADE"), nullable=False, index=True)
+    
+    # Backtest parameters
+    threshold = Column(Float, nullable=False)      # Sentiment gap threshold (%)
+    forward_weeks = Column(Integer, nullable=False)
+    lookback_years = Column(Integer, nullable=False)
+    
+    # Results
+    sample_size = Column(Integer, default=0)
+    win_rate = Column(Float, nullable=True)        # 0-100
+    avg_return = Column(Float, nullable=True)      # % (direction adjusted)
+    
+    computed_at = Column(DateTime, default=datetime.utcnow)
+
+    __table_args__ = (
+        UniqueConstraint('contract_id', 'threshold', 'forward_weeks', 'lookback_years', name='uq_contract_edge_stat'),
+    )
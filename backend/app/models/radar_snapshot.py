@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime
+from sqlalchemy.dialects.postgresql import JSONB
+from app.db.base import Base
+from datetime import datetime
+
+class RadarSnapshot(Base):
+    __tablename__ = "radar_snapshots"
+
+    id = Column(Integer, primary_key=True, index=True)
+    report_date = Column(Date, nullable=True, index=True) # Latest COT report date covered by the snapshot
+    
+    payload = Column(JSONB, nullable=False) # Full /analysis/radar response
+    etag = Column(String(64), nullable=False)
+    
+    created_at = Column(DateTime, default=datetime.utcnow)
+    staleness_refreshed_at = Column(DateTime, nullable=True) # Last live staleness refresh
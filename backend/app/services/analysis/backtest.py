@@ -0,0 +1,329 @@
+"""
+Vectorized Backtest Engine
+Loads reports and prices once, then evaluates sentiment gap signals over
+any grid of thresholds x forward horizons x lookback windows
+"""
+from typing import List, Dict, Iterable, Optional, Tuple
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from app.models.report import WeeklyReport
+from app.models.price import WeeklyPrice
+from app.models.forward_return import ForwardReturn
+from app.services.analysis.forward_returns import (
+    FORWARD_HORIZONS, compute_forward_returns, return_column
+)
+
+GAP_COLUMNS = ["asset_mgr_long", "asset_mgr_short", "non_report_long", "non_report_short"]
+
+
+def calculate_sentiment_gaps(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized calculate_sentiment_gap over a DataFrame of report columns"""
+    values = df[GAP_COLUMNS].fillna(0).astype(float)
+
+    am_long = values["asset_mgr_long"].to_numpy()
+    am_short = values["asset_mgr_short"].to_numpy()
+    retail_long = values["non_report_long"].to_numpy()
+    retail_short = values["non_report_short"].to_numpy()
+
+    whale_total = np.abs(am_long) + np.abs(am_short)
+    retail_total = np.abs(retail_long) + np.abs(retail_short)
+    valid = (whale_total != 0) & (retail_total != 0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        whale_pct = (am_long - am_short) / whale_total * 100
+        retail_pct = (retail_long - retail_short) / retail_total * 100
+
+    return np.where(valid, whale_pct - retail_pct, 0.0)
+
+
+def lookback_cutoff(lookback_years: int) -> datetime:
+    return datetime.now() - timedelta(days=365 * lookback_years)
+
+
+def cell_rng(seed: int, contract_id: int, threshold: float, h: int, ly: int) -> np.random.Generator:
+    """
+    Generator for one grid cell, seeded by the cell itself: its intervals don't
+    depend on which other cells (sweep grid or /historical-edge) ran before it.
+    The threshold enters as the raw bits of its float64 value.
+    """
+    threshold_bits = np.frombuffer(np.float64(threshold).tobytes(), dtype=np.uint32).tolist()
+    return np.random.default_rng([seed, int(contract_id), int(h), int(ly), *threshold_bits])
+
+
+def bootstrap_ci(
+    returns: np.ndarray,
+    wins: np.ndarray,
+    n_resamples: int,
+    confidence: float = 0.95,
+    rng: Optional[np.random.Generator] = None
+) -> Dict:
+    """
+    Percentile bootstrap intervals for win rate and average return.
+    All resamples are drawn as one (n_resamples x n) index matrix.
+    """
+    rng = rng if rng is not None else np.random.default_rng(0)
+    n = len(returns)
+    idx = rng.integers(0, n, size=(n_resamples, n))
+
+    win_rates = wins[idx].mean(axis=1) * 100
+    avg_returns = returns[idx].mean(axis=1)
+
+    tail = (1 - confidence) / 2 * 100
+    q = [tail, 100 - tail]
+    win_lo, win_hi = np.percentile(win_rates, q)
+    ret_lo, ret_hi = np.percentile(avg_returns, q)
+
+    return {
+        "win_rate_ci": [round(float(win_lo), 1), round(float(win_hi), 1)],
+        "avg_return_ci": [round(float(ret_lo), 2), round(float(ret_hi), 2)]
+    }
+
+
+def empty_edge_result(threshold: float, forward_weeks: int, lookback_years: int, with_ci: bool = False) -> Dict:
+    result = {
+        "threshold": threshold,
+        "forward_weeks": forward_weeks,
+        "lookback_years": lookback_years,
+        "sample_size": 0,
+        "win_rate": 0.0,
+        "avg_return": 0.0,
+        "max_return": 0.0,
+        "min_return": 0.0,
+        "occurrences": []
+    }
+    if with_ci:
+        result.update({"win_rate_ci": None, "avg_return_ci": None})
+    return result
+
+
+class BacktestEngine:
+    """
+    Holds one preloaded signal frame: a row per (contract, report week) with the
+    sentiment gap, the entry close and the forward return for every horizon.
+    """
+    def __init__(self, frame: pd.DataFrame, horizons: Iterable[int]):
+        """
+        Args:
+            frame: contract_id, report_date, GAP_COLUMNS, close_price and ret_{h}w per horizon
+        """
+        self.horizons = sorted(set(int(h) for h in horizons))
+        self.frame = self._build_frame(frame, self.horizons)
+
+    @classmethod
+    def from_prices(
+        cls,
+        reports: pd.DataFrame,
+        prices: pd.DataFrame,
+        horizons: Iterable[int]
+    ) -> "BacktestEngine":
+        """Compute forward returns from raw weekly prices (horizons outside the stored table)"""
+        horizons = list(horizons)
+        return cls(cls._join_prices(reports, prices, horizons), horizons)
+
+    @staticmethod
+    def _join_prices(reports: pd.DataFrame, prices: pd.DataFrame, horizons: List[int]) -> pd.DataFrame:
+        if reports.empty or prices.empty:
+            return pd.DataFrame()
+
+        returns = compute_forward_returns(prices, horizons)
+        reports = reports.copy()
+        reports["report_date"] = pd.to_datetime(reports["report_date"])
+        return reports.merge(returns, on=["contract_id", "report_date"], how="inner")
+
+    @classmethod
+    def from_db(
+        cls,
+        db: Session,
+        contract_ids: Iterable[int],
+        lookback_years: int,
+        horizons: Iterable[int]
+    ) -> "BacktestEngine":
+        """
+        Join reports with the precomputed forward_returns table in one query.
+        Falls back to raw weekly prices for non-standard horizons, and for contracts
+        the table doesn't cover yet (unbuilt table, newly added contract).
+        """
+        contract_ids = list(contract_ids)
+        horizons = list(horizons)
+        cutoff = lookback_cutoff(lookback_years).date()
+        connection = db.connection()
+
+        stored = pd.DataFrame()
+        if set(horizons) <= set(FORWARD_HORIZONS):
+            query = db.query(
+                WeeklyReport.contract_id,
+                WeeklyReport.report_date,
+                *[getattr(WeeklyReport, col) for col in GAP_COLUMNS],
+                ForwardReturn.close_price,
+                *[getattr(ForwardReturn, return_column(h)) for h in horizons]
+            ).join(
+                ForwardReturn,
+                and_(
+                    ForwardReturn.contract_id == WeeklyReport.contract_id,
+                    ForwardReturn.report_date == WeeklyReport.report_date
+                )
+            ).filter(
+                WeeklyReport.contract_id.in_(contract_ids),
+                WeeklyReport.report_date >= cutoff
+            )
+
+            stored = pd.read_sql(query.statement, connection)
+            stored["report_date"] = pd.to_datetime(stored["report_date"])
+
+        missing = sorted(set(contract_ids) - set(stored["contract_id"])) if not stored.empty else contract_ids
+        if not missing:
+            return cls(stored, horizons)
+
+        reports_query = db.query(
+            WeeklyReport.contract_id,
+            WeeklyReport.report_date,
+            *[getattr(WeeklyReport, col) for col in GAP_COLUMNS]
+        ).filter(
+            WeeklyReport.contract_id.in_(missing),
+            WeeklyReport.report_date >= cutoff
+        )
+
+        prices_query = db.query(
+            WeeklyPrice.contract_id,
+            WeeklyPrice.report_date,
+            WeeklyPrice.close_price
+        ).filter(
+            WeeklyPrice.contract_id.in_(missing),
+            WeeklyPrice.report_date >= cutoff,
+            WeeklyPrice.close_price != None
+        )
+
+        reports = pd.read_sql(reports_query.statement, connection)
+        prices = pd.read_sql(prices_query.statement, connection)
+        computed = cls._join_prices(reports, prices, horizons)
+        frames = [f for f in (stored, computed) if not f.empty]
+        return cls(pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(), horizons)
+
+    @staticmethod
+    def _build_frame(frame: pd.DataFrame, horizons: List[int]) -> pd.DataFrame:
+        if frame.empty:
+            return pd.DataFrame()
+
+        built = frame[["contract_id", "report_date"]].copy()
+        built["report_date"] = pd.to_datetime(built["report_date"])
+        built["gap"] = calculate_sentiment_gaps(frame)
+        built["entry_price"] = frame["close_price"].astype(float)
+        for h in horizons:
+            built[return_column(h)] = frame[return_column(h)].astype(float)
+
+        built = built[built["entry_price"].notna() & (built["entry_price"] != 0)]
+        return built.sort_values(["contract_id", "report_date"]).reset_index(drop=True)
+
+    def evaluate(
+        self,
+        thresholds: Iterable[float],
+        forward_weeks: Iterable[int],
+        lookback_years: Iterable[int],
+        contract_ids: Optional[Iterable[int]] = None,
+        include_occurrences: bool = True,
+        n_bootstrap: int = 0,
+        confidence: float = 0.95,
+        seed: int = 0
+    ) -> Dict[Tuple[int, float, int, int], Dict]:
+        """
+        Backtest statistics for every (contract_id, threshold, forward_weeks, lookback_years).
+        Forward horizons must have been preloaded in the constructor.
+        With n_bootstrap > 0, win rate and average return get bootstrap confidence intervals
+        (seeded per cell, so a cell gets the same intervals in any grid).
+        """
+        thresholds = list(thresholds)
+        forward_weeks = list(forward_weeks)
+        lookback_years = list(lookback_years)
+        missing = set(forward_weeks) - set(self.horizons)
+        if missing:
+            raise ValueError(f"Forward horizons not preloaded: {sorted(missing)}")
+
+        if contract_ids is None:
+            contract_ids = self.frame["contract_id"].unique().tolist() if not self.frame.empty else []
+
+        results = {}
+        groups = dict(tuple(self.frame.groupby("contract_id"))) if not self.frame.empty else {}
+        cutoffs = {ly: np.datetime64(lookback_cutoff(ly)) for ly in lookback_years}
+
+        for contract_id in contract_ids:
+            group = groups.get(contract_id)
+            for ly in lookback_years:
+                for h in forward_weeks:
+                    for threshold in thresholds:
+                        key = (contract_id, threshold, h, ly)
+                        if group is None:
+                            results[key] = empty_edge_result(threshold, h, ly, with_ci=n_bootstrap > 0)
+                            continue
+                        results[key] = self._evaluate_group(
+                            group, threshold, h, ly, cutoffs[ly], include_occurrences,
+                            n_bootstrap, confidence,
+                            cell_rng(seed, contract_id, threshold, h, ly) if n_bootstrap > 0 else None
+                        )
+
+        return results
+
+    def _evaluate_group(
+        self, group, threshold, h, ly, cutoff, include_occurrences,
+        n_bootstrap=0, confidence=0.95, rng=None
+    ) -> Dict:
+        dates = group["report_date"].to_numpy()
+        gap = group["gap"].to_numpy()
+        entry = group["entry_price"].to_numpy()
+        forward = group[return_column(h)].to_numpy()
+
+        mask = (dates >= cutoff) & (np.abs(gap) >= threshold) & ~np.isnan(forward)
+        if not mask.any():
+            return empty_edge_result(threshold, h, ly, with_ci=n_bootstrap > 0)
+
+        gap_m = gap[mask]
+        entry_m = entry[mask]
+        exit_m = entry_m * (1 + forward[mask] / 100)
+
+        # Short signals (whales net short vs retail) invert the return
+        direction = np.where(gap_m > 0, 1.0, -1.0)
+        raw_returns = forward[mask] * direction
+        wins = raw_returns > 0
+        returns = np.round(raw_returns, 2)
+        n = len(returns)
+
+        result = {
+            "threshold": threshold,
+            "forward_weeks": h,
+            "lookback_years": ly,
+            "sample_size": n,
+            "win_rate": round(float(wins.sum()) / n * 100, 1),
+            "avg_return": round(float(returns.mean()), 2),
+            "max_return": round(float(returns.max()), 2),
+            "min_return": round(float(returns.min()), 2),
+            "median_return": round(float(np.sort(returns)[n // 2]), 2),
+            "win_avg": round(float(returns[wins].mean()), 2) if wins.any() else 0.0,
+            "loss_avg": round(float(returns[~wins].mean()), 2) if (~wins).any() else 0.0,
+            "occurrences": []
+        }
+
+        if n_bootstrap > 0:
+            result.update(bootstrap_ci(returns, wins.astype(float), n_bootstrap, confidence, rng))
+
+        if include_occurrences:
+            dates_m = pd.to_datetime(dates[mask])
+            tail = slice(max(n - 10, 0), n)  # Last 10 for reference
+            result["occurrences"] = [
+                {
+                    "date": d.date().isoformat(),
+                    "gap": round(float(g), 2),
+                    "direction": "long" if g > 0 else "short",
+                    "entry_price": round(float(en), 2),
+                    "exit_price": round(float(ex), 2),
+                    "return_pct": float(r),
+                    "win": bool(w)
+                }
+                for d, g, en, ex, r, w in zip(
+                    dates_m[tail], gap_m[tail], entry_m[tail], exit_m[tail], returns[tail], wins[tail]
+                )
+            ]
+
+        return result
@@ -0,0 +1,321 @@
+"""
+Conviction History Engine
+Vectorized Institutional Conviction Score for every contract and every historical week
+"""
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from loguru import logger
+
+from app.models.contract import Contract
+from app.models.conviction import ConvictionScore
+from app.models.historical_edge import HistoricalEdgeStat
+from app.models.report import WeeklyReport
+from app.services.analysis.backtest import BacktestEngine, calculate_sentiment_gaps
+from app.services.analysis.forward_returns import return_column
+from app.services.analysis.historical_edge import (
+    MIN_EDGE_SAMPLES, STANDARD_FORWARD_WEEKS, STANDARD_LOOKBACK_YEARS, STANDARD_THRESHOLDS
+)
+
+REPORT_COLUMNS = [
+    "contract_id", "report_date",
+    "asset_mgr_long", "asset_mgr_short",
+    "non_report_long", "non_report_short",
+    "open_interest"
+]
+
+
+def compute_conviction_history(df: pd.DataFrame, edge_stats: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Vectorized equivalent of SmartRadarService._calculate_conviction(is_current=False).
+    Past weeks are scored with full confidence (1.0).
+
+    Args:
+        df: One row per (contract_id, report_date) with REPORT_COLUMNS
+        edge_stats: Backtest stats (contract_id, threshold, sample_size, win_rate), applied
+            to every week; with a report_date column, each week gets its own stats
+            (see point_in_time_edge_stats)
+
+    Returns:
+        DataFrame with raw inputs, the five components (0-100), score and weekly rank
+    """
+    if df.empty:
+        return pd.DataFrame()
+
+    df = df.sort_values(["contract_id", "report_date"]).reset_index(drop=True)
+    values = df[REPORT_COLUMNS[2:]].fillna(0).astype(float)
+
+    am_long = values["asset_mgr_long"].to_numpy()
+    am_short = values["asset_mgr_short"].to_numpy()
+    retail_long = values["non_report_long"].to_numpy()
+    retail_short = values["non_report_short"].to_numpy()
+    open_interest = values["open_interest"].to_numpy()
+
+    # 1. Confidence (assumed fresh for historical weeks)
+    confidence = np.ones(len(df))
+
+    # 2. Sentiment Gap
+    am_long_pct = am_long / (am_long + am_short + 1) * 100
+    retail_long_pct = retail_long / (retail_long + retail_short + 1) * 100
+    sentiment_gap = am_long_pct - retail_long_pct
+
+    # 3. Capital Flow Momentum (first week of a contract compares with itself)
+    am_net = pd.Series(am_long - am_short)
+    am_net_prev = am_net.groupby(df["contract_id"]).shift(1).fillna(am_net).to_numpy()
+    net_change = am_net.to_numpy() - am_net_prev
+    position_change_pct = net_change / (np.abs(am_net_prev) + 1)
+
+    # 4. Historical Edge (cached backtest win rate, heuristic fallback)
+    est_win_rate = 0.50 + (np.minimum(np.abs(sentiment_gap), 60) / 60) * 0.25
+    edge_win_rate = _select_edge_win_rates(df, edge_stats)
+    est_win_rate = np.where(np.isnan(edge_win_rate), est_win_rate, edge_win_rate / 100.0)
+
+    # 5. Concentration
+    exposure_ratio = (am_long + am_short) / (open_interest + 1)
+
+    # Score Components
+    signal_quality = confidence * confidence
+    sentiment_divergence = np.minimum(np.abs(sentiment_gap) / 40.0, 1.0)
+    capital_momentum = np.clip(np.abs(position_change_pct) / 0.20, 0, 1.0)
+    historical_edge = np.clip((est_win_rate - 0.50) / 0.20, 0, 1.0)
+    concentration = np.minimum(exposure_ratio / 0.15, 1.0)
+
+    conviction = (
+        0.25 * signal_quality +
+        0.20 * sentiment_divergence +
+        0.20 * capital_momentum +
+        0.20 * historical_edge +
+        0.15 * concentration
+    )
+
+    result = pd.DataFrame({
+        "contract_id": df["contract_id"].to_numpy(),
+        "report_date": df["report_date"].to_numpy(),
+        "score": np.round(conviction * 100, 1),
+        "sentiment_gap": np.round(sentiment_gap, 1),
+        "net_change": net_change.astype(np.int64),
+        "win_rate": np.round(est_win_rate * 100),
+        "signal_quality": np.round(signal_quality * 100, 1),
+        "sentiment_divergence": np.round(sentiment_divergence * 100, 1),
+        "capital_momentum": np.round(capital_momentum * 100, 1),
+        "historical_edge": np.round(historical_edge * 100, 1),
+        "concentration": np.round(concentration * 100, 1)
+    })
+
+    # Weekly rank across contracts (1 = highest conviction)
+    result["rank"] = result.groupby("report_date")["score"].rank(
+        method="min", ascending=False
+    ).astype(int)
+
+    return result
+
+
+def _select_edge_win_rates(df: pd.DataFrame, edge_stats: Optional[pd.DataFrame]) -> np.ndarray:
+    """
+    Vectorized select_edge_stat: win rate of the highest usable threshold each week's gap reaches.
+    NaN where no usable stat exists.
+    """
+    win_rates = np.full(len(df), np.nan)
+    if edge_stats is None or edge_stats.empty:
+        return win_rates
+
+    usable = edge_stats[
+        (edge_stats["sample_size"] >= MIN_EDGE_SAMPLES) & edge_stats["win_rate"].notna()
+    ]
+    abs_gap = np.abs(calculate_sentiment_gaps(df))
+
+    # Per-week stats are matched on the week too
+    keys = ["contract_id", "report_date"] if "report_date" in edge_stats.columns else ["contract_id"]
+    rows = df[keys].copy()
+    if "report_date" in keys:
+        rows["report_date"] = pd.to_datetime(rows["report_date"])
+        usable = usable.assign(report_date=pd.to_datetime(usable["report_date"]))
+
+    # Ascending thresholds: the first usable one is the floor, higher ones override when reached
+    for threshold, group in usable.groupby("threshold", sort=True):
+        mapped = rows.merge(group[keys + ["win_rate"]], on=keys, how="left")["win_rate"].to_numpy(dtype=float)
+        mask = ~np.isnan(mapped) & (np.isnan(win_rates) | (abs_gap >= threshold))
+        win_rates[mask] = mapped[mask]
+
+    return win_rates
+
+
+def point_in_time_edge_stats(
+    frame: pd.DataFrame,
+    thresholds: List[float] = STANDARD_THRESHOLDS,
+    forward_weeks: int = STANDARD_FORWARD_WEEKS,
+    lookback_years: int = STANDARD_LOOKBACK_YEARS
+) -> pd.DataFrame:
+    """
+    Edge stats as they could have been computed on each report week: signals of
+    the `lookback_years` before it whose forward return had closed by then
+    (signal week + forward_weeks <= week). Same wins and rounding as the backtest.
+
+    Args:
+        frame: BacktestEngine frame (contract_id, report_date, gap, forward return
+            column), sorted by contract and date
+
+    Returns:
+        contract_id, report_date, threshold, sample_size, win_rate (NaN without samples)
+    """
+    columns = ["contract_id", "report_date", "threshold", "sample_size", "win_rate"]
+    if frame.empty:
+        return pd.DataFrame(columns=columns)
+
+    column = return_column(forward_weeks)
+    parts = []
+    for contract_id, group in frame.groupby("contract_id", sort=False):
+        dates = group["report_date"].to_numpy()
+        gap = group["gap"].to_numpy()
+        forward = group[column].to_numpy()
+        wins = forward * np.where(gap > 0, 1.0, -1.0) > 0
+
+        # Signal index window [window_start, closed_by) of each week
+        closed_by = np.searchsorted(dates, dates - np.timedelta64(7 * forward_weeks, "D"), side="right")
+        window_start = np.searchsorted(dates, dates - np.timedelta64(365 * lookback_years, "D"), side="left")
+
+        for threshold in thresholds:
+            signal = (np.abs(gap) >= threshold) & ~np.isnan(forward)
+            signals = np.concatenate([[0], np.cumsum(signal)])
+            won = np.concatenate([[0], np.cumsum(signal & wins)])
+            sample_size = np.maximum(signals[closed_by] - signals[window_start], 0)
+            win_count = np.maximum(won[closed_by] - won[window_start], 0)
+            win_rate = np.where(
+                sample_size > 0, np.round(win_count / np.maximum(sample_size, 1) * 100, 1), np.nan
+            )
+            parts.append(pd.DataFrame({
+                "contract_id": contract_id,
+                "report_date": dates,
+                "threshold": threshold,
+                "sample_size": sample_size,
+                "win_rate": win_rate
+            }))
+
+    return pd.concat(parts, ignore_index=True)
+
+
+def edge_stats_by_week(
+    stats: pd.DataFrame, keys: List[Tuple[int, date]]
+) -> Dict[Tuple[int, date], List[HistoricalEdgeStat]]:
+    """
+    Point-in-time stats of the requested (contract_id, report_date) weeks as
+    HistoricalEdgeStat rows (not persisted), for select_edge_stat.
+    """
+    wanted = set(keys)
+    result: Dict[Tuple[int, date], List[HistoricalEdgeStat]] = {}
+    if stats.empty or not wanted:
+        return result
+
+    for row in stats.sort_values("threshold").itertuples(index=False):
+        key = (int(row.contract_id), pd.Timestamp(row.report_date).date())
+        if key not in wanted:
+            continue
+        result.setdefault(key, []).append(HistoricalEdgeStat(
+            contract_id=key[0],
+            threshold=float(row.threshold),
+            sample_size=int(row.sample_size),
+            win_rate=None if np.isnan(row.win_rate) else float(row.win_rate)
+        ))
+    return result
+
+
+class ConvictionHistoryService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def load_reports(self) -> pd.DataFrame:
+        """Load the report columns needed for scoring, for all active contracts"""
+        query = self.db.query(
+            *[getattr(WeeklyReport, col) for col in REPORT_COLUMNS]
+        ).join(
+            Contract, Contract.id == WeeklyReport.contract_id
+        ).filter(Contract.is_active == True)
+
+        return pd.read_sql(query.statement, self.db.connection())
+
+    def load_edge_stats(self, reports: pd.DataFrame) -> pd.DataFrame:
+        """
+        Point-in-time edge stats at the standard horizon for every report week.
+        The cached HistoricalEdgeStat rows cover the whole history up to today:
+        applied to past weeks they would score them with later outcomes.
+        """
+        if reports.empty:
+            return pd.DataFrame()
+
+        first = pd.to_datetime(reports["report_date"]).min()
+        years = (pd.Timestamp.now() - first).days // 365 + 1
+        engine = BacktestEngine.from_db(
+            self.db, reports["contract_id"].unique().tolist(), years, horizons=[STANDARD_FORWARD_WEEKS]
+        )
+        return point_in_time_edge_stats(engine.frame)
+
+    def load_edge_stats_on(self, keys: List[Tuple[int, date]]) -> Dict[Tuple[int, date], List[HistoricalEdgeStat]]:
+        """
+        Point-in-time edge stats for (contract_id, report_date) pairs, so live
+        radar scores use the same edge as the stored history.
+        """
+        if not keys:
+            return {}
+
+        first = min(report_date for _, report_date in keys)
+        years = (date.today() - first).days // 365 + STANDARD_LOOKBACK_YEARS + 1
+        engine = BacktestEngine.from_db(
+            self.db, sorted({contract_id for contract_id, _ in keys}), years, horizons=[STANDARD_FORWARD_WEEKS]
+        )
+        return edge_stats_by_week(point_in_time_edge_stats(engine.frame), keys)
+
+    def rebuild(self, chunk_size: int = 5000) -> int:
+        """
+        Recompute and upsert the conviction history for every contract-week.
+        Each week's historical edge uses only outcomes known by that week.
+        Returns the number of rows written.
+        """
+        logger.info("Rebuilding conviction score history...")
+        reports = self.load_reports()
+        history = compute_conviction_history(reports, self.load_edge_stats(reports))
+
+        if history.empty:
+            logger.warning("No reports found, conviction history not updated")
+            return 0
+
+        records = history.to_dict(orient="records")
+        update_cols = [c for c in history.columns if c not in ("contract_id", "report_date")]
+
+        try:
+            for start in range(0, len(records), chunk_size):
+                stmt = insert(ConvictionScore).values(records[start:start + chunk_size])
+                upsert_stmt = stmt.on_conflict_do_update(
+                    constraint='uq_contract_conviction',
+                    set_={col: stmt.excluded[col] for col in update_cols}
+                )
+                self.db.execute(upsert_stmt)
+            self.db.commit()
+            logger.success(f"Upserted {len(records)} conviction scores")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to save conviction history: {e}")
+            raise
+
+        return len(records)
+
+    def get_scores_on(self, keys: List[tuple]) -> Dict[tuple, ConvictionScore]:
+        """Stored scores for (contract_id, report_date) pairs in one query"""
+        keys = list(set(keys))
+        if not keys:
+            return {}
+
+        rows = self.db.query(ConvictionScore).filter(
+            tuple_(ConvictionScore.contract_id, ConvictionScore.report_date).in_(keys)
+        ).all()
+        return {(r.contract_id, r.report_date): r for r in rows}
+
+    def get_history(self, contract_id: int, weeks: int = 52) -> List[ConvictionScore]:
+        """Score history for a contract, oldest first"""
+        rows = self.db.query(ConvictionScore).filter(
+            ConvictionScore.contract_id == contract_id
+        ).order_by(ConvictionScore.report_date.desc()).limit(weeks).all()
+        return list(reversed(rows))
@@ -0,0 +1,137 @@
+"""
+Rolling COT Index Engine
+Per-week COT Index (0-100 position of net positions in their trailing range)
+for every contract, trader category and rolling window
+"""
+from typing import Dict, Iterable, List, Optional
+from datetime import date
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from loguru import logger
+
+from app.models.cot_index import RollingCotIndex, COT_WINDOWS, TRADER_NET_COLUMNS, index_column
+from app.models.report import WeeklyReport
+
+# Weeks of history required before a window produces an index
+MIN_WINDOW_WEEKS = 13
+
+# Index when the window range is flat (same neutral value as alert generation)
+FLAT_RANGE_INDEX = 50.0
+
+
+def rolling_cot_index(values: pd.Series, groups: pd.Series, window: int) -> np.ndarray:
+    """
+    Rolling COT Index of one net-position series per group (contract).
+    Rows must be sorted by (group, date). pandas' rolling min/max keep a monotonic
+    deque of candidate indices, so each series is O(n) regardless of the window.
+    """
+    grouped = values.astype(float).groupby(groups.to_numpy(), sort=False)
+    min_periods = min(window, MIN_WINDOW_WEEKS)
+    lo = grouped.rolling(window, min_periods=min_periods).min().to_numpy()
+    hi = grouped.rolling(window, min_periods=min_periods).max().to_numpy()
+
+    current = values.to_numpy(dtype=float)
+    span = hi - lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        index = np.where(span > 0, (current - lo) / span * 100, FLAT_RANGE_INDEX)
+    return np.where(np.isnan(lo) | np.isnan(current), np.nan, np.round(index, 1))
+
+
+def compute_rolling_cot_indexes(
+    reports: pd.DataFrame,
+    windows: Iterable[int] = COT_WINDOWS,
+    traders: Iterable[str] = TRADER_NET_COLUMNS
+) -> pd.DataFrame:
+    """
+    Args:
+        reports: contract_id, report_date and the net columns in TRADER_NET_COLUMNS
+
+    Returns:
+        contract_id, report_date and an {trader}_{window}w column per combination
+    """
+    windows = list(windows)
+    traders = list(traders)
+    columns = ["contract_id", "report_date"] + [index_column(t, w) for t in traders for w in windows]
+    if reports.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = reports.sort_values(["contract_id", "report_date"]).reset_index(drop=True)
+    for trader in traders:
+        net = frame[TRADER_NET_COLUMNS[trader]]
+        for window in windows:
+            frame[index_column(trader, window)] = rolling_cot_index(net, frame["contract_id"], window)
+
+    return frame[columns]
+
+
+class CotIndexService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rebuild(self, chunk_size: int = 5000) -> int:
+        """Recompute the rolling COT Index for every contract-week"""
+        logger.info("Rebuilding rolling COT indexes...")
+        query = self.db.query(
+            WeeklyReport.contract_id,
+            WeeklyReport.report_date,
+            *[getattr(WeeklyReport, col) for col in TRADER_NET_COLUMNS.values()]
+        )
+        reports = pd.read_sql(query.statement, self.db.connection())
+        indexes = compute_rolling_cot_indexes(reports)
+
+        if indexes.empty:
+            logger.warning("No reports found, COT indexes not updated")
+            return 0
+
+        indexes = indexes.astype(object).where(indexes.notna(), None)
+        records = indexes.to_dict(orient="records")
+        update_cols = [c for c in indexes.columns if c not in ("contract_id", "report_date")]
+
+        try:
+            for start in range(0, len(records), chunk_size):
+                stmt = insert(RollingCotIndex).values(records[start:start + chunk_size])
+                upsert_stmt = stmt.on_conflict_do_update(
+                    constraint='uq_contract_cot_index',
+                    set_={col: stmt.excluded[col] for col in update_cols}
+                )
+                self.db.execute(upsert_stmt)
+            self.db.commit()
+            logger.success(f"Upserted {len(records)} COT index rows")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to save COT indexes: {e}")
+            raise
+
+        return len(records)
+
+    def load(
+        self,
+        contract_ids: List[int],
+        start_date: date,
+        trader: str,
+        window: int
+    ) -> pd.DataFrame:
+        """contract_id, report_date, cot_index for one trader category and window"""
+        column = getattr(RollingCotIndex, index_column(trader, window))
+        query = self.db.query(
+            RollingCotIndex.contract_id,
+            RollingCotIndex.report_date,
+            column.label("cot_index")
+        ).filter(
+            RollingCotIndex.contract_id.in_(contract_ids),
+            RollingCotIndex.report_date >= start_date
+        )
+        return pd.read_sql(query.statement, self.db.connection())
+
+    def get_by_date(self, contract_id: int, start_date: date, window: int) -> Dict[date, Dict[str, Optional[float]]]:
+        """{report_date: {trader: index}} for one contract and window"""
+        rows = self.db.query(RollingCotIndex).filter(
+            RollingCotIndex.contract_id == contract_id,
+            RollingCotIndex.report_date >= start_date
+        ).all()
+        return {
+            r.report_date: {t: getattr(r, index_column(t, window)) for t in TRADER_NET_COLUMNS}
+            for r in rows
+        }
@@ -0,0 +1,192 @@
+"""
+Event Study Service
+Average price paths around Whale Alerts, aligned as an events x offsets matrix
+"""
+from typing import Dict, Any, Optional, Tuple
+import warnings
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.models.alert import WhaleAlert
+from app.models.contract import Contract
+from app.models.price import WeeklyPrice
+
+# An alert is matched to the first weekly close on or after its date within this window
+EVENT_MATCH_DAYS = 6
+
+PERCENTILES = [10, 25, 75, 90]
+
+def build_event_matrix(
+    prices: pd.DataFrame,
+    events: pd.DataFrame,
+    pre: int,
+    post: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Align closes around every event with vectorized indexing.
+
+    Args:
+        prices: contract_id, report_date, close_price (weekly)
+        events: contract_id, report_date
+
+    Returns:
+        (matrix, matched) where matrix is events x (pre + post + 1) % returns vs t0
+        (NaN outside the available history) and matched flags events with a t0 price
+    """
+    width = pre + post + 1
+    if prices.empty or events.empty:
+        return np.empty((0, width)), np.zeros(len(events), dtype=bool)
+
+    prices = prices.sort_values(["contract_id", "report_date"])
+    p_contract = prices["contract_id"].to_numpy(dtype=np.int64)
+    p_day = pd.to_datetime(prices["report_date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    p_close = prices["close_price"].to_numpy(dtype=float)
+
+    # Single sortable key per (contract, day) so one searchsorted covers all contracts
+    p_key = (p_contract << 32) + p_day
+    e_contract = events["contract_id"].to_numpy(dtype=np.int64)
+    e_day = pd.to_datetime(events["report_date"]).to_numpy().astype("datetime64[D]").astype(np.int64)
+    e_key = (e_contract << 32) + e_day
+
+    pos = np.searchsorted(p_key, e_key, side="left")
+    in_bounds = pos < len(p_key)
+    safe_pos = np.where(in_bounds, pos, 0)
+    matched = (
+        in_bounds
+        & (p_contract[safe_pos] == e_contract)
+        & (p_day[safe_pos] - e_day <= EVENT_MATCH_DAYS)
+    )
+
+    # Contract boundaries: [first, last] row of each event's contract
+    first = np.searchsorted(p_contract, e_contract, side="left")
+    last = np.searchsorted(p_contract, e_contract, side="right") - 1
+
+    offsets = np.arange(-pre, post + 1)
+    idx = safe_pos[:, None] + offsets[None, :]
+    valid = matched[:, None] & (idx >= first[:, None]) & (idx <= last[:, None])
+
+    closes = p_close[np.clip(idx, 0, len(p_close) - 1)]
+    t0 = p_close[safe_pos][:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        matrix = np.where(valid & (t0 != 0), (closes / t0 - 1) * 100, np.nan)
+
+    return matrix[matched], matched
+
+
+def summarize_paths(matrix: np.ndarray, pre: int, post: int) -> Dict[str, Any]:
+    """Mean, median and percentile bands per offset"""
+    offsets = list(range(-pre, post + 1))
+    if matrix.shape[0] == 0:
+        return {"event_count": 0, "offsets": offsets, "path": []}
+
+    counts = np.sum(~np.isnan(matrix), axis=0)
+    # All-NaN offsets (window beyond every contract's history) yield NaN -> None
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        mean = np.nanmean(matrix, axis=0)
+        median = np.nanmedian(matrix, axis=0)
+        bands = np.nanpercentile(matrix, PERCENTILES, axis=0)
+
+    def _r(v):
+        return None if np.isnan(v) else round(float(v), 2)
+
+    path = []
+    for i, offset in enumerate(offsets):
+        point = {
+            "offset": offset,
+            "count": int(counts[i]),
+            "mean": _r(mean[i]),
+            "median": _r(median[i])
+        }
+        for p, band in zip(PERCENTILES, bands):
+            point[f"p{p}"] = _r(band[i])
+        path.append(point)
+
+    return {"event_count": int(matrix.shape[0]), "offsets": offsets, "path": path}
+
+
+class EventStudyService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def run(
+        self,
+        level: Optional[str] = "High",
+        contract_id: Optional[int] = None,
+        category: Optional[str] = None,
+        pre: int = 8,
+        post: int = 13,
+        group_by: str = "all",
+        signed: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Event study around Whale Alerts.
+
+        Args:
+            level: Alert level filter (None = all levels)
+            group_by: "all", "contract" or "sector"
+            signed: Flip paths of negative z-score alerts (whales net short)
+        """
+        query = self.db.query(
+            WhaleAlert.contract_id,
+            WhaleAlert.report_date,
+            WhaleAlert.z_score,
+            Contract.contract_name,
+            Contract.market_category
+        ).join(Contract, Contract.id == WhaleAlert.contract_id)
+
+        if level:
+            query = query.filter(WhaleAlert.alert_level == level)
+        if contract_id:
+            query = query.filter(WhaleAlert.contract_id == contract_id)
+        if category:
+            query = query.filter(Contract.market_category == category)
+
+        connection = self.db.connection()
+        events = pd.read_sql(query.statement, connection)
+
+        response = {
+            "filter": {"level": level, "contract_id": contract_id, "category": category},
+            "window": {"pre": pre, "post": post},
+            "group_by": group_by,
+            "groups": []
+        }
+        if events.empty:
+            return response
+
+        prices_query = self.db.query(
+            WeeklyPrice.contract_id,
+            WeeklyPrice.report_date,
+            WeeklyPrice.close_price
+        ).filter(
+            WeeklyPrice.contract_id.in_(events["contract_id"].unique().tolist()),
+            WeeklyPrice.close_price != None
+        )
+        prices = pd.read_sql(prices_query.statement, connection)
+
+        matrix, matched = build_event_matrix(prices, events, pre, post)
+        events = events[matched].reset_index(drop=True)
+
+        if signed:
+            sign = np.where(events["z_score"].astype(float).fillna(0).to_numpy() < 0, -1.0, 1.0)
+            matrix = matrix * sign[:, None]
+
+        if group_by == "contract":
+            keys = events["contract_id"].to_numpy()
+            labels = dict(zip(events["contract_id"], events["contract_name"]))
+        elif group_by == "sector":
+            keys = events["market_category"].to_numpy()
+            labels = {k: k for k in keys}
+        else:
+            keys = np.zeros(len(events), dtype=int)
+            labels = {0: "all"}
+
+        for group_key in pd.unique(keys):
+            group = summarize_paths(matrix[keys == group_key], pre, post)
+            group["key"] = group_key.item() if hasattr(group_key, "item") else group_key
+            group["label"] = labels[group_key]
+            response["groups"].append(group)
+
+        response["groups"].sort(key=lambda g: g["event_count"], reverse=True)
+        return response
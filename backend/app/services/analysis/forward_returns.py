@@ -0,0 +1,154 @@
+"""
+Forward Returns Service
+Precomputes multi-horizon forward returns for every (contract, report_date)
+"""
+from typing import Iterable, Tuple
+from datetime import date, timedelta
+import pandas as pd
+from sqlalchemy import func, case, or_, and_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from loguru import logger
+
+from app.models.forward_return import ForwardReturn
+from app.models.price import WeeklyPrice
+
+# Horizons stored in the forward_returns table (weeks)
+FORWARD_HORIZONS = [1, 2, 4, 8, 13, 26]
+
+# Exit price is the first weekly close within this window after entry + N weeks
+EXIT_TOLERANCE_DAYS = 13
+
+
+def return_column(h: int) -> str:
+    return f"ret_{h}w"
+
+
+def compute_forward_returns(prices: pd.DataFrame, horizons: Iterable[int] = FORWARD_HORIZONS) -> pd.DataFrame:
+    """
+    One vectorized pass over weekly prices.
+
+    Args:
+        prices: contract_id, report_date, close_price
+
+    Returns:
+        contract_id, report_date, close_price and a ret_{h}w column (raw %) per horizon
+    """
+    horizons = list(horizons)
+    columns = ["contract_id", "report_date", "close_price"] + [return_column(h) for h in horizons]
+    if prices.empty:
+        return pd.DataFrame(columns=columns)
+
+    frame = prices[["contract_id", "report_date", "close_price"]].copy()
+    frame["report_date"] = pd.to_datetime(frame["report_date"])
+    frame["close_price"] = frame["close_price"].astype(float)
+    frame = frame[frame["close_price"].notna() & (frame["close_price"] != 0)]
+    frame = frame.sort_values("report_date").reset_index(drop=True)
+
+    exits = frame.rename(columns={"report_date": "exit_date", "close_price": "exit_price"})
+    entry = frame["close_price"].to_numpy()
+
+    for h in horizons:
+        targets = pd.DataFrame({
+            "contract_id": frame["contract_id"],
+            "target_date": frame["report_date"] + pd.Timedelta(weeks=h)
+        }).sort_values("target_date").reset_index()
+
+        matched = pd.merge_asof(
+            targets,
+            exits,
+            left_on="target_date",
+            right_on="exit_date",
+            by="contract_id",
+            direction="forward",
+            tolerance=pd.Timedelta(days=EXIT_TOLERANCE_DAYS)
+        ).set_index("index").sort_index()
+
+        exit_price = matched["exit_price"].to_numpy(dtype=float)
+        frame[return_column(h)] = (exit_price - entry) / entry * 100
+
+    return frame[columns].sort_values(["contract_id", "report_date"]).reset_index(drop=True)
+
+
+class ForwardReturnsService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def rebuild(self) -> int:
+        """
+        Recompute forward returns for the full price history
+        (scripts/backfill_forward_returns.py)
+        """
+        logger.info("Rebuilding forward returns...")
+        query = self.db.query(
+            WeeklyPrice.contract_id, WeeklyPrice.report_date, WeeklyPrice.close_price
+        )
+        prices = pd.read_sql(query.statement, self.db.connection())
+        return self._upsert(compute_forward_returns(prices))
+
+    def update(self, changed: Iterable[Tuple[int, date]] = ()) -> int:
+        """
+        Incremental update as new prices arrive or past prices are corrected.
+        Per contract, weeks are recomputed from the earlier of the first incomplete row
+        (any horizon still NULL) and the first entry week whose return can read a
+        changed price; contracts not yet in the table are computed in full.
+
+        Args:
+            changed: (contract_id, report_date) of new or corrected weekly prices
+        """
+        starts = dict(self.db.query(
+            ForwardReturn.contract_id,
+            func.coalesce(
+                func.min(case(
+                    (ForwardReturn.ret_26w == None, ForwardReturn.report_date)
+                )),
+                func.max(ForwardReturn.report_date) + timedelta(days=1)
+            )
+        ).group_by(ForwardReturn.contract_id).all())
+
+        # A price is the exit of entries up to the longest horizon (+ tolerance) earlier
+        reach = timedelta(weeks=max(FORWARD_HORIZONS), days=EXIT_TOLERANCE_DAYS)
+        for contract_id, report_date in changed:
+            if contract_id in starts:
+                starts[contract_id] = min(starts[contract_id], report_date - reach)
+
+        query = self.db.query(
+            WeeklyPrice.contract_id, WeeklyPrice.report_date, WeeklyPrice.close_price
+        ).filter(or_(
+            WeeklyPrice.contract_id.notin_(list(starts)),
+            *(
+                and_(WeeklyPrice.contract_id == contract_id, WeeklyPrice.report_date >= start_date)
+                for contract_id, start_date in starts.items()
+            )
+        ))
+
+        prices = pd.read_sql(query.statement, self.db.connection())
+        return self._upsert(compute_forward_returns(prices))
+
+    def _upsert(self, returns: pd.DataFrame, chunk_size: int = 5000) -> int:
+        if returns.empty:
+            logger.info("Forward returns already up to date")
+            return 0
+
+        returns = returns.copy()
+        returns["report_date"] = returns["report_date"].dt.date
+        returns = returns.astype(object).where(returns.notna(), None)
+        records = returns.to_dict(orient="records")
+        update_cols = ["close_price"] + [return_column(h) for h in FORWARD_HORIZONS]
+
+        try:
+            for start in range(0, len(records), chunk_size):
+                stmt = insert(ForwardReturn).values(records[start:start + chunk_size])
+                upsert_stmt = stmt.on_conflict_do_update(
+                    constraint='uq_contract_forward_return',
+                    set_={col: stmt.excluded[col] for col in update_cols}
+                )
+                self.db.execute(upsert_stmt)
+            self.db.commit()
+            logger.success(f"Upserted {len(records)} forward return rows")
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to save forward returns: {e}")
+            raise
+
+        return len(records)
@@ -0,0 +1,119 @@
+"""
+Market Heatmap
+COT Index matrix (contracts x weeks) built from a single pivot
+"""
+from typing import Dict, Any, List
+from datetime import date, timedelta
+import numpy as np
+import pandas as pd
+
+
+def cot_index_matrix(values: np.ndarray, lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """
+    COT Index (0-100 position in range) for a contracts x weeks matrix of net positions.
+    lo/hi are per-contract range bounds; NaN cells stay NaN.
+    """
+    divisor = np.where(hi != lo, hi - lo, 1.0)
+    with np.errstate(invalid="ignore"):
+        index = (values - lo[:, None]) / divisor[:, None] * 100
+    return np.round(np.clip(index, 0, 100), 1)
+
+
+def build_heatmap(
+    contracts: List[Any],
+    reports: pd.DataFrame,
+    min_max: pd.DataFrame,
+    weeks: int,
+    end_date: date,
+    value_column: str = "asset_mgr_net"
+) -> Dict[str, Any]:
+    """
+    Heatmap normalized against one fixed min/max range per contract.
+
+    Args:
+        contracts: Contract rows (id, contract_name, market_category), in output order
+        reports: contract_id, report_date and value_column (net position) for the recent window
+        min_max: contract_id, min_net, max_net over the normalization window
+
+    Returns:
+        {"weeks": [YYYY-MM-DD, ...], "heatmap": [{contract..., "data": [{date, value}]}]}
+    """
+    reports = reports.copy()
+    reports["report_date"] = pd.to_datetime(reports["report_date"])
+    week_index = _week_index(reports, weeks, end_date)
+
+    ids = [c.id for c in contracts]
+    values = reports.pivot(
+        index="contract_id", columns="report_date", values=value_column
+    ).reindex(index=ids, columns=week_index).to_numpy(dtype=float)
+
+    bounds = min_max.set_index("contract_id").reindex(ids)
+    lo = bounds["min_net"].to_numpy(dtype=float)
+    hi = bounds["max_net"].to_numpy(dtype=float)
+    matrix = cot_index_matrix(values, lo, hi)
+
+    included = pd.Series(ids).isin(min_max["contract_id"]).to_numpy()
+    has_range = ~np.isnan(lo) & ~np.isnan(hi)
+    return _format_heatmap(contracts, week_index, matrix, included, has_range)
+
+
+def build_rolling_heatmap(
+    contracts: List[Any],
+    indexes: pd.DataFrame,
+    weeks: int,
+    end_date: date
+) -> Dict[str, Any]:
+    """
+    Heatmap from the stored rolling COT Index.
+
+    Args:
+        indexes: contract_id, report_date, cot_index for the recent window
+
+    Same output as build_heatmap; contracts without stored weeks are skipped.
+    """
+    indexes = indexes.copy()
+    indexes["report_date"] = pd.to_datetime(indexes["report_date"])
+    week_index = _week_index(indexes, weeks, end_date)
+
+    ids = [c.id for c in contracts]
+    matrix = indexes.pivot(
+        index="contract_id", columns="report_date", values="cot_index"
+    ).reindex(index=ids, columns=week_index).to_numpy(dtype=float)
+
+    included = pd.Series(ids).isin(indexes["contract_id"]).to_numpy()
+    return _format_heatmap(contracts, week_index, matrix, included, np.ones(len(ids), dtype=bool))
+
+
+def _week_index(frame: pd.DataFrame, weeks: int, end_date: date) -> pd.DatetimeIndex:
+    """Newest N report weeks seen in the requested range"""
+    recent = frame["report_date"] >= pd.Timestamp(end_date - timedelta(weeks=weeks + 1))
+    return pd.DatetimeIndex(np.sort(frame.loc[recent, "report_date"].unique()))[-weeks:]
+
+
+def _format_heatmap(contracts, week_index, matrix, included, has_range) -> Dict[str, Any]:
+    week_dates = [d.strftime("%Y-%m-%d") for d in week_index]
+    rows = matrix.tolist()
+
+    heatmap_data = []
+    for i, contract in enumerate(contracts):
+        if not included[i]:
+            continue
+
+        series = []
+        if has_range[i]:
+            series = [
+                {"date": d, "value": None if np.isnan(v) else v}
+                for d, v in zip(week_dates, rows[i])
+            ]
+
+        heatmap_data.append({
+            "contract_id": contract.id,
+            "contract_name": contract.contract_name,
+            "category": contract.market_category,
+            "data": series
+        })
+
+    return {
+        "weeks": week_dates,
+        "heatmap": heatmap_data
+    }
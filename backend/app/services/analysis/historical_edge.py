@@ -2,11 +2,22 @@
 Historical Edge Analysis Service
 Backtests sentiment gap signals and calculates forward returns
 """
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable
+from datetime import datetime
 from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from loguru import logger
 from app.models.report import WeeklyReport
-from app.models.price import WeeklyPrice
+from app.models.historical_edge import HistoricalEdgeStat
+from app.services.analysis.backtest import BacktestEngine
+
+# Thresholds precomputed by the pipeline and used by the radar
+STANDARD_THRESHOLDS = [10.0, 20.0, 30.0]
+STANDARD_FORWARD_WEEKS = 4
+STANDARD_LOOKBACK_YEARS = 5
+
+# Below this many signals a cached win rate is not trusted
+MIN_EDGE_SAMPLES = 5
 
 
 def calculate_sentiment_gap(report: WeeklyReport) -> float:
@@ -31,7 +42,8 @@ def analyze_historical_edge(
     contract_id: int,
     threshold: float = 20.0,
     forward_weeks: int = 4,
-    lookback_years: int = 5
+    lookback_years: int = 5,
+    n_bootstrap: int = 0
 ) -> Dict:
     """
     Analyze historical performance when sentiment gap exceeds threshold
@@ -42,110 +54,106 @@ def analyze_historical_edge(
         threshold: Sentiment gap threshold (%)
         forward_weeks: Weeks to measure forward return
         lookback_years: Years of historical data to analyze
+        n_bootstrap: Bootstrap resamples for win rate / avg return confidence intervals (0 = off)
         
     Returns:
         Dictionary with backtest statistics
     """
-    # Calculate cutoff date
-    cutoff_date = datetime.now() - timedelta(days=365 * lookback_years)
-    
-    # Fetch historical reports
-    reports = db.query(WeeklyReport).filter(
-        WeeklyReport.contract_id == contract_id,
-        WeeklyReport.report_date >= cutoff_date
-    ).order_by(WeeklyReport.report_date).all()
-    
-    if not reports:
-        return {
-            "threshold": threshold,
-            "sample_size": 0,
-            "win_rate": 0.0,
-            "avg_return": 0.0,
-            "max_return": 0.0,
-            "min_return": 0.0,
-            "occurrences": []
-        }
-    
-    # Fetch all prices for this period
-    prices = db.query(WeeklyPrice).filter(
-        WeeklyPrice.contract_id == contract_id,
-        WeeklyPrice.report_date >= cutoff_date
-    ).order_by(WeeklyPrice.report_date).all()
-    
-    # Create price lookup by date
-    price_map = {p.report_date: p.close_price for p in prices}
-    
-    # Analyze each signal
-    signals = []
-    for i, report in enumerate(reports):
-        gap = calculate_sentiment_gap(report)
-        
-        # Check if signal triggered (absolute value for both long and short divergences)
-        if abs(gap) >= threshold:
-            entry_date = report.report_date
-            entry_price = price_map.get(entry_date)
-            
-            if not entry_price:
-                continue
-            
-            # Find exit date (forward_weeks later)
-            exit_date = entry_date + timedelta(weeks=forward_weeks)
-            
-            # Find closest exit price
-            exit_price = None
-            for days_offset in range(0, 14):  # Look within 2 weeks around target date
-                check_date = exit_date + timedelta(days=days_offset)
-                if check_date in price_map:
-                    exit_price = price_map[check_date]
-                    break
-            
-            if exit_price:
-                # Calculate return
-                pct_return = ((exit_price - entry_price) / entry_price) * 100
-                
-                # Direction of signal (positive gap = whales long, negative = whales short)
-                signal_direction = "long" if gap > 0 else "short"
-                
-                # For short signals, invert the return
-                if signal_direction == "short":
-                    pct_return = -pct_return
-                
-                signals.append({
-                    "date": entry_date.isoformat(),
-                    "gap": round(gap, 2),
-                    "direction": signal_direction,
-                    "entry_price": round(entry_price, 2),
-                    "exit_price": round(exit_price, 2),
-                    "return_pct": round(pct_return, 2),
-                    "win": pct_return > 0
-                })
-    
-    if not signals:
-        return {
+    engine = BacktestEngine.from_db(db, [contract_id], lookback_years, horizons=[forward_weeks])
+    results = engine.evaluate(
+        [threshold], [forward_weeks], [lookback_years],
+        contract_ids=[contract_id], n_bootstrap=n_bootstrap
+    )
+    return results[(contract_id, threshold, forward_weeks, lookback_years)]
+
+
+def refresh_historical_edge_stats(
+    db: Session,
+    contract_ids: Iterable[int],
+    thresholds: List[float] = STANDARD_THRESHOLDS,
+    forward_weeks: int = STANDARD_FORWARD_WEEKS,
+    lookback_years: int = STANDARD_LOOKBACK_YEARS
+) -> int:
+    """
+    Batch job: backtest every contract at the standard thresholds and store the results.
+    Run after each pipeline run so the radar reads real win rates at zero request-time cost.
+    """
+    contract_ids = list(contract_ids)
+    computed_at = datetime.utcnow()
+
+    # One load for every contract, all thresholds evaluated on the same frame
+    engine = BacktestEngine.from_db(db, contract_ids, lookback_years, horizons=[forward_weeks])
+    results = engine.evaluate(
+        thresholds, [forward_weeks], [lookback_years],
+        contract_ids=contract_ids, include_occurrences=False
+    )
+
+    records = []
+    for (contract_id, threshold, _, _), analysis in results.items():
+        records.append({
+            "contract_id": contract_id,
             "threshold": threshold,
-            "sample_size": 0,
-            "win_rate": 0.0,
-            "avg_return": 0.0,
-            "max_return": 0.0,
-            "min_return": 0.0,
-            "occurrences": []
+            "forward_weeks": forward_weeks,
+            "lookback_years": lookback_years,
+            "sample_size": analysis["sample_size"],
+            "win_rate": analysis["win_rate"] if analysis["sample_size"] else None,
+            "avg_return": analysis["avg_return"] if analysis["sample_size"] else None,
+            "computed_at": computed_at
+        })
+
+    if not records:
+        return 0
+
+    stmt = insert(HistoricalEdgeStat).values(records)
+    upsert_stmt = stmt.on_conflict_do_update(
+        constraint='uq_contract_edge_stat',
+        set_={
+            col: stmt.excluded[col]
+            for col in ("sample_size", "win_rate", "avg_return", "computed_at")
         }
-    
-    # Calculate statistics
-    returns = [s["return_pct"] for s in signals]
-    wins = [s for s in signals if s["win"]]
-    
-    return {
-        "threshold": threshold,
-        "forward_weeks": forward_weeks,
-        "lookback_years": lookback_years,
-        "sample_size": len(signals),
-        "win_rate": round((len(wins) / len(signals)) * 100, 1),
-        "avg_return": round(sum(returns) / len(returns), 2),
-        "max_return": round(max(returns), 2),
-        "min_return": round(min(returns), 2),
-        "median_return": round(sorted(returns)[len(returns) // 2], 2),
-        "win_avg": round(sum([s["return_pct"] for s in wins]) / len(wins), 2) if wins else 0.0,
-        "loss_avg": round(sum([s["return_pct"] for s in signals if not s["win"]]) / len([s for s in signals if not s["win"]]), 2) if len([s for s in signals if not s["win"]]) > 0 else 0.0,
-        "occurrences": signals[-10:]  # Return last 10 for reference
-    }
+    )
+
+    try:
+        db.execute(upsert_stmt)
+        db.commit()
+        logger.success(f"Stored {len(records)} historical edge stats")
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to save historical edge stats: {e}")
+        raise
+
+    return len(records)
+
+
+def load_historical_edge_stats(
+    db: Session,
+    contract_ids: Optional[Iterable[int]] = None,
+    forward_weeks: int = STANDARD_FORWARD_WEEKS,
+    lookback_years: int = STANDARD_LOOKBACK_YEARS
+) -> Dict[int, List[HistoricalEdgeStat]]:
+    """Cached edge stats per contract, sorted by threshold"""
+    query = db.query(HistoricalEdgeStat).filter(
+        HistoricalEdgeStat.forward_weeks == forward_weeks,
+        HistoricalEdgeStat.lookback_years == lookback_years
+    )
+    if contract_ids is not None:
+        query = query.filter(HistoricalEdgeStat.contract_id.in_(list(contract_ids)))
+
+    stats = {}
+    for stat in query.order_by(HistoricalEdgeStat.contract_id, HistoricalEdgeStat.threshold).all():
+        stats.setdefault(stat.contract_id, []).append(stat)
+    return stats
+
+
+def select_edge_stat(stats: List[HistoricalEdgeStat], gap: float) -> Optional[HistoricalEdgeStat]:
+    """
+    Pick the stat for the highest threshold the current gap reaches.
+    Stats with too few samples are ignored; below every threshold the lowest usable one applies.
+    """
+    selected = None
+    for stat in sorted(stats, key=lambda s: s.threshold):
+        if stat.sample_size < MIN_EDGE_SAMPLES or stat.win_rate is None:
+            continue
+        if selected is None or abs(gap) >= stat.threshold:
+            selected = stat
+    return selected
@@ -0,0 +1,115 @@
+"""
+Radar Snapshot Service
+Persists the Smart Money Radar response so /analysis/radar serves a precomputed payload
+"""
+import hashlib
+import json
+from typing import Dict, Any, Optional
+from datetime import datetime
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from fastapi.encoders import jsonable_encoder
+from loguru import logger
+
+from app.core.cache import bump_data_version
+from app.models.radar_snapshot import RadarSnapshot
+from app.models.report import WeeklyReport
+from app.services.analysis.smart_radar import SmartRadarService
+
+
+def compute_etag(payload: Dict[str, Any]) -> str:
+    """Stable hash of a JSON-serializable payload"""
+    body = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class RadarSnapshotService:
+    def __init__(self, db: Session, keep_last: int = 10):
+        self.db = db
+        self.keep_last = keep_last
+        self.radar_service = SmartRadarService(db)
+
+    def get_latest(self) -> Optional[RadarSnapshot]:
+        return self.db.query(RadarSnapshot).order_by(RadarSnapshot.id.desc()).first()
+
+    def get_latest_etag(self) -> Optional[str]:
+        """Etag of the latest snapshot, without loading its payload"""
+        return self.db.query(RadarSnapshot.etag).order_by(RadarSnapshot.id.desc()).limit(1).scalar()
+
+    @staticmethod
+    def _bump_versions():
+        # The dashboard bundles the radar payload
+        bump_data_version("radar")
+        bump_data_version("dashboard")
+
+    def build_snapshot(self) -> RadarSnapshot:
+        """
+        Full recomputation of the radar. Called by the pipeline after alerts are generated.
+        """
+        payload = jsonable_encoder(self.radar_service.get_radar_rankings())
+        report_date = self.db.query(func.max(WeeklyReport.report_date)).scalar()
+
+        snapshot = RadarSnapshot(
+            report_date=report_date,
+            payload=payload,
+            etag=compute_etag(payload),
+            created_at=datetime.utcnow()
+        )
+        self.db.add(snapshot)
+
+        try:
+            self.db.commit()
+            logger.success(f"Radar snapshot {snapshot.id} saved ({len(payload['rankings'])} contracts)")
+            self._bump_versions()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to save radar snapshot: {e}")
+            raise
+
+        self._prune()
+        return snapshot
+
+    def refresh_staleness(self) -> Optional[RadarSnapshot]:
+        """
+        Lightweight refresh: re-score only the live staleness component of the latest snapshot.
+        Falls back to a full build when no snapshot exists yet.
+        """
+        snapshot = self.get_latest()
+        if not snapshot:
+            return self.build_snapshot()
+
+        rankings = [
+            self.radar_service.refresh_confidence(contract_data)
+            for contract_data in snapshot.payload.get("rankings", [])
+        ]
+        payload = jsonable_encoder(self.radar_service.build_radar_response(rankings))
+
+        snapshot.payload = payload
+        snapshot.etag = compute_etag(payload)
+        snapshot.staleness_refreshed_at = datetime.utcnow()
+
+        try:
+            self.db.commit()
+            logger.success(f"Radar snapshot {snapshot.id} staleness refreshed")
+            self._bump_versions()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to refresh radar snapshot: {e}")
+            raise
+
+        return snapshot
+
+    def _prune(self):
+        """Keep only the most recent snapshots"""
+        keep_ids = [
+            row.id for row in self.db.query(RadarSnapshot.id)
+            .order_by(RadarSnapshot.id.desc())
+            .limit(self.keep_last)
+        ]
+        if not keep_ids:
+            return
+
+        self.db.query(RadarSnapshot).filter(
+            RadarSnapshot.id.notin_(keep_ids)
+        ).delete(synchronize_session=False)
+        self.db.commit()
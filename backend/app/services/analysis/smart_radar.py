@@ -4,9 +4,12 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timedelta
 
 from app.models.contract import Contract
-from app.models.contract import Contract
-from app.models.report import WeeklyReport
+from app.db.repository import get_latest_reports
 from app.services.analysis.cot_staleness import COTStalenessService
+from app.services.analysis.conviction_history import ConvictionHistoryService
+from app.services.analysis.historical_edge import (
+    calculate_sentiment_gap, select_edge_stat
+)
 from app.services.analysis.insight_generator import InsightGenerator
 # from app.services.analysis.historical_edge import HistoricalEdgeService
 
@@ -22,14 +25,26 @@ class SmartRadarService:
         """
         contracts = self.db.query(Contract).filter(Contract.is_active == True).all()
         rankings = []
-        
-        sectors = {}
+
+        # 1. Fetch Data (Fetch 3 for momentum calculation, all contracts in one query)
+        latest_reports = get_latest_reports(self.db, [c.id for c in contracts], k=3)
+
+        # Previous week scores are precomputed by the conviction history engine
+        history = ConvictionHistoryService(self.db)
+        stored_prev_scores = history.get_scores_on([
+            (contract_id, reports[1].report_date)
+            for contract_id, reports in latest_reports.items() if len(reports) > 1
+        ])
+
+        # Real win rates, point-in-time like the stored history, so momentum
+        # compares scores built on the same edge
+        edge_stats = history.load_edge_stats_on([
+            (contract_id, report.report_date)
+            for contract_id, reports in latest_reports.items() for report in reports[:2]
+        ])
 
         for contract in contracts:
-            # 1. Fetch Data (Fetch 3 for momentum calculation)
-            reports = self.db.query(WeeklyReport).filter(
-                WeeklyReport.contract_id == contract.id
-            ).order_by(WeeklyReport.report_date.desc()).limit(3).all()
+            reports = latest_reports.get(contract.id)
 
             if not reports:
                 continue
@@ -39,13 +54,23 @@ class SmartRadarService:
             prev_prev_report = reports[2] if len(reports) > 2 else prev_report
 
             # Calculate Current Score
-            current_score_data = self._calculate_conviction(contract, latest_report, prev_report, is_current=True)
+            current_score_data = self._calculate_conviction(
+                contract, latest_report, prev_report, is_current=True,
+                edge_stats=edge_stats.get((contract.id, latest_report.report_date))
+            )
             current_score = current_score_data['score']
             
-            # Calculate Previous Score (for momentum)
+            # Previous Score (for momentum)
             # Assumption: For past score, we assume "Confidence" was High (1.0) as it was fresh then.
-            prev_score_data = self._calculate_conviction(contract, prev_report, prev_prev_report, is_current=False)
-            prev_score = prev_score_data['score']
+            stored_prev = stored_prev_scores.get((contract.id, prev_report.report_date))
+            if stored_prev is not None:
+                prev_score = stored_prev.score
+            else:
+                prev_score_data = self._calculate_conviction(
+                    contract, prev_report, prev_prev_report, is_current=False,
+                    edge_stats=edge_stats.get((contract.id, prev_report.report_date))
+                )
+                prev_score = prev_score_data['score']
             
             momentum_1w = round(current_score - prev_score, 1)
 
@@ -63,6 +88,7 @@ class SmartRadarService:
                 "capital_flow_fmt": self.format_capital_flow(current_score_data['am_net_change']),
                 "net_change": current_score_data['am_net_change'],
                 "win_rate": current_score_data['win_rate'],
+                "win_rate_source": current_score_data['win_rate_source'],
                 "momentum_1w": momentum_1w,
                 "last_updated": datetime.utcnow().isoformat(),
                 "next_report_date": (latest_report.report_date + timedelta(days=7)).isoformat(), # Approx
@@ -70,12 +96,21 @@ class SmartRadarService:
             }
             
             rankings.append(contract_data)
-            
-            # Sector Aggregation
-            if contract.market_category not in sectors:
-                sectors[contract.market_category] = {"scores": [], "count": 0}
-            sectors[contract.market_category]["scores"].append(current_score)
-            sectors[contract.market_category]["count"] += 1
+
+        return self.build_radar_response(rankings)
+
+    def build_radar_response(self, rankings: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Sort rankings and attach sector averages and insights.
+        Shared by live computation and snapshot refreshes.
+        """
+        sectors = {}
+        for contract_data in rankings:
+            category = contract_data['category']
+            if category not in sectors:
+                sectors[category] = {"scores": [], "count": 0}
+            sectors[category]["scores"].append(contract_data['score'])
+            sectors[category]["count"] += 1
 
         # Sort by Score
         rankings.sort(key=lambda x: x['score'], reverse=True)
@@ -100,7 +135,7 @@ class SmartRadarService:
             "insights": insights
         }
 
-    def _calculate_conviction(self, contract, report, prev_report, is_current=True):
+    def _calculate_conviction(self, contract, report, prev_report, is_current=True, edge_stats=None):
         # 1. Staleness & Confidence
         if is_current:
             staleness_data = self.staleness_service.calculate_score(contract.id)
@@ -131,8 +166,12 @@ class SmartRadarService:
         net_change = am_net - am_net_prev
         position_change_pct = net_change / (abs(am_net_prev) + 1)
         
-        # 4. Historical Edge (Heuristic)
-        est_win_rate = 0.50 + (min(abs(sentiment_gap), 60) / 60) * 0.25 
+        # 4. Historical Edge (cached backtest win rate, heuristic fallback)
+        edge_stat = select_edge_stat(edge_stats, calculate_sentiment_gap(report)) if edge_stats else None
+        if edge_stat is not None:
+            est_win_rate = edge_stat.win_rate / 100.0
+        else:
+            est_win_rate = 0.50 + (min(abs(sentiment_gap), 60) / 60) * 0.25 
         
         # 5. Concentration
         exposure_ratio = (am_long + am_short) / (report.open_interest + 1)
@@ -141,7 +180,7 @@ class SmartRadarService:
         signal_quality = confidence * confidence
         sentiment_divergence = min(abs(sentiment_gap) / 40.0, 1.0)
         capital_momentum = np.clip(abs(position_change_pct) / 0.20, 0, 1.0)
-        historical_edge = max((est_win_rate - 0.50) / 0.20, 0)
+        historical_edge = float(np.clip((est_win_rate - 0.50) / 0.20, 0, 1.0))
         concentration = min(exposure_ratio / 0.15, 1.0)
         
         conviction = (
@@ -165,6 +204,7 @@ class SmartRadarService:
             "sentiment_gap": round(sentiment_gap, 1),
             "am_net_change": net_change,
             "win_rate": round(est_win_rate * 100),
+            "win_rate_source": "backtest" if edge_stat is not None else "heuristic",
             "breakdown": {
                 "signal_quality": round(signal_quality * 100, 1),
                 "sentiment_divergence": round(sentiment_divergence * 100, 1),
@@ -174,6 +214,41 @@ class SmartRadarService:
             }
         }
 
+    def refresh_confidence(self, contract_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Re-score a ranking entry with live COT staleness only.
+        The other four components are weekly and reused from the breakdown.
+        """
+        staleness_data = self.staleness_service.calculate_score(contract_data['id'])
+        if "error" in staleness_data:
+            confidence = 0.5
+        else:
+            confidence = staleness_data['reliability_pct'] / 100.0
+
+        signal_quality = confidence * confidence
+        breakdown = dict(contract_data['breakdown'])
+        prev_score = contract_data['score'] - contract_data['momentum_1w']
+        breakdown['signal_quality'] = round(signal_quality * 100, 1)
+
+        conviction = (
+            0.25 * signal_quality +
+            0.20 * breakdown['sentiment_divergence'] / 100 +
+            0.20 * breakdown['capital_momentum'] / 100 +
+            0.20 * breakdown['historical_edge'] / 100 +
+            0.15 * breakdown['concentration'] / 100
+        )
+        score = round(conviction * 100, 1)
+
+        return {
+            **contract_data,
+            "score": score,
+            "grade": self.get_conviction_grade(score),
+            "confidence": round(confidence * 100),
+            "momentum_1w": round(score - prev_score, 1),
+            "last_updated": datetime.utcnow().isoformat(),
+            "breakdown": breakdown
+        }
+
     def get_conviction_grade(self, score_pct):
         if score_pct >= 80: return "🔥 EXTREME CONVICTION"
         if score_pct >= 65: return "💎 HIGH CONVICTION"
@@ -8,11 +8,15 @@ from app.models.report import WeeklyReport
 from app.models.statistics import ContractStatistics
 from app.models.alert import WhaleAlert
 from app.models.price import WeeklyPrice
+from app.services.data.data_version import DataVersionService
+from app.core.events import EVENT_ALERT, publish_event
+from app.core.profiling import profile_stage
 
 class AnalyzerService:
     def __init__(self, db: Session):
         self.db = db
 
+    @profile_stage("analyzer.update_contract_statistics")
     def update_contract_statistics(self, contract_id: int, lookback_window: int = 156): # 3 Years (~156 weeks)
         """
         Calculates and updates statistics (Median, IQR, Min, Max) for a contract.
@@ -79,6 +83,7 @@ class AnalyzerService:
             # 3. Upsert ContractStatistics
             self._save_statistics(contract_id, cat_name, pos_type, median, iqr, all_min, all_max)
             
+        DataVersionService(self.db).bump([contract_id])
         logger.success(f"Statistics updated for contract {contract_id}")
 
     def _save_statistics(self, contract_id, cat, pos, median, iqr, min_val, max_val):
@@ -109,6 +114,7 @@ class AnalyzerService:
             self.db.rollback()
             logger.error(f"Failed to save stats: {e}")
 
+    @profile_stage("analyzer.generate_alerts")
     def generate_alerts(self, contract_id: int):
         """
         Generates alerts for the last available report by comparing it with statistics.
@@ -200,7 +206,7 @@ class AnalyzerService:
         )
         
         # Rimuovi vecchi alert per la stessa data (idempotenza)
-        self.db.query(WhaleAlert).filter(
+        replaced = self.db.query(WhaleAlert).filter(
             WhaleAlert.contract_id == contract_id,
             WhaleAlert.report_date == report.report_date
         ).delete()
@@ -209,7 +215,20 @@ class AnalyzerService:
         
         try:
             self.db.commit()
+            DataVersionService(self.db).bump([contract_id], changes=[
+                (WhaleAlert.__tablename__, contract_id, report.report_date)
+            ])
             logger.success(f"Generated Alert for {contract_id}: Level={alert_level}, Z={z_score:.2f}")
+            if not replaced:
+                # First alert for this report week: notify /events subscribers
+                publish_event(EVENT_ALERT, {
+                    "id": alert.id,
+                    "contract_id": contract_id,
+                    "report_date": report.report_date,
+                    "alert_level": alert_level,
+                    "z_score": z_score,
+                    "confidence_score": confidence
+                })
         except Exception as e:
             self.db.rollback()
             logger.error(f"Failed to save alert: {e}")
@@ -7,6 +7,7 @@ import os
 from datetime import datetime
 from loguru import logger
 from tenacity import retry, stop_after_attempt, wait_exponential
+from app.core.profiling import profile_stage
 
 class CFTCIngestor:
     # URL Base
@@ -99,6 +100,7 @@ class CFTCIngestor:
             logger.warning(f"Whitelist file {path} not found.")
             return []
 
+    @profile_stage("cftc_ingestor.fetch_data")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     def fetch_data(self, year: int = None, mode: str = 'historical', report_type: str = 'financial') -> pd.DataFrame:
         """
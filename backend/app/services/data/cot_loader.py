@@ -1,5 +1,8 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
+from app.services.data.data_version import DataVersionService, values_changed
+from app.core.events import EVENT_REPORTS_LOADED, publish_event
+from app.core.profiling import profile_stage
 from app.models.report import WeeklyReport
 from app.models.contract import Contract
 from datetime import datetime
@@ -15,6 +18,7 @@ class COTLoaderService:
             for c in db.query(Contract).all()
         }
 
+    @profile_stage("cot_loader.upsert_reports")
     def upsert_reports(self, df: pd.DataFrame):
         if df.empty:
             return
@@ -77,15 +81,28 @@ class COTLoaderService:
             if col.name not in generated_cols
         }
         
+        # Only rows whose loaded values differ are updated and returned (change log)
         upsert_stmt = stmt.on_conflict_do_update(
             constraint='uq_contract_report_date', 
-            set_=update_cols
-        )
+            set_=update_cols,
+            where=values_changed(WeeklyReport.__table__, stmt.excluded, [c for c in records[0] if c in update_cols])
+        ).returning(WeeklyReport.contract_id, WeeklyReport.report_date)
 
         try:
-            self.db.execute(upsert_stmt)
+            changed = self.db.execute(upsert_stmt).all()
             self.db.commit()
-            logger.success(f"Upserted {len(records)} reports with official changes")
+            logger.success(f"Upserted {len(records)} reports with official changes ({len(changed)} new or changed)")
+            contract_ids = {r['contract_id'] for r in records}
+            # Only contracts with new or changed rows get a new version
+            if changed:
+                DataVersionService(self.db).bump({cid for cid, _ in changed}, changes=[
+                    (WeeklyReport.__tablename__, cid, day) for cid, day in changed
+                ])
+            publish_event(EVENT_REPORTS_LOADED, {
+                "contract_ids": sorted(contract_ids),
+                "rows": len(records),
+                "latest_report_date": max(r['report_date'] for r in records)
+            })
         except Exception as e:
             self.db.rollback()
             logger.error(f"DB Error: {e}")
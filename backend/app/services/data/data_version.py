@@ -0,0 +1,130 @@
+"""
+Data Version Service
+Global and per-contract version counters, bumped whenever loaders or the
+analyzer write data. Read endpoints derive their ETags from these counters.
+
+Bumps can also record which rows changed (table, contract, report week) in
+change_log, tagged with the new global version, for delta sync (/sync).
+"""
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import date, datetime
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+from loguru import logger
+
+from app.core.cache import bump_data_version
+from app.models.change_log import ChangeLog
+from app.models.data_version import DataVersion
+
+GLOBAL_SCOPE = "global"
+
+# (table name, contract_id, report_date) of a changed row
+Change = Tuple[str, int, date]
+
+# change_log rows per INSERT (bind parameter limit)
+CHANGE_LOG_CHUNK = 5000
+
+
+def contract_scope(contract_id: int) -> str:
+    return f"contract:{contract_id}"
+
+
+def values_changed(table, excluded, columns: Iterable[str]):
+    """
+    ON CONFLICT DO UPDATE condition: only update rows whose values differ.
+    With RETURNING, an upsert then returns just the inserted and changed rows.
+    """
+    columns = list(columns)
+    return tuple_(*[table.c[c] for c in columns]).is_distinct_from(tuple_(*[excluded[c] for c in columns]))
+
+
+class DataVersionService:
+    def __init__(self, db: Session):
+        self.db = db
+
+    def bump(self, contract_ids: Optional[Iterable[int]] = None, changes: Iterable[Change] = ()) -> int:
+        """
+        Increment the global version and the version of every given contract,
+        record `changes` in the change log under the new global version, then
+        invalidate cached API responses. Returns the new global version.
+        """
+        now = datetime.utcnow()
+        rows = [{"scope": GLOBAL_SCOPE, "contract_id": None, "version": 1, "updated_at": now}]
+        rows += [
+            {"scope": contract_scope(cid), "contract_id": cid, "version": 1, "updated_at": now}
+            for cid in sorted(set(contract_ids or []))
+        ]
+
+        stmt = insert(DataVersion).values(rows)
+        upsert_stmt = stmt.on_conflict_do_update(
+            index_elements=[DataVersion.scope],
+            set_={"version": DataVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+        )
+
+        try:
+            versions = dict(self.db.execute(
+                upsert_stmt.returning(DataVersion.scope, DataVersion.version)
+            ).all())
+            version = versions[GLOBAL_SCOPE]
+            self._log_changes(set(changes), version, now)
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            logger.error(f"Failed to bump data versions: {e}")
+            raise
+
+        bump_data_version()
+        return version
+
+    def _log_changes(self, changes: set, version: int, now: datetime):
+        """Upsert one change_log entry per changed row, moved to `version`"""
+        rows = [
+            {"table_name": table, "contract_id": cid, "report_date": day, "version": version, "changed_at": now}
+            for table, cid, day in sorted(changes)
+        ]
+        for start in range(0, len(rows), CHANGE_LOG_CHUNK):
+            stmt = insert(ChangeLog).values(rows[start:start + CHANGE_LOG_CHUNK])
+            self.db.execute(stmt.on_conflict_do_update(
+                constraint="uq_change_log_row",
+                set_={"version": stmt.excluded.version, "changed_at": stmt.excluded.changed_at}
+            ))
+
+    def changes_since(
+        self,
+        since: int,
+        contract_ids: Optional[Iterable[int]] = None,
+        limit: Optional[int] = None
+    ) -> Optional[Dict[str, List[Tuple[int, date]]]]:
+        """
+        {table name: [(contract_id, report_date), ...]} of rows changed after
+        version `since`. None when more than `limit` rows changed.
+        """
+        query = self.db.query(ChangeLog.table_name, ChangeLog.contract_id, ChangeLog.report_date).filter(
+            ChangeLog.version > since
+        ).order_by(ChangeLog.contract_id, ChangeLog.report_date)
+        if contract_ids is not None:
+            query = query.filter(ChangeLog.contract_id.in_(list(contract_ids)))
+        if limit is not None:
+            query = query.limit(limit + 1)
+
+        rows = query.all()
+        if limit is not None and len(rows) > limit:
+            return None
+
+        changed = defaultdict(list)
+        for table, cid, day in rows:
+            changed[table].append((cid, day))
+        return dict(changed)
+
+    def get_versions(self, contract_id: Optional[int] = None) -> Tuple[int, int]:
+        """(global version, contract version) from data_versions only; 0 when never bumped"""
+        scopes = [GLOBAL_SCOPE] + ([contract_scope(contract_id)] if contract_id is not None else [])
+        versions = dict(
+            self.db.query(DataVersion.scope, DataVersion.version).filter(
+                DataVersion.scope.in_(scopes)
+            ).all()
+        )
+        contract_version = versions.get(contract_scope(contract_id), 0) if contract_id is not None else 0
+        return versions.get(GLOBAL_SCOPE, 0), contract_version
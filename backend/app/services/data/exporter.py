@@ -0,0 +1,207 @@
+"""
+Bulk Export Service
+Streams whole datasets as Arrow IPC or Parquet for offline analytics.
+
+Rows are read through a server-side cursor (psycopg2 named cursor) in batches
+of `batch_size` tuples and converted column-wise into Arrow record batches,
+so neither the full result set nor per-row dicts are ever held in memory.
+pyarrow is an optional dependency: without it `pyarrow_available()` is False.
+"""
+from dataclasses import dataclass
+from datetime import date
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import column, literal_column, select, table
+from sqlalchemy.engine import Engine
+from loguru import logger
+
+from app.models.alert import WhaleAlert
+from app.models.conviction import ConvictionScore
+from app.models.cot_index import RollingCotIndex
+from app.models.price import WeeklyPrice
+from app.models.statistics import ContractStatistics
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:  # optional: pip install pyarrow
+    pa = None
+
+EXPORT_FORMATS = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+DEFAULT_BATCH_SIZE = 10000
+
+# Postgres type OIDs (cursor.description type_code) -> Arrow type name
+PG_ARROW_TYPES = {
+    16: "bool_",
+    20: "int64",
+    21: "int16",
+    23: "int32",
+    700: "float32",
+    701: "float64",
+    1700: "float64",  # numeric/DECIMAL, see _column_array
+    1082: "date32",
+    25: "string",
+    1042: "string",
+    1043: "string",
+}
+PG_NUMERIC = 1700
+PG_TIMESTAMP = 1114
+PG_TIMESTAMPTZ = 1184
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    source: object
+    has_report_date: bool = True
+
+    def select(self, contract_id: Optional[int], since: Optional[date]):
+        src = self.source
+        query = select(literal_column("*")).select_from(src)
+        if contract_id is not None:
+            query = query.where(src.c.contract_id == contract_id)
+        if since is not None and self.has_report_date:
+            query = query.where(src.c.report_date >= since)
+        order = [src.c.contract_id] + ([src.c.report_date] if self.has_report_date else [])
+        return query.order_by(*order)
+
+
+# The view is created by scripts/setup_views.py; only the filter columns are declared
+_report_changes = table("v_weekly_report_changes", column("contract_id"), column("report_date"))
+
+EXPORT_DATASETS = {
+    "reports": ExportDataset(_report_changes),
+    "prices": ExportDataset(WeeklyPrice.__table__),
+    "alerts": ExportDataset(WhaleAlert.__table__),
+    "statistics": ExportDataset(ContractStatistics.__table__, has_report_date=False),
+    "cot_indexes": ExportDataset(RollingCotIndex.__table__),
+    "conviction": ExportDataset(ConvictionScore.__table__),
+}
+
+
+def pyarrow_available() -> bool:
+    return pa is not None
+
+
+def arrow_schema(description: Sequence) -> "pa.Schema":
+    """Arrow schema from a DBAPI cursor description; unknown types are exported as strings"""
+    fields = []
+    for name, type_code, *_ in description:
+        if type_code == PG_TIMESTAMP:
+            arrow_type = pa.timestamp("us")
+        elif type_code == PG_TIMESTAMPTZ:
+            arrow_type = pa.timestamp("us", tz="UTC")
+        else:
+            arrow_type = getattr(pa, PG_ARROW_TYPES.get(type_code, "string"))()
+        fields.append(pa.field(name, arrow_type))
+    return pa.schema(fields)
+
+
+def _column_array(values: Sequence, field: "pa.Field", type_code: int) -> "pa.Array":
+    if type_code == PG_NUMERIC:
+        # Decimal objects: let Arrow infer decimal128, then cast in C
+        return pa.array(values).cast(field.type)
+    if type_code not in PG_ARROW_TYPES and type_code not in (PG_TIMESTAMP, PG_TIMESTAMPTZ):
+        values = [None if v is None else str(v) for v in values]
+    return pa.array(values, type=field.type)
+
+
+def record_batch(rows: List[Tuple], schema: "pa.Schema", type_codes: Sequence[int]) -> "pa.RecordBatch":
+    """Transpose a list of row tuples into one Arrow record batch"""
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = [
+        _column_array(values, field, type_code)
+        for values, field, type_code in zip(columns, schema, type_codes)
+    ]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+class _ChunkSink:
+    """Write-only file object whose buffered bytes are drained after each batch"""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def writable(self) -> bool:
+        return True
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def write_batches(batches: Iterator["pa.RecordBatch"], schema: "pa.Schema", fmt: str) -> Iterator[bytes]:
+    """Encode record batches as an Arrow IPC stream or a Parquet file (one row group per batch)"""
+    sink = _ChunkSink()
+    if fmt == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    for batch in batches:
+        writer.write_batch(batch)
+        chunk = sink.drain()
+        if chunk:
+            yield chunk
+
+    writer.close()
+    yield sink.drain()
+
+
+class ExportService:
+    def __init__(self, engine: Engine, batch_size: int = DEFAULT_BATCH_SIZE):
+        self.engine = engine
+        self.batch_size = batch_size
+
+    def stream(
+        self,
+        dataset: str,
+        fmt: str = "arrow",
+        contract_id: Optional[int] = None,
+        since: Optional[date] = None
+    ) -> Iterator[bytes]:
+        """
+        Yield the encoded dataset chunk by chunk. Uses its own connection so the
+        server-side cursor outlives the request's session while the body streams.
+        """
+        query = EXPORT_DATASETS[dataset].select(contract_id, since)
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(
+                stream_results=True, max_row_buffer=self.batch_size
+            ).execute(query)
+            # SQLAlchemy pre-fetches from named cursors, so the description is set
+            description = result.cursor.description
+            schema = arrow_schema(description)
+            type_codes = [col[1] for col in description]
+
+            def batches():
+                rows_out = 0
+                for rows in result.partitions(self.batch_size):
+                    rows_out += len(rows)
+                    yield record_batch(rows, schema, type_codes)
+                logger.info(f"Exported {rows_out} {dataset} rows as {fmt}")
+
+            yield from write_batches(batches(), schema, fmt)
@@ -2,8 +2,11 @@ import yfinance as yf
 import pandas as pd
 from sqlalchemy.orm import Session
 from sqlalchemy.dialects.postgresql import insert
+from app.services.data.data_version import DataVersionService, values_changed
+from app.core.profiling import profile_stage
 from app.models.price import WeeklyPrice
 from app.models.contract import Contract
+from app.services.analysis.forward_returns import ForwardReturnsService
 from loguru import logger
 from datetime import datetime, timedelta
 
@@ -11,9 +14,12 @@ class PriceLoaderService:
     def __init__(self, db: Session):
         self.db = db
 
+    @profile_stage("price_loader.fetch_and_load_prices")
     def fetch_and_load_prices(self, days_back: int = 365 * 10):
         """Downloads prices and handles holidays with Forward Fill logic"""
         contracts = self.db.query(Contract).filter(Contract.yahoo_ticker != None).all()
+        updated_ids = []
+        changes = []
         
         for contract in contracts:
             logger.info(f"Fetching prices for {contract.contract_name} ({contract.yahoo_ticker})...")
@@ -75,19 +81,34 @@ class PriceLoaderService:
                 for col in stmt.excluded 
                 if col.name not in ['id', 'contract_id', 'report_date']
             }
+            # Only rows whose values differ are updated and returned (change log)
             upsert_stmt = stmt.on_conflict_do_update(
                 constraint='uq_contract_price',
-                set_=update_cols
-            )
+                set_=update_cols,
+                where=values_changed(WeeklyPrice.__table__, stmt.excluded, [c for c in records[0] if c in update_cols])
+            ).returning(WeeklyPrice.contract_id, WeeklyPrice.report_date)
 
             try:
-                self.db.execute(upsert_stmt)
+                changed = self.db.execute(upsert_stmt).all()
                 self.db.commit()
-                logger.success(f"Upserted {len(records)} price records (FFILL applied) for {contract.contract_name}")
+                logger.success(
+                    f"Upserted {len(records)} price records (FFILL applied) for {contract.contract_name} "
+                    f"({len(changed)} new or changed)"
+                )
+                if changed:
+                    updated_ids.append(contract.id)
+                    changes += [(WeeklyPrice.__tablename__, cid, day) for cid, day in changed]
             except Exception as e:
                 self.db.rollback()
                 logger.error(f"Error saving prices for {contract.contract_name}: {e}")
 
+        # 5. Extend the forward returns table with the new weeks (and recompute
+        # the weeks whose returns read a corrected price)
+        ForwardReturnsService(self.db).update([(cid, day) for _, cid, day in changes])
+        # A reload that changed nothing keeps every version (and ETag, cached response)
+        if changes:
+            DataVersionService(self.db).bump(updated_ids, changes=changes)
+
     def _calculate_vwap_window(self, df: pd.DataFrame, report_date, close_price):
         """
         Calculates the VWAP for the reporting window (Previous Wednesday -> Report Tuesday).
@@ -123,6 +144,7 @@ class PriceLoaderService:
                     
         return reporting_vwap, close_vs_vwap_pct
 
+    @profile_stage("price_loader.fetch_and_load_daily_prices")
     def fetch_and_load_daily_prices(self, days_back: int = 365):
         """
         Fetch and store daily OHLCV data for technical analysis.
@@ -131,6 +153,7 @@ class PriceLoaderService:
         from app.models.daily_price import DailyPrice
         
         contracts = self.db.query(Contract).filter(Contract.yahoo_ticker != None).all()
+        updated_ids = []
         
         for contract in contracts:
             logger.info(f"Fetching daily prices for {contract.contract_name} ({contract.yahoo_ticker})...")
@@ -178,15 +201,26 @@ class PriceLoaderService:
                 for col in stmt.excluded 
                 if col.name not in ['id', 'contract_id', 'date']
             }
+            # Only rows whose values differ are updated and returned
             upsert_stmt = stmt.on_conflict_do_update(
                 constraint='uq_contract_daily_price',
-                set_=update_cols
-            )
+                set_=update_cols,
+                where=values_changed(DailyPrice.__table__, stmt.excluded, [c for c in records[0] if c in update_cols])
+            ).returning(DailyPrice.date)
             
             try:
-                self.db.execute(upsert_stmt)
+                changed = self.db.execute(upsert_stmt).all()
                 self.db.commit()
-                logger.success(f"Upserted {len(records)} daily price records for {contract.contract_name}")
+                logger.success(
+                    f"Upserted {len(records)} daily price records for {contract.contract_name} "
+                    f"({len(changed)} new or changed)"
+                )
+                if changed:
+                    updated_ids.append(contract.id)
             except Exception as e:
                 self.db.rollback()
                 logger.error(f"Error saving daily prices for {contract.contract_name}: {e}")
+
+        # A reload that changed nothing keeps every version (and ETag, cached response)
+        if updated_ids:
+            DataVersionService(self.db).bump(updated_ids)
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Recompute the stored forward returns from the full weekly price history.
+Run once after the forward_returns migration, and again after changing
+FORWARD_HORIZONS or EXIT_TOLERANCE_DAYS. Weekly price loads keep the table
+current afterwards (ForwardReturnsService.update).
+"""
+import sys
+import os
+from loguru import logger
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.db.session import SessionLocal
+from app.models.price import WeeklyPrice
+from app.services.analysis.forward_returns import ForwardReturnsService
+from app.services.data.data_version import DataVersionService
+
+def backfill():
+    db = SessionLocal()
+    try:
+        rows = ForwardReturnsService(db).rebuild()
+
+        # Backtests read the table: invalidate their ETags and cached responses
+        if rows:
+            contract_ids = [cid for (cid,) in db.query(WeeklyPrice.contract_id).distinct()]
+            DataVersionService(db).bump(contract_ids)
+        logger.success(f"Forward returns backfilled ({rows} rows)")
+    except Exception as e:
+        logger.error(f"Forward returns backfill failed: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    backfill()
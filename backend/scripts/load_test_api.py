@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Load test for the read endpoints: throughput and latency percentiles under N
+concurrent clients, optionally comparing two deployments side by side, e.g.
+the sync build on :8000 against the async build on :8001:
+
+    python scripts/load_test_api.py --base http://localhost:8000 \
+        --compare http://localhost:8001 --concurrency 50 --requests 2000
+
+Start both servers with CACHE_ENABLED=false so every request reaches the
+database; no If-None-Match is sent, so conditional GETs never short-circuit.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/v1/contracts/",
+    "/api/v1/contracts/{contract_id}",
+    "/api/v1/contracts/{contract_id}/history",
+    "/api/v1/contracts/{contract_id}/reports",
+    "/api/v1/alerts/",
+    "/api/v1/analysis/heatmap",
+    "/api/v1/analysis/radar",
+]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_path(client: httpx.AsyncClient, path: str, total: int, concurrency: int) -> Dict[str, float]:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(total))
+
+    async def worker():
+        nonlocal errors
+        for _ in counter:
+            started = time.perf_counter()
+            try:
+                response = await client.get(path)
+                if response.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "errors": errors
+    }
+
+
+async def run_suite(base_url: str, paths: List[str], total: int, concurrency: int) -> Dict[str, Dict[str, float]]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0, limits=limits) as client:
+        for path in paths:  # warm-up: pools, caches, imports
+            await client.get(path)
+        return {path: await run_path(client, path, total, concurrency) for path in paths}
+
+
+def print_results(results: Dict[str, Dict[str, float]], baseline: Optional[Dict[str, Dict[str, float]]] = None):
+    header = f"{'endpoint':<42} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}"
+    if baseline:
+        header += f" {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for path, r in results.items():
+        line = f"{path:<42} {r['rps']:>9.1f} {r['p50']:>9.1f} {r['p95']:>9.1f} {r['p99']:>9.1f} {r['errors']:>7}"
+        if baseline:
+            line += f" {r['rps'] / baseline[path]['rps']:>7.2f}x"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the WhaleRadarr read API")
+    parser.add_argument("--base", default="http://localhost:8000", help="Baseline deployment URL")
+    parser.add_argument("--compare", default=None, help="Second deployment URL to compare against --base")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint")
+    parser.add_argument("--contract-id", type=int, default=1)
+    parser.add_argument("--paths", nargs="*", default=DEFAULT_PATHS)
+    args = parser.parse_args()
+
+    paths = [p.format(contract_id=args.contract_id) for p in args.paths]
+
+    print(f"\n{args.base} ({args.concurrency} clients, {args.requests} requests per endpoint)")
+    baseline = asyncio.run(run_suite(args.base, paths, args.requests, args.concurrency))
+    print_results(baseline)
+
+    if args.compare:
+        print(f"\n{args.compare}")
+        print_results(asyncio.run(run_suite(args.compare, paths, args.requests, args.concurrency)), baseline)
+
+
+if __name__ == "__main__":
+    main()
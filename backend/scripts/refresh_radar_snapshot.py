@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""
+Refresh the live COT staleness component of the latest radar snapshot.
+Meant to run on a short schedule (e.g. every 15 minutes during market hours).
+"""
+import sys
+import os
+from loguru import logger
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.db.session import SessionLocal
+from app.services.analysis.radar_snapshot import RadarSnapshotService
+
+def refresh_snapshot():
+    db = SessionLocal()
+    try:
+        logger.info("Refreshing radar snapshot staleness...")
+        RadarSnapshotService(db).refresh_staleness()
+    except Exception as e:
+        logger.error(f"Radar snapshot refresh failed: {e}")
+        raise
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    refresh_snapshot()
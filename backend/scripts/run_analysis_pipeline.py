@@ -6,9 +6,20 @@ from sqlalchemy.orm import Session
 # Fix path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
 
+from app.core.events import EVENT_PIPELINE_STAGE, publish_event
+from app.core.profiling import profiled
 from app.db.session import SessionLocal
 from app.models.contract import Contract
 from app.services.analyzer import AnalyzerService
+from app.services.analysis.conviction_history import ConvictionHistoryService
+from app.services.analysis.cot_index import CotIndexService
+from app.services.analysis.historical_edge import refresh_historical_edge_stats
+from app.services.analysis.radar_snapshot import RadarSnapshotService
+from app.services.data.data_version import DataVersionService
+
+def stage_completed(stage: str, **data):
+    """Notify /events subscribers that a pipeline stage finished"""
+    publish_event(EVENT_PIPELINE_STAGE, {"stage": stage, **data})
 
 def run_pipeline():
     db = SessionLocal()
@@ -29,11 +40,37 @@ def run_pipeline():
             
             # 3. Generate Alerts (Latest Report)
             analyzer.generate_alerts(contract.id)
+        stage_completed("alerts", contracts=len(contracts))
+
+        # 4. Historical Edge Stats (real win rates at standard thresholds)
+        with profiled("pipeline.historical_edge"):
+            refresh_historical_edge_stats(db, [c.id for c in contracts])
+        stage_completed("historical_edge")
+
+        # 5. Rebuild Conviction Score History (all contract-weeks)
+        with profiled("pipeline.conviction_history"):
+            ConvictionHistoryService(db).rebuild()
+        stage_completed("conviction_history")
+
+        # 6. Rolling COT Index (26/52/156 weeks, every contract-week)
+        with profiled("pipeline.cot_indexes"):
+            CotIndexService(db).rebuild()
+        stage_completed("cot_indexes")
+
+        # 7. Persist Radar Snapshot (served by /analysis/radar)
+        with profiled("pipeline.radar_snapshot"):
+            RadarSnapshotService(db).build_snapshot()
+        stage_completed("radar_snapshot")
+
+        # 8. Derived tables changed for every contract: bump versions (ETags, response cache)
+        DataVersionService(db).bump([c.id for c in contracts])
+        stage_completed("completed", contracts=len(contracts))
             
         logger.success("=== PIPELINE COMPLETED SUCCESSFULLY ===")
         
     except Exception as e:
         logger.error(f"Pipeline Failed: {e}")
+        stage_completed("failed", error=str(e))
     finally:
         db.close()
 
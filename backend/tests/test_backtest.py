@@ -0,0 +1,231 @@
+import unittest
+from datetime import date, timedelta
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.analysis.backtest import BacktestEngine, calculate_sentiment_gaps, bootstrap_ci
+from app.services.analysis.forward_returns import compute_forward_returns, FORWARD_HORIZONS, ForwardReturnsService
+from app.services.analysis.historical_edge import calculate_sentiment_gap
+from app.models.report import WeeklyReport
+from app.models.price import WeeklyPrice
+from app.models.forward_return import ForwardReturn
+from app.api.v1.endpoints.analysis import _parse_csv
+
+
+def reference_backtest(reports, prices, threshold, forward_weeks):
+    """Original per-row loop from analyze_historical_edge (price_map probing)"""
+    price_map = {p["report_date"]: p["close_price"] for p in prices}
+    signals = []
+    for r in reports:
+        report = WeeklyReport(**r, asset_mgr_net=r["asset_mgr_long"] - r["asset_mgr_short"])
+        gap = calculate_sentiment_gap(report)
+        if abs(gap) < threshold:
+            continue
+        entry_price = price_map.get(r["report_date"])
+        if not entry_price:
+            continue
+        exit_date = r["report_date"] + timedelta(weeks=forward_weeks)
+        exit_price = None
+        for days_offset in range(0, 14):
+            check_date = exit_date + timedelta(days=days_offset)
+            if check_date in price_map:
+                exit_price = price_map[check_date]
+                break
+        if exit_price:
+            pct_return = (exit_price - entry_price) / entry_price * 100
+            if gap <= 0:
+                pct_return = -pct_return
+            signals.append((round(pct_return, 2), pct_return > 0))
+    return signals
+
+
+class TestBacktestEngine(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        start = date.today() - timedelta(weeks=150)
+        start -= timedelta(days=(start.weekday() - 1) % 7)  # Tuesday
+        self.reports, self.prices = [], []
+        price = 100.0
+        for i in range(150):
+            d = start + timedelta(weeks=i)
+            self.reports.append({
+                "contract_id": 1,
+                "report_date": d,
+                "asset_mgr_long": int(rng.integers(1000, 20000)),
+                "asset_mgr_short": int(rng.integers(1000, 20000)),
+                "non_report_long": int(rng.integers(500, 5000)),
+                "non_report_short": int(rng.integers(500, 5000)),
+            })
+            price *= 1 + rng.normal(0, 0.02)
+            # Drop some weeks so exits have to look ahead
+            if i % 11 != 5:
+                self.prices.append({"contract_id": 1, "report_date": d, "close_price": round(price, 4)})
+
+    def test_vectorized_gap_matches_scalar(self):
+        df = pd.DataFrame(self.reports)
+        gaps = calculate_sentiment_gaps(df)
+        for r, gap in zip(self.reports, gaps):
+            report = WeeklyReport(**r, asset_mgr_net=r["asset_mgr_long"] - r["asset_mgr_short"])
+            self.assertAlmostEqual(gap, calculate_sentiment_gap(report), places=9)
+
+    def test_grid_matches_reference_loop(self):
+        engine = BacktestEngine.from_prices(pd.DataFrame(self.reports), pd.DataFrame(self.prices), horizons=[1, 4, 8])
+        thresholds = [10.0, 20.0, 30.0]
+        grid = engine.evaluate(thresholds, [1, 4, 8], [5])
+
+        for h in [1, 4, 8]:
+            for t in thresholds:
+                expected = reference_backtest(self.reports, self.prices, t, h)
+                result = grid[(1, t, h, 5)]
+                self.assertEqual(result["sample_size"], len(expected))
+                if not expected:
+                    continue
+                returns = [r for r, _ in expected]
+                wins = sum(1 for _, w in expected if w)
+                self.assertAlmostEqual(result["win_rate"], round(wins / len(expected) * 100, 1))
+                self.assertAlmostEqual(result["avg_return"], round(sum(returns) / len(returns), 2), places=6)
+                self.assertAlmostEqual(result["median_return"], sorted(returns)[len(returns) // 2], places=6)
+                self.assertEqual(len(result["occurrences"]), min(10, len(expected)))
+
+    def test_stored_returns_match_raw_prices(self):
+        # Engine built from the forward_returns table shape gives the same grid
+        returns = compute_forward_returns(pd.DataFrame(self.prices))
+        reports = pd.DataFrame(self.reports)
+        reports["report_date"] = pd.to_datetime(reports["report_date"])
+        stored = BacktestEngine(reports.merge(returns, on=["contract_id", "report_date"]), FORWARD_HORIZONS)
+        raw = BacktestEngine.from_prices(pd.DataFrame(self.reports), pd.DataFrame(self.prices), FORWARD_HORIZONS)
+
+        a = stored.evaluate([10.0, 25.0], FORWARD_HORIZONS, [1, 5])
+        b = raw.evaluate([10.0, 25.0], FORWARD_HORIZONS, [1, 5])
+        self.assertEqual(a, b)
+
+    def test_forward_returns_use_next_available_close(self):
+        prices = pd.DataFrame(self.prices)
+        returns = compute_forward_returns(prices, [1])
+        by_date = dict(zip(pd.to_datetime(prices["report_date"]), prices["close_price"]))
+        for _, row in returns.iterrows():
+            exit_date = row["report_date"] + pd.Timedelta(weeks=1)
+            candidates = [d for d in by_date if exit_date <= d <= exit_date + pd.Timedelta(days=13)]
+            if not candidates:
+                self.assertTrue(np.isnan(row["ret_1w"]))
+                continue
+            expected = (by_date[min(candidates)] - row["close_price"]) / row["close_price"] * 100
+            self.assertAlmostEqual(row["ret_1w"], expected, places=9)
+
+    def test_bootstrap_intervals(self):
+        engine = BacktestEngine.from_prices(pd.DataFrame(self.reports), pd.DataFrame(self.prices), horizons=[1, 4])
+        a = engine.evaluate([10.0], [4], [5], n_bootstrap=2000)[(1, 10.0, 4, 5)]
+        b = engine.evaluate([10.0], [4], [5], n_bootstrap=2000)[(1, 10.0, 4, 5)]
+
+        # Seeded: identical inputs give identical intervals
+        self.assertEqual(a["win_rate_ci"], b["win_rate_ci"])
+        lo, hi = a["win_rate_ci"]
+        self.assertLessEqual(lo, a["win_rate"])
+        self.assertGreaterEqual(hi, a["win_rate"])
+        lo, hi = a["avg_return_ci"]
+        self.assertLessEqual(lo, a["avg_return"])
+        self.assertGreaterEqual(hi, a["avg_return"])
+
+        # Per-cell generators: the same cell in a larger grid gets the same interval
+        wider = engine.evaluate([5.0, 10.0, 20.0], [1, 4], [3, 5], n_bootstrap=2000)[(1, 10.0, 4, 5)]
+        self.assertEqual(a["win_rate_ci"], wider["win_rate_ci"])
+        self.assertEqual(a["avg_return_ci"], wider["avg_return_ci"])
+
+        empty = engine.evaluate([250.0], [4], [5], n_bootstrap=2000)[(1, 250.0, 4, 5)]
+        self.assertIsNone(empty["win_rate_ci"])
+
+    def test_bootstrap_constant_sample(self):
+        ci = bootstrap_ci(np.full(8, 1.5), np.ones(8), n_resamples=500)
+        self.assertEqual(ci["win_rate_ci"], [100.0, 100.0])
+        self.assertEqual(ci["avg_return_ci"], [1.5, 1.5])
+
+    def test_missing_contract_is_empty(self):
+        engine = BacktestEngine.from_prices(pd.DataFrame(self.reports), pd.DataFrame(self.prices), horizons=[4])
+        result = engine.evaluate([20.0], [4], [5], contract_ids=[2])[(2, 20.0, 4, 5)]
+        self.assertEqual(result["sample_size"], 0)
+
+    def test_unloaded_horizon_raises(self):
+        engine = BacktestEngine.from_prices(pd.DataFrame(self.reports), pd.DataFrame(self.prices), horizons=[4])
+        with self.assertRaises(ValueError):
+            engine.evaluate([20.0], [8], [5])
+
+class TestStoredForwardReturns(unittest.TestCase):
+    """forward_returns table upkeep and from_db on a partially built table (sqlite)"""
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        for model in (WeeklyReport, WeeklyPrice, ForwardReturn):
+            model.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+
+        start = date.today() - timedelta(weeks=80)
+        self.dates = [start + timedelta(weeks=i) for i in range(80)]
+        for contract_id in (1, 2):
+            for i, d in enumerate(self.dates):
+                self.db.add(WeeklyReport(
+                    id=contract_id * 1000 + i, contract_id=contract_id, report_date=d,
+                    asset_mgr_long=5000 + 97 * i, asset_mgr_short=4000, non_report_long=1000, non_report_short=900 + 31 * i,
+                    open_interest=50000
+                ))
+                self.db.add(WeeklyPrice(
+                    id=contract_id * 1000 + i, contract_id=contract_id, report_date=d, close_price=100.0 + i
+                ))
+        self.db.commit()
+
+        # Only contract 1 is in the table
+        returns = compute_forward_returns(pd.DataFrame([
+            {"contract_id": 1, "report_date": d, "close_price": 100.0 + i} for i, d in enumerate(self.dates)
+        ]))
+        for i, row in enumerate(returns.astype(object).where(returns.notna(), None).to_dict(orient="records")):
+            self.db.add(ForwardReturn(id=i + 1, **{**row, "report_date": row["report_date"].date()}))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_from_db_falls_back_per_contract(self):
+        engine = BacktestEngine.from_db(self.db, [1, 2], 5, horizons=[4])
+        self.assertEqual(sorted(engine.frame["contract_id"].unique()), [1, 2])
+        grid = engine.evaluate([0.0], [4], [5])
+        self.assertEqual(grid[(1, 0.0, 4, 5)]["sample_size"], grid[(2, 0.0, 4, 5)]["sample_size"])
+
+    def test_update_recomputes_from_corrected_price(self):
+        upserted = []
+        service = ForwardReturnsService(self.db)
+        service._upsert = lambda returns: upserted.append(returns) or len(returns)
+
+        # Without changes: only the incomplete tail of contract 1, all of contract 2
+        service.update()
+        first = upserted[-1].groupby("contract_id")["report_date"].min()
+        self.assertEqual(first[2], pd.Timestamp(self.dates[0]))
+        self.assertEqual(first[1], pd.Timestamp(self.dates[80 - 26]))
+
+        # A corrected price reaches back to every entry that can exit on it
+        corrected = self.dates[60]
+        service.update([(1, corrected)])
+        first = upserted[-1].groupby("contract_id")["report_date"].min()
+        reach = corrected - timedelta(weeks=26, days=13)
+        self.assertEqual(first[1], pd.Timestamp(min(d for d in self.dates if d >= reach)))
+
+
+class TestSweepParams(unittest.TestCase):
+    def test_parse_csv(self):
+        self.assertEqual(_parse_csv(None, int, [4]), [4])
+        self.assertEqual(_parse_csv("8, 4,4", int, [4]), [4, 8])
+        # An explicit but empty list would leave min()/max() nothing to work on
+        for value in [",", " , ", "x"]:
+            with self.assertRaises(HTTPException) as ctx:
+                _parse_csv(value, int, [4])
+            self.assertEqual(ctx.exception.status_code, 422)
+
+
+if __name__ == '__main__':
+    unittest.main()
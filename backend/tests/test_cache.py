@@ -0,0 +1,67 @@
+import unittest
+import sys
+import os
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core import cache
+from app.core.cache import LRUCache, ResponseCache, cached
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_eviction_and_expiry(self):
+        lru = LRUCache(max_entries=2)
+        lru.set("a", "1", ttl=60)
+        lru.set("b", "2", ttl=60)
+        lru.get("a")               # a becomes most recent
+        lru.set("c", "3", ttl=60)  # evicts b
+        self.assertEqual(lru.get("a"), "1")
+        self.assertIsNone(lru.get("b"))
+
+        lru.set("d", "4", ttl=-1)
+        self.assertIsNone(lru.get("d"))
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.original = cache.response_cache
+        cache.response_cache = ResponseCache(None, default_ttl=60, max_entries=16)
+        self.calls = []
+
+        @cached("things")
+        def endpoint(thing_id: int, db=None):
+            self.calls.append(thing_id)
+            return {"id": thing_id, "values": [1.5, None]}
+
+        self.endpoint = endpoint
+
+    def tearDown(self):
+        cache.response_cache = self.original
+
+    def test_hits_until_version_bump(self):
+        db = object()  # dependencies are not part of the key
+        self.assertEqual(self.endpoint(thing_id=1, db=db), {"id": 1, "values": [1.5, None]})
+        self.assertEqual(self.endpoint(thing_id=1, db=object()), {"id": 1, "values": [1.5, None]})
+        self.endpoint(thing_id=2, db=db)
+        self.assertEqual(self.calls, [1, 2])
+
+        cache.bump_data_version()
+        self.endpoint(thing_id=1, db=db)
+        self.assertEqual(self.calls, [1, 2, 1])
+
+        stats = cache.response_cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["backend"]), (1, 3, "memory"))
+        self.assertEqual(stats["hit_rate"], 0.25)
+
+    def test_namespace_bump(self):
+        self.endpoint(thing_id=1)
+        cache.bump_data_version("other")
+        self.endpoint(thing_id=1)
+        cache.bump_data_version("things")
+        self.endpoint(thing_id=1)
+        self.assertEqual(self.calls, [1, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+import sys
+import os
+from datetime import date
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import sessionmaker
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.models.change_log import ChangeLog
+from app.models.price import WeeklyPrice
+from app.services.data.data_version import DataVersionService, values_changed
+
+
+class TestValuesChanged(unittest.TestCase):
+    def test_upsert_returns_only_changed_rows(self):
+        records = [{"contract_id": 1, "report_date": date(2024, 1, 2), "close_price": 10.0, "volume": 5}]
+        stmt = insert(WeeklyPrice).values(records)
+        update_cols = {c.name: c for c in stmt.excluded if c.name not in ("id", "contract_id", "report_date")}
+        sql = str(stmt.on_conflict_do_update(
+            constraint="uq_contract_price",
+            set_=update_cols,
+            where=values_changed(WeeklyPrice.__table__, stmt.excluded, [c for c in records[0] if c in update_cols])
+        ).returning(WeeklyPrice.contract_id, WeeklyPrice.report_date).compile(dialect=postgresql.dialect()))
+
+        # Only the loaded columns are compared (defaults of absent ones would always differ)
+        self.assertIn(
+            "WHERE (weekly_prices.close_price, weekly_prices.volume) IS DISTINCT FROM "
+            "(excluded.close_price, excluded.volume)", sql
+        )
+        self.assertTrue(sql.endswith("RETURNING weekly_prices.contract_id, weekly_prices.report_date"))
+
+
+class TestChangesSince(unittest.TestCase):
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        ChangeLog.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+        entries = [
+            ("weekly_reports", 1, date(2024, 1, 2), 3),
+            ("weekly_reports", 2, date(2024, 1, 2), 4),
+            ("weekly_prices", 1, date(2024, 1, 2), 5),
+            ("whale_alerts", 1, date(2023, 12, 26), 2),
+        ]
+        for i, (table, cid, day, version) in enumerate(entries, start=1):
+            self.db.add(ChangeLog(id=i, table_name=table, contract_id=cid, report_date=day, version=version))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def test_grouped_by_table(self):
+        service = DataVersionService(self.db)
+        self.assertEqual(service.changes_since(2), {
+            "weekly_reports": [(1, date(2024, 1, 2)), (2, date(2024, 1, 2))],
+            "weekly_prices": [(1, date(2024, 1, 2))]
+        })
+        self.assertEqual(service.changes_since(3, contract_ids=[1]), {"weekly_prices": [(1, date(2024, 1, 2))]})
+        self.assertEqual(service.changes_since(5), {})
+
+    def test_limit(self):
+        service = DataVersionService(self.db)
+        self.assertIsNone(service.changes_since(0, limit=3))
+        self.assertEqual(len(service.changes_since(0, limit=4)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import sys
+import os
+
+from starlette.requests import Request
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.api.conditional import etag_matches, versioned_etag
+
+
+def make_request(path="/api/v1/contracts/5/history", query="", if_none_match=None):
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match else []
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "query_string": query.encode(),
+        "headers": headers
+    })
+
+
+class TestConditionalGet(unittest.TestCase):
+    def test_etag_depends_on_version_path_and_query(self):
+        base = versioned_etag(make_request(query="weeks_back=52&cot_window=26"), 3)
+        self.assertEqual(base, versioned_etag(make_request(query="cot_window=26&weeks_back=52"), 3))
+        self.assertNotEqual(base, versioned_etag(make_request(query="weeks_back=52&cot_window=26"), 4))
+        self.assertNotEqual(base, versioned_etag(make_request(query="weeks_back=104&cot_window=26"), 3))
+        self.assertNotEqual(base, versioned_etag(make_request(path="/api/v1/contracts/6/history", query="weeks_back=52&cot_window=26"), 3))
+        self.assertTrue(base.startswith('"v3-') and base.endswith('"'))
+
+    def test_etag_depends_on_extra_state(self):
+        # e.g. the dashboard's radar snapshot etag, refreshed without a version bump
+        request = make_request(path="/api/v1/dashboard/")
+        base = versioned_etag(request, 3, "snapshot-a")
+        self.assertEqual(base, versioned_etag(request, 3, "snapshot-a"))
+        self.assertNotEqual(base, versioned_etag(request, 3, "snapshot-b"))
+        self.assertNotEqual(base, versioned_etag(request, 3))
+        self.assertEqual(versioned_etag(request, 3), versioned_etag(request, 3, None))
+
+    def test_if_none_match(self):
+        etag = versioned_etag(make_request(), 1)
+        self.assertFalse(etag_matches(make_request(), etag))
+        self.assertTrue(etag_matches(make_request(if_none_match=etag), etag))
+        self.assertTrue(etag_matches(make_request(if_none_match=f'"other", W/{etag}'), etag))
+        self.assertTrue(etag_matches(make_request(if_none_match="*"), etag))
+        self.assertFalse(etag_matches(make_request(if_none_match='"v0-0000"'), etag))
+
+
+if __name__ == '__main__':
+    unittest.main()
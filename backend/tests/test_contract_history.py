@@ -0,0 +1,56 @@
+import unittest
+import sys
+import os
+from datetime import date
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.api.v1.endpoints.contracts import (
+    HISTORY_REPORT_COLUMNS, _columnar_history, _history_records
+)
+from app.models.contract import Contract
+from app.models.cot_index import TRADER_NET_COLUMNS
+
+
+class TestHistoryRecords(unittest.TestCase):
+    def setUp(self):
+        self.contract = Contract(id=7, contract_name="Gold")
+        day = date(2024, 1, 2)
+        positions = [100.0] * len(HISTORY_REPORT_COLUMNS)
+        positions[HISTORY_REPORT_COLUMNS.index("non_report_long")] = None
+        self.reports = [
+            [day, *positions, 12.5, 80.0, None],
+            [date(2023, 12, 26), *positions, None, None, None]
+        ]
+        self.alerts = [[day, 3, "High", 2.5, 0.0, "up", None]]
+        self.prices = [[day, None, 10.0, 9.0, 9.5, None, 1.2, None]]
+
+    def test_defaults(self):
+        history = _history_records(self.contract, 156, self.reports, self.alerts, self.prices)
+        latest, previous = history["historical_reports"]
+
+        self.assertEqual(latest["report_date"], "2024-01-02")
+        self.assertEqual(latest["non_report_long"], 0)
+        self.assertEqual(latest["cot_index"], dict(zip(TRADER_NET_COLUMNS, [12.5, 80.0, None])))
+        self.assertIsNone(previous["cot_index"])
+
+        alert = history["historical_alerts"][0]
+        self.assertEqual((alert["id"], alert["z_score"]), (3, 2.5))
+        self.assertIsNone(alert["cot_index"])
+        self.assertIsNone(alert["confidence_score"])
+
+        price = history["price_history"][0]
+        self.assertIsNone(price["open_price"])
+        self.assertEqual(price["close_price"], 9.5)
+        self.assertEqual(price["volume"], 0)
+
+    def test_columnar_has_the_same_fields(self):
+        records = _history_records(self.contract, 156, self.reports, self.alerts, self.prices)
+        columnar = _columnar_history(self.contract, 156, self.reports, self.alerts, self.prices)
+        for section in ("historical_alerts", "price_history"):
+            self.assertEqual(set(records[section][0]), set(columnar[section]))
+
+
+if __name__ == '__main__':
+    unittest.main()
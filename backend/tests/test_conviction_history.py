@@ -0,0 +1,204 @@
+import unittest
+from unittest.mock import MagicMock
+from datetime import date, timedelta
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.analysis.conviction_history import (
+    compute_conviction_history, edge_stats_by_week, point_in_time_edge_stats
+)
+from app.services.analysis.smart_radar import SmartRadarService
+from app.services.analysis.historical_edge import select_edge_stat
+from app.models.contract import Contract
+from app.models.report import WeeklyReport
+from app.models.historical_edge import HistoricalEdgeStat
+
+class TestConvictionHistory(unittest.TestCase):
+    def setUp(self):
+        self.service = SmartRadarService(MagicMock())
+
+    def _make_reports(self, contract_id, weeks):
+        start = date(2024, 1, 2)
+        reports = []
+        for i in range(weeks):
+            am_long = 10000 + 700 * i * contract_id
+            am_short = 8000 - 300 * i
+            reports.append(WeeklyReport(
+                contract_id=contract_id,
+                report_date=start + timedelta(weeks=i),
+                asset_mgr_long=am_long,
+                asset_mgr_short=am_short,
+                asset_mgr_net=am_long - am_short, # Computed column, not populated on transient objects
+                non_report_long=3000 + 50 * i,
+                non_report_short=2500 + 120 * i * contract_id,
+                open_interest=90000 + 1000 * i
+            ))
+        return reports
+
+    def _edge_stats(self):
+        return [
+            HistoricalEdgeStat(contract_id=1, threshold=10.0, sample_size=12, win_rate=58.0),
+            HistoricalEdgeStat(contract_id=1, threshold=20.0, sample_size=8, win_rate=66.0),
+            HistoricalEdgeStat(contract_id=1, threshold=30.0, sample_size=2, win_rate=90.0),
+        ]
+
+    def test_matches_scalar_conviction(self):
+        self._assert_matches_scalar(edge_stats=None)
+
+    def test_matches_scalar_conviction_with_edge_stats(self):
+        self._assert_matches_scalar(edge_stats=self._edge_stats())
+
+    def _assert_matches_scalar(self, edge_stats):
+        reports = self._make_reports(1, 6) + self._make_reports(2, 6)
+        df = pd.DataFrame([{
+            "contract_id": r.contract_id,
+            "report_date": r.report_date,
+            "asset_mgr_long": r.asset_mgr_long,
+            "asset_mgr_short": r.asset_mgr_short,
+            "non_report_long": r.non_report_long,
+            "non_report_short": r.non_report_short,
+            "open_interest": r.open_interest
+        } for r in reports])
+
+        edge_df = None
+        if edge_stats:
+            edge_df = pd.DataFrame([{
+                "contract_id": s.contract_id,
+                "threshold": s.threshold,
+                "sample_size": s.sample_size,
+                "win_rate": s.win_rate
+            } for s in edge_stats])
+
+        history = compute_conviction_history(df, edge_df)
+        self.assertEqual(len(history), 12)
+
+        for contract_id in (1, 2):
+            contract = Contract(id=contract_id)
+            c_reports = [r for r in reports if r.contract_id == contract_id]
+            c_history = history[history["contract_id"] == contract_id].reset_index(drop=True)
+
+            for i, report in enumerate(c_reports):
+                prev_report = c_reports[i - 1] if i > 0 else report
+                contract_edge = [s for s in edge_stats or [] if s.contract_id == contract_id]
+                expected = self.service._calculate_conviction(
+                    contract, report, prev_report, is_current=False, edge_stats=contract_edge
+                )
+                row = c_history.iloc[i]
+
+                self.assertAlmostEqual(row["score"], expected["score"], places=6)
+                self.assertAlmostEqual(row["sentiment_gap"], expected["sentiment_gap"], places=6)
+                self.assertEqual(row["net_change"], expected["am_net_change"])
+                self.assertEqual(row["win_rate"], expected["win_rate"])
+                for component, value in expected["breakdown"].items():
+                    self.assertAlmostEqual(row[component], value, places=6)
+
+    def test_select_edge_stat(self):
+        stats = self._edge_stats()
+        # Below every threshold: lowest usable
+        self.assertEqual(select_edge_stat(stats, 3.0).threshold, 10.0)
+        self.assertEqual(select_edge_stat(stats, -25.0).threshold, 20.0)
+        # 30% bucket has too few samples
+        self.assertEqual(select_edge_stat(stats, 45.0).threshold, 20.0)
+        self.assertIsNone(select_edge_stat([], 45.0))
+
+    def test_weekly_rank(self):
+        reports = self._make_reports(1, 3) + self._make_reports(2, 3)
+        df = pd.DataFrame([{col: getattr(r, col) for col in [
+            "contract_id", "report_date", "asset_mgr_long", "asset_mgr_short",
+            "non_report_long", "non_report_short", "open_interest"
+        ]} for r in reports])
+
+        history = compute_conviction_history(df)
+        for _, week in history.groupby("report_date"):
+            best = week.sort_values("score", ascending=False).iloc[0]
+            self.assertEqual(best["rank"], 1)
+    def test_historical_edge_capped(self):
+        reports = self._make_reports(1, 4)
+        df = pd.DataFrame([{col: getattr(r, col) for col in [
+            "contract_id", "report_date", "asset_mgr_long", "asset_mgr_short",
+            "non_report_long", "non_report_short", "open_interest"
+        ]} for r in reports])
+        edge_df = pd.DataFrame([{"contract_id": 1, "threshold": 0.0, "sample_size": 6, "win_rate": 100.0}])
+
+        history = compute_conviction_history(df, edge_df)
+        self.assertTrue((history["historical_edge"] == 100.0).all())
+        self.assertTrue((history["score"] <= 100.0).all())
+
+        stat = HistoricalEdgeStat(contract_id=1, threshold=0.0, sample_size=6, win_rate=100.0)
+        scalar = self.service._calculate_conviction(Contract(id=1), reports[1], reports[0], is_current=False, edge_stats=[stat])
+        self.assertEqual(scalar["breakdown"]["historical_edge"], 100.0)
+
+    def test_point_in_time_edge_stats(self):
+        dates = pd.to_datetime([date(2024, 1, 2) + timedelta(weeks=i) for i in range(8)])
+        frame = pd.DataFrame({
+            "contract_id": 1,
+            "report_date": dates,
+            "gap": [25.0, -25.0, 25.0, 5.0, 25.0, 25.0, 25.0, 25.0],
+            "ret_4w": [1.0, 2.0, -1.0, 3.0, 1.0, 1.0, np.nan, np.nan]
+        })
+        stats = point_in_time_edge_stats(frame, thresholds=[20.0], forward_weeks=4, lookback_years=5)
+        by_week = stats.set_index("report_date")
+
+        # Week 4 knows only week 0's outcome; week 6 knows weeks 0-2 (one win, two losses)
+        self.assertEqual(by_week.loc[dates[3], "sample_size"], 0)
+        self.assertTrue(np.isnan(by_week.loc[dates[3], "win_rate"]))
+        self.assertEqual(by_week.loc[dates[4], "sample_size"], 1)
+        self.assertEqual(by_week.loc[dates[4], "win_rate"], 100.0)
+        self.assertEqual(by_week.loc[dates[6], "sample_size"], 3)
+        self.assertEqual(by_week.loc[dates[6], "win_rate"], 33.3)
+
+        # Per-week stats are matched on the week
+        df = pd.DataFrame({
+            "contract_id": 1, "report_date": [d.date() for d in dates],
+            "asset_mgr_long": 100, "asset_mgr_short": 10,
+            "non_report_long": 10, "non_report_short": 100, "open_interest": 1000
+        })
+        early = stats.assign(sample_size=6)
+        history = compute_conviction_history(df, early)
+        self.assertEqual(history.loc[4, "win_rate"], 100.0)
+        self.assertEqual(history.loc[6, "win_rate"], 33.0)
+        self.assertEqual(history.loc[6, "historical_edge"], 0.0)
+
+    def test_edge_stats_by_week_match_history(self):
+        reports = self._make_reports(1, 8)
+        dates = pd.to_datetime([r.report_date for r in reports])
+        stats = pd.DataFrame({
+            "contract_id": 1,
+            "report_date": np.repeat(dates, 2),
+            "threshold": [10.0, 0.0] * 8,
+            "sample_size": 6,
+            "win_rate": [np.nan, 60.0] * 4 + [80.0, 70.0] * 4
+        })
+        df = pd.DataFrame([{
+            "contract_id": r.contract_id,
+            "report_date": r.report_date,
+            "asset_mgr_long": r.asset_mgr_long,
+            "asset_mgr_short": r.asset_mgr_short,
+            "non_report_long": r.non_report_long,
+            "non_report_short": r.non_report_short,
+            "open_interest": r.open_interest
+        } for r in reports])
+        history = compute_conviction_history(df, stats)
+
+        keys = [(1, reports[6].report_date), (1, reports[7].report_date), (2, reports[7].report_date)]
+        by_week = edge_stats_by_week(stats, keys)
+        self.assertEqual(set(by_week), set(keys[:2]))
+        self.assertEqual([s.threshold for s in by_week[keys[1]]], [0.0, 10.0])
+
+        # Radar scores built from the same week's stats agree with the stored history
+        for i in (6, 7):
+            scalar = self.service._calculate_conviction(
+                Contract(id=1), reports[i], reports[i - 1], is_current=False,
+                edge_stats=by_week[(1, reports[i].report_date)]
+            )
+            self.assertEqual(scalar["score"], history.loc[i, "score"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from collections import namedtuple
+from datetime import date, timedelta
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.analysis.cot_index import (
+    compute_rolling_cot_indexes, index_column, COT_WINDOWS, MIN_WINDOW_WEEKS, TRADER_NET_COLUMNS
+)
+from app.services.analysis.heatmap import build_rolling_heatmap
+
+Contract = namedtuple("Contract", ["id", "contract_name", "market_category"])
+
+
+def reference_index(series, window):
+    """Naive O(n * window) trailing min/max per week"""
+    out = []
+    for i in range(len(series)):
+        w = series[max(0, i - window + 1):i + 1]
+        if len(w) < min(window, MIN_WINDOW_WEEKS):
+            out.append(np.nan)
+            continue
+        lo, hi = min(w), max(w)
+        out.append(round((series[i] - lo) / (hi - lo) * 100, 1) if hi > lo else 50.0)
+    return out
+
+
+class TestRollingCotIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        start = date(2018, 1, 2)
+        rows = []
+        for contract_id, weeks in [(1, 300), (2, 40), (3, 10)]:
+            nets = {col: np.cumsum(rng.integers(-4000, 4000, weeks)) for col in TRADER_NET_COLUMNS.values()}
+            if contract_id == 2:
+                nets["dealer_net"][:] = 700  # flat range
+            for w in range(weeks):
+                rows.append({
+                    "contract_id": contract_id,
+                    "report_date": start + timedelta(weeks=w),
+                    **{col: int(v[w]) for col, v in nets.items()}
+                })
+        # Shuffled input: the engine sorts by (contract, date)
+        self.reports = pd.DataFrame(rows).sample(frac=1, random_state=1).reset_index(drop=True)
+
+    def test_matches_naive_windows(self):
+        result = compute_rolling_cot_indexes(self.reports)
+        expected_order = self.reports.sort_values(["contract_id", "report_date"]).reset_index(drop=True)
+
+        self.assertEqual(len(result), len(self.reports))
+        for contract_id, group in expected_order.groupby("contract_id"):
+            got = result[result["contract_id"] == contract_id]
+            for trader, col in TRADER_NET_COLUMNS.items():
+                for window in COT_WINDOWS:
+                    expected = reference_index(group[col].tolist(), window)
+                    np.testing.assert_allclose(
+                        got[index_column(trader, window)].to_numpy(dtype=float), expected,
+                        equal_nan=True, err_msg=f"contract {contract_id} {trader} {window}w"
+                    )
+
+    def test_flat_and_short_history(self):
+        result = compute_rolling_cot_indexes(self.reports)
+        flat = result[result["contract_id"] == 2]["dealer_52w"].dropna()
+        self.assertTrue((flat == 50.0).all())
+
+        # 10 weeks of history never reach the minimum window
+        short = result[result["contract_id"] == 3]
+        self.assertTrue(short[[index_column("asset_mgr", w) for w in COT_WINDOWS]].isna().all().all())
+
+    def test_bounds(self):
+        result = compute_rolling_cot_indexes(self.reports)
+        values = result.drop(columns=["contract_id", "report_date"]).to_numpy(dtype=float)
+        values = values[~np.isnan(values)]
+        self.assertTrue(((values >= 0) & (values <= 100)).all())
+
+    def test_rolling_heatmap(self):
+        result = compute_rolling_cot_indexes(self.reports)
+        indexes = result[["contract_id", "report_date", "lev_money_26w"]].rename(
+            columns={"lev_money_26w": "cot_index"}
+        )
+        end_date = pd.Timestamp(result["report_date"].max()).date() + timedelta(days=1)
+        contracts = [Contract(1, "A", "crypto"), Contract(2, "B", "crypto"), Contract(9, "C", "crypto")]
+
+        heatmap = build_rolling_heatmap(contracts, indexes, 8, end_date)
+        self.assertEqual(len(heatmap["weeks"]), 8)
+        self.assertEqual([row["contract_id"] for row in heatmap["heatmap"]], [1, 2])
+        last = result[result["contract_id"] == 1]["lev_money_26w"].iloc[-1]
+        self.assertEqual(heatmap["heatmap"][0]["data"][-1]["value"], last)
+        # Contract 2 history ended long before the heatmap weeks
+        self.assertTrue(all(p["value"] is None for p in heatmap["heatmap"][1]["data"]))
+
+
+if __name__ == '__main__':
+    unittest.main()
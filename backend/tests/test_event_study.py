@@ -0,0 +1,94 @@
+import unittest
+from datetime import date, timedelta
+import sys
+import os
+
+import numpy as np
+import pandas as pd
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.analysis.event_study import build_event_matrix, summarize_paths
+
+
+def reference_paths(prices, events, pre, post):
+    """Per-event loop: locate t0 by date, walk offsets within the contract's own series"""
+    rows = []
+    for _, event in events.iterrows():
+        series = prices[prices["contract_id"] == event["contract_id"]].sort_values("report_date")
+        dates = list(series["report_date"])
+        closes = list(series["close_price"])
+        t0 = next(
+            (i for i, d in enumerate(dates) if 0 <= (d - event["report_date"]).days <= 6),
+            None
+        )
+        if t0 is None:
+            continue
+        row = []
+        for offset in range(-pre, post + 1):
+            i = t0 + offset
+            row.append((closes[i] / closes[t0] - 1) * 100 if 0 <= i < len(closes) else np.nan)
+        rows.append(row)
+    return np.array(rows).reshape(-1, pre + post + 1)
+
+
+class TestEventStudy(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        start = date(2020, 1, 7)
+        price_rows = []
+        for contract_id, weeks in [(1, 60), (2, 40), (7, 25)]:
+            close = 100.0
+            for w in range(weeks):
+                close *= 1 + rng.normal(0, 0.03)
+                price_rows.append({
+                    "contract_id": contract_id,
+                    "report_date": start + timedelta(weeks=w),
+                    "close_price": close
+                })
+        self.prices = pd.DataFrame(price_rows)
+
+        self.events = pd.DataFrame([
+            {"contract_id": 1, "report_date": start + timedelta(weeks=2)},            # near start
+            {"contract_id": 1, "report_date": start + timedelta(weeks=30)},
+            {"contract_id": 2, "report_date": start + timedelta(weeks=35, days=-1)},  # Monday before close
+            {"contract_id": 7, "report_date": start + timedelta(weeks=24)},           # last week
+            {"contract_id": 2, "report_date": start + timedelta(weeks=80)},           # no price
+            {"contract_id": 9, "report_date": start},                                 # unknown contract
+        ])
+
+    def test_matrix_matches_reference(self):
+        matrix, matched = build_event_matrix(self.prices, self.events, 8, 13)
+        expected = reference_paths(self.prices, self.events, 8, 13)
+
+        self.assertEqual(list(matched), [True, True, True, True, False, False])
+        self.assertEqual(matrix.shape, (4, 22))
+        np.testing.assert_allclose(matrix, expected, equal_nan=True)
+
+    def test_paths_do_not_cross_contracts(self):
+        matrix, _ = build_event_matrix(self.prices, self.events, 8, 13)
+        # Contract 7 event is on its last week: every post offset is outside its history
+        self.assertTrue(np.isnan(matrix[3, 9:]).all())
+        self.assertEqual(matrix[3, 8], 0.0)
+
+    def test_summary(self):
+        matrix, _ = build_event_matrix(self.prices, self.events, 2, 3)
+        summary = summarize_paths(matrix, 2, 3)
+
+        self.assertEqual(summary["event_count"], 4)
+        self.assertEqual(summary["offsets"], [-2, -1, 0, 1, 2, 3])
+        t0 = summary["path"][2]
+        self.assertEqual((t0["count"], t0["mean"], t0["median"], t0["p10"], t0["p90"]), (4, 0.0, 0.0, 0.0, 0.0))
+        t1 = summary["path"][3]
+        self.assertEqual(t1["count"], 3)
+        self.assertAlmostEqual(t1["mean"], round(float(np.nanmean(matrix[:, 3])), 2))
+
+    def test_empty(self):
+        matrix, matched = build_event_matrix(self.prices, self.events.iloc[0:0], 8, 13)
+        self.assertEqual(matrix.shape, (0, 22))
+        self.assertEqual(summarize_paths(matrix, 8, 13)["event_count"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import unittest
+import sys
+import os
+import asyncio
+import inspect
+import json
+import threading
+from datetime import date
+
+from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.config import settings
+from app.core.events import EventBus, sse_message
+from app.api.v1.endpoints import events as events_endpoint
+
+
+async def collect(bus: EventBus, n: int, heartbeat: float = 0.05):
+    events = []
+    async for event in bus.events(heartbeat):
+        events.append(event)
+        if len(events) == n:
+            break
+    return events
+
+
+class TestEventBus(unittest.IsolatedAsyncioTestCase):
+    async def test_in_process_fan_out(self):
+        bus = EventBus(None)
+        first = asyncio.create_task(collect(bus, 3))
+        second = asyncio.create_task(collect(bus, 3))
+        await asyncio.sleep(0.01)
+        self.assertEqual(bus.local.subscriber_count, 2)
+
+        # Publishers are sync code (pipeline, loaders), possibly on another thread
+        thread = threading.Thread(target=bus.publish, args=("alert", {"id": 7, "report_date": date(2024, 1, 2)}))
+        thread.start()
+        thread.join()
+        bus.publish("pipeline_stage", {"stage": "completed"})
+
+        for events in await asyncio.gather(first, second):
+            self.assertEqual([e["type"] for e in events[:2]], ["alert", "pipeline_stage"])
+            self.assertEqual(events[0]["data"], {"id": 7, "report_date": "2024-01-02"})
+            self.assertIsNone(events[2])  # heartbeat
+        self.assertEqual(bus.local.subscriber_count, 0)
+
+    async def test_slow_subscriber_keeps_newest(self):
+        bus = EventBus(None, queue_size=2)
+        queue = bus.local.subscribe()
+        for i in range(5):
+            bus.publish("alert", {"id": i})
+        await asyncio.sleep(0.01)
+        self.assertEqual([queue.get_nowait()["data"]["id"] for _ in range(2)], [3, 4])
+
+    async def test_unreachable_redis_falls_back(self):
+        bus = EventBus("redis://127.0.0.1:1/0")
+        task = asyncio.create_task(collect(bus, 1, heartbeat=5))
+        await asyncio.sleep(0.01)
+        bus.publish("reports_loaded", {"rows": 3})
+        events = await asyncio.wait_for(task, 5)
+        self.assertEqual(events[0]["data"], {"rows": 3})
+        bus._listener.cancel()
+
+
+class TestSSEFormat(unittest.TestCase):
+    def test_message_framing(self):
+        message = sse_message({"type": "alert", "data": {"id": 1}, "published_at": "2024-01-02T00:00:00"})
+        self.assertTrue(message.startswith("event: alert\ndata: "))
+        self.assertTrue(message.endswith("\n\n"))
+        self.assertEqual(json.loads(message.split("data: ", 1)[1])["data"], {"id": 1})
+
+
+class TestEventStream(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.bus = EventBus(None)
+        self._saved = (events_endpoint.event_bus, settings.EVENTS_HEARTBEAT_SECONDS)
+        events_endpoint.event_bus = self.bus
+        settings.EVENTS_HEARTBEAT_SECONDS = 0.05
+
+    async def asyncTearDown(self):
+        events_endpoint.event_bus, settings.EVENTS_HEARTBEAT_SECONDS = self._saved
+
+    async def test_events_arrive_through_gzip(self):
+        app = FastAPI()
+        app.include_router(events_endpoint.router, prefix="/events")
+        # Compress event streams as well, like Starlette releases before 0.46
+        options = {}
+        if "exclude_content_types" in inspect.signature(GZipMiddleware).parameters:
+            options["exclude_content_types"] = ()
+        app.add_middleware(GZipMiddleware, minimum_size=1, **options)
+
+        # Raw ASGI: the test clients buffer the body until the response ends
+        messages = asyncio.Queue()
+        disconnected = asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        scope = {
+            "type": "http", "method": "GET", "path": "/events/", "raw_path": b"/events/",
+            "root_path": "", "query_string": b"", "scheme": "http", "http_version": "1.1",
+            "headers": [(b"accept-encoding", b"gzip")], "server": ("test", 80), "client": ("test", 1)
+        }
+        task = asyncio.create_task(app(scope, receive, messages.put))
+        try:
+            start = await asyncio.wait_for(messages.get(), 5)
+            headers = {k.decode(): v.decode() for k, v in start["headers"]}
+            self.assertNotEqual(headers.get("content-encoding"), "gzip")
+
+            while self.bus.local.subscriber_count == 0:
+                await asyncio.sleep(0.01)
+            self.bus.publish("alert", {"id": 1})
+
+            # A compressing middleware would hold the small chunks back
+            body = ""
+            while "data: " not in body:
+                body += (await asyncio.wait_for(messages.get(), 5))["body"].decode()
+            self.assertIn("event: alert", body)
+        finally:
+            disconnected.set()
+            await asyncio.wait_for(task, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+import sys
+import os
+import io
+from datetime import date, datetime
+from decimal import Decimal
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.data.exporter import arrow_schema, record_batch, write_batches, pyarrow_available
+
+if pyarrow_available():
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+# name, Postgres type OID (as in a psycopg2 cursor description)
+DESCRIPTION = [
+    ("contract_id", 23), ("report_date", 1082), ("close_price", 1700),
+    ("lev_net", 20), ("ticker", 1043), ("is_rollover_week", 16),
+    ("updated_at", 1114), ("tags", 1009)
+]
+TYPE_CODES = [code for _, code in DESCRIPTION]
+ROWS = [
+    (1, date(2024, 1, 2), Decimal("4780.250000"), 12000, "ES", False, datetime(2024, 1, 3, 8, 0), ["a"]),
+    (2, date(2024, 1, 9), None, None, None, None, None, None),
+]
+
+
+@unittest.skipUnless(pyarrow_available(), "pyarrow not installed")
+class TestExporter(unittest.TestCase):
+    def setUp(self):
+        self.schema = arrow_schema(DESCRIPTION)
+
+    def test_schema_from_description(self):
+        types = {field.name: field.type for field in self.schema}
+        self.assertEqual(types["contract_id"], pa.int32())
+        self.assertEqual(types["report_date"], pa.date32())
+        self.assertEqual(types["close_price"], pa.float64())
+        self.assertEqual(types["lev_net"], pa.int64())
+        self.assertEqual(types["updated_at"], pa.timestamp("us"))
+        self.assertEqual(types["tags"], pa.string())  # unknown types fall back to text
+
+    def test_record_batch_from_tuples(self):
+        batch = record_batch(ROWS, self.schema, TYPE_CODES)
+        self.assertEqual(batch.num_rows, 2)
+        self.assertEqual(batch.column(2).to_pylist(), [4780.25, None])
+        self.assertEqual(batch.column(7).to_pylist(), ["['a']", None])
+        self.assertEqual(record_batch([], self.schema, TYPE_CODES).num_rows, 0)
+
+    def test_arrow_stream_round_trip(self):
+        batches = (record_batch(ROWS, self.schema, TYPE_CODES) for _ in range(3))
+        chunks = list(write_batches(batches, self.schema, "arrow"))
+        self.assertGreater(len(chunks), 3)  # schema + one chunk per batch + end of stream
+
+        table = pa.ipc.open_stream(b"".join(chunks)).read_all()
+        self.assertEqual(table.num_rows, 6)
+        self.assertEqual(table.schema, self.schema)
+
+    def test_parquet_row_group_per_batch(self):
+        batches = (record_batch(ROWS, self.schema, TYPE_CODES) for _ in range(3))
+        data = b"".join(write_batches(batches, self.schema, "parquet"))
+
+        parquet = pq.ParquetFile(io.BytesIO(data))
+        self.assertEqual(parquet.num_row_groups, 3)
+        self.assertEqual(parquet.metadata.num_rows, 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+import unittest
+from collections import namedtuple
+from datetime import date, timedelta
+import logging
+import sys
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.services.analysis.heatmap import build_heatmap
+
+Contract = namedtuple("Contract", ["id", "contract_name", "market_category"])
+Report = namedtuple("Report", ["contract_id", "report_date", "asset_mgr_net"])
+MinMax = namedtuple("MinMax", ["contract_id", "min_net", "max_net"])
+
+logger = logging.getLogger(__name__)
+
+
+def reference_heatmap(contracts, reports, min_max_query, weeks, end_date):
+    """Original per-contract / per-week scan from get_market_heatmap"""
+    min_max_map = {r.contract_id: {'min': r.min_net, 'max': r.max_net} for r in min_max_query}
+    heatmap_data = []
+    week_dates = sorted(list(set([r.report_date.strftime("%Y-%m-%d") for r in reports if r.report_date >= (end_date - timedelta(weeks=weeks+1))])))
+    week_dates = week_dates[-weeks:]
+
+    for contract in contracts:
+        c_stats = min_max_map.get(contract.id)
+        if not c_stats:
+            continue
+        if c_stats['min'] is None or c_stats['max'] is None:
+            heatmap_data.append({
+                "contract_id": contract.id,
+                "contract_name": contract.contract_name,
+                "category": contract.market_category,
+                "data": []
+            })
+            continue
+
+        c_min = float(c_stats['min'])
+        c_max = float(c_stats['max'])
+        divisor = c_max - c_min if c_max != c_min else 1.0
+        c_reports = [r for r in reports if r.contract_id == contract.id]
+
+        series = []
+        for date_str in week_dates:
+            report = next((r for r in c_reports if r.report_date.strftime("%Y-%m-%d") == date_str), None)
+            val = None
+            if report:
+                net = float(report.asset_mgr_net)
+                cot_index = ((net - c_min) / divisor) * 100
+                cot_index = max(0, min(100, cot_index))
+                val = round(cot_index, 1)
+            series.append({"date": date_str, "value": val})
+
+        heatmap_data.append({
+            "contract_id": contract.id,
+            "contract_name": contract.contract_name,
+            "category": contract.market_category,
+            "data": series
+        })
+
+    return {"weeks": week_dates, "heatmap": heatmap_data}
+
+
+def make_fixture(n_contracts, weeks, seed=0):
+    """Recent reports (weeks + 4) and 156-week min/max, with gaps and a flat contract"""
+    rng = np.random.default_rng(seed)
+    end_date = date(2024, 6, 5)
+    last_tuesday = end_date - timedelta(days=1)
+    contracts = [Contract(i, f"Contract {i}", "stock_index" if i % 2 else "crypto") for i in range(1, n_contracts + 1)]
+
+    reports, min_max = [], []
+    for c in contracts:
+        history = np.cumsum(rng.normal(0, 5000, 156)).astype(int)
+        if c.id == 3:
+            history[:] = 1200  # flat range
+        for w in range(weeks + 4):
+            if c.id % 7 == 0 and w % 5 == 2:
+                continue  # missing week
+            reports.append(Report(c.id, last_tuesday - timedelta(weeks=w), int(history[-1 - w])))
+        if c.id == n_contracts:
+            continue  # no stats at all -> skipped
+        # Range from the full window, occasionally narrower than recent values to exercise clamping
+        lo, hi = int(history.min()), int(history.max())
+        if c.id % 11 == 0:
+            lo, hi = lo // 2, hi // 2
+        min_max.append(MinMax(c.id, lo, hi))
+
+    if n_contracts > 4:
+        min_max[3] = MinMax(min_max[3].contract_id, None, None)
+    return contracts, reports, min_max, end_date
+
+
+def run_vectorized(contracts, reports, min_max, weeks, end_date):
+    return build_heatmap(
+        contracts,
+        pd.DataFrame(reports, columns=Report._fields),
+        pd.DataFrame(min_max, columns=MinMax._fields),
+        weeks,
+        end_date
+    )
+
+
+def assert_same(test, result, expected):
+    test.assertEqual(result["weeks"], expected["weeks"])
+    test.assertEqual(len(result["heatmap"]), len(expected["heatmap"]))
+    for row, exp in zip(result["heatmap"], expected["heatmap"]):
+        test.assertEqual(
+            {k: v for k, v in row.items() if k != "data"},
+            {k: v for k, v in exp.items() if k != "data"}
+        )
+        test.assertEqual([p["date"] for p in row["data"]], [p["date"] for p in exp["data"]])
+        for p, e in zip(row["data"], exp["data"]):
+            if e["value"] is None:
+                test.assertIsNone(p["value"])
+            else:
+                test.assertAlmostEqual(p["value"], e["value"], delta=0.051)
+
+
+class TestHeatmap(unittest.TestCase):
+    def test_matches_reference(self):
+        for weeks in (4, 12, 52):
+            contracts, reports, min_max, end_date = make_fixture(30, weeks, seed=weeks)
+            expected = reference_heatmap(contracts, reports, min_max, weeks, end_date)
+            result = run_vectorized(contracts, reports, min_max, weeks, end_date)
+            assert_same(self, result, expected)
+
+    def test_empty_reports(self):
+        contracts = [Contract(1, "A", "crypto")]
+        result = run_vectorized(contracts, [], [MinMax(1, None, None)], 12, date(2024, 6, 5))
+        self.assertEqual(result["weeks"], [])
+        self.assertEqual(result["heatmap"][0]["data"], [])
+
+
+class TestHeatmapBenchmark(unittest.TestCase):
+    """
+    52 weeks x 200 contracts: pivot vs the original nested scan.
+    Timings are logged for reference only (pytest --log-cli-level=INFO shows them);
+    wall-clock comparisons flake on loaded machines.
+    """
+
+    def test_benchmark_52_weeks_200_contracts(self):
+        contracts, reports, min_max, end_date = make_fixture(200, 52, seed=1)
+
+        start = time.perf_counter()
+        expected = reference_heatmap(contracts, reports, min_max, 52, end_date)
+        reference_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = run_vectorized(contracts, reports, min_max, 52, end_date)
+        vectorized_time = time.perf_counter() - start
+
+        logger.info(
+            "heatmap 52w x 200c: reference %.0f ms, pivot %.0f ms",
+            reference_time * 1000, vectorized_time * 1000
+        )
+        assert_same(self, result, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
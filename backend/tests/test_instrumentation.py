@@ -0,0 +1,93 @@
+import unittest
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core import instrumentation
+from app.core.config import settings
+from app.core.instrumentation import (
+    MetricsRegistry, RequestStats, TimingMiddleware, install_sql_hooks, statement_shape
+)
+
+
+class TestStatementShape(unittest.TestCase):
+    def test_parameters_and_in_lists_collapse(self):
+        a = statement_shape("SELECT * FROM weekly_reports WHERE contract_id = %(contract_id_1)s LIMIT 10")
+        b = statement_shape("SELECT *\n  FROM weekly_reports WHERE contract_id = %(contract_id_1)s LIMIT 50")
+        self.assertEqual(a, b)
+        self.assertEqual(
+            statement_shape("SELECT id FROM contracts WHERE id IN ($1, $2, $3)"),
+            statement_shape("SELECT id FROM contracts WHERE id IN ($1)")
+        )
+        self.assertNotEqual(a, statement_shape("SELECT * FROM whale_alerts WHERE contract_id = $1"))
+
+
+class TestTimingMiddleware(unittest.TestCase):
+    def setUp(self):
+        install_sql_hooks()
+        self.registry = MetricsRegistry()
+        self._registry = instrumentation.metrics_registry
+        self._threshold = settings.N_PLUS_ONE_THRESHOLD
+        instrumentation.metrics_registry = self.registry
+
+        engine = create_engine("sqlite://")
+        app = FastAPI()
+        app.add_middleware(TimingMiddleware)
+
+        @app.get("/items/{item_id}")
+        def item(item_id: int):
+            with engine.connect() as conn:
+                for i in range(item_id):
+                    conn.execute(text("SELECT :i"), {"i": i})
+            return {"ok": True}
+
+        self.client = TestClient(app)
+
+    def tearDown(self):
+        instrumentation.metrics_registry = self._registry
+        settings.N_PLUS_ONE_THRESHOLD = self._threshold
+
+    def test_server_timing_and_metrics(self):
+        response = self.client.get("/items/3")
+        timing = response.headers["server-timing"]
+        self.assertIn("app;dur=", timing)
+        self.assertIn('desc="3 queries"', timing)
+        self.assertIn("db-slowest;dur=", timing)
+
+        self.client.get("/items/1")
+        self.client.get("/missing")
+        body = self.registry.render()
+        self.assertIn('http_requests_total{method="GET",route="/items/{item_id}",status="200"} 2', body)
+        self.assertIn('http_requests_total{method="GET",route="unmatched",status="404"} 1', body)
+        self.assertIn('http_request_db_statements_total{method="GET",route="/items/{item_id}"} 4', body)
+        self.assertIn('http_request_duration_seconds_count{method="GET",route="/items/{item_id}"} 2', body)
+
+    def test_n_plus_one_threshold(self):
+        settings.N_PLUS_ONE_THRESHOLD = 0
+        self.client.get("/items/10")
+        self.assertEqual(self.registry.n_plus_one, 0)
+
+        settings.N_PLUS_ONE_THRESHOLD = 5
+        self.client.get("/items/5")
+        self.assertEqual(self.registry.n_plus_one, 0)
+        self.client.get("/items/6")
+        self.assertEqual(self.registry.n_plus_one, 1)
+
+    def test_repeated_shapes(self):
+        stats = RequestStats()
+        for i in range(4):
+            stats.record(f"SELECT * FROM weekly_prices WHERE contract_id = {i}", 0.001)
+        stats.record("SELECT 1", 0.01)
+        self.assertEqual(stats.statements, 5)
+        self.assertEqual(stats.slowest_statement, "SELECT ?")
+        self.assertEqual(stats.repeated_shapes(3), [("SELECT * FROM weekly_prices WHERE contract_id = ?", 4)])
+
+
+if __name__ == '__main__':
+    unittest.main()
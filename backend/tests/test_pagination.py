@@ -0,0 +1,76 @@
+import unittest
+import sys
+import os
+from datetime import date
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core import cache
+from app.core.cache import ResponseCache
+from app.api.pagination import encode_cursor, decode_cursor, total_count
+from app.api.v1.endpoints.alerts import ALERT_CURSOR_TYPES
+from app.models.alert import WhaleAlert
+
+
+class FakeAsyncSession:
+    """run_sync() passes a marker session to the count callable"""
+    async def run_sync(self, fn, *args):
+        return fn("session", *args)
+
+
+class TestCursor(unittest.TestCase):
+    def test_round_trip(self):
+        cursor = encode_cursor(date(2024, 1, 2), Decimal("87.50"), 42)
+        self.assertNotIn("=", cursor)
+        self.assertEqual(
+            decode_cursor(cursor, ALERT_CURSOR_TYPES),
+            (date(2024, 1, 2), Decimal("87.50"), 42)
+        )
+
+    def test_invalid(self):
+        for cursor in ["not-a-cursor", encode_cursor("2024-01-02"), encode_cursor("x", "1", "2")]:
+            with self.assertRaises(HTTPException) as ctx:
+                decode_cursor(cursor, ALERT_CURSOR_TYPES)
+            self.assertEqual(ctx.exception.status_code, 400)
+
+    def test_feed_index_matches_order(self):
+        index = next(i for i in WhaleAlert.__table__.indexes if i.name == "ix_whale_alerts_feed")
+        sql = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+        self.assertIn("(report_date, coalesce(confidence_score, 1000), id)", sql)
+
+
+class TestTotalCount(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.original = cache.response_cache
+        cache.response_cache = ResponseCache(None, default_ttl=60, max_entries=16)
+        self.calls = 0
+
+    def tearDown(self):
+        cache.response_cache = self.original
+
+    def count(self, db):
+        self.calls += 1
+        return 10 * self.calls
+
+    async def test_modes(self):
+        db = FakeAsyncSession()
+        params = {"contract_id": 1}
+        self.assertIsNone(await total_count(db, "none", "reports", params, self.count))
+        self.assertEqual(self.calls, 0)
+
+        # cached: counted once per data version
+        self.assertEqual(await total_count(db, "cached", "reports", params, self.count), 10)
+        self.assertEqual(await total_count(db, "cached", "reports", params, self.count), 10)
+        self.assertEqual(await total_count(db, "exact", "reports", params, self.count), 20)
+        cache.bump_data_version()
+        self.assertEqual(await total_count(db, "cached", "reports", params, self.count), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import sys
+import os
+import tempfile
+
+from sqlalchemy import create_engine, exc, text
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.db.pool_metrics import MeteredQueuePool, PoolMetrics, pool_stats
+
+
+class TestPoolMetrics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(
+            f"sqlite:///{self.tmp.name}/pool.db",
+            poolclass=MeteredQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.05
+        )
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    def test_checkouts_in_use_and_waits(self):
+        with self.engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            stats = pool_stats(self.engine)
+            self.assertEqual(stats["in_use"], 1)
+            self.assertEqual(stats["checkouts"], 1)
+
+            # Pool exhausted: the second checkout waits, then times out
+            with self.assertRaises(exc.TimeoutError):
+                self.engine.connect()
+
+        stats = pool_stats(self.engine)
+        self.assertEqual(stats["in_use"], 0)
+        self.assertEqual(stats["idle"], 1)
+        self.assertEqual(stats["waits"], 1)
+        self.assertEqual(stats["timeouts"], 1)
+        self.assertEqual(stats["checkouts"], 1)
+
+        with self.engine.connect():
+            pass
+        stats = pool_stats(self.engine)
+        self.assertEqual(stats["checkouts"], 2)
+        self.assertEqual(stats["waits"], 1)
+        self.assertGreaterEqual(stats["checkout_ms_max"], stats["checkout_ms_p50"])
+
+    def test_latency_percentiles(self):
+        metrics = PoolMetrics()
+        for ms in range(1, 101):
+            metrics.record(ms / 1000, waited=False)
+        stats = metrics.snapshot()
+        self.assertEqual(stats["checkouts"], 100)
+        self.assertAlmostEqual(stats["checkout_ms_avg"], 50.5)
+        self.assertEqual(stats["checkout_ms_p50"], 51.0)
+        self.assertEqual(stats["checkout_ms_p99"], 100.0)
+        self.assertEqual(stats["checkout_ms_max"], 100.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+import os
+import tempfile
+from pathlib import Path
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.core.config import settings
+from app.core.profiling import Profiler, ProfilingMiddleware, profile_stage, profiled
+
+
+def work(n=2000):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiling(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self._saved = (settings.PROFILE_ENABLED, settings.ADMIN_TOKEN,
+                       settings.PROFILE_DIR, settings.PROFILE_KEEP)
+        settings.PROFILE_DIR = self.tmp.name
+
+    def tearDown(self):
+        (settings.PROFILE_ENABLED, settings.ADMIN_TOKEN,
+         settings.PROFILE_DIR, settings.PROFILE_KEEP) = self._saved
+        self.tmp.cleanup()
+
+    def reports(self):
+        return sorted(p.name for p in Path(self.tmp.name).glob("*.prof"))
+
+    def test_disabled_adds_nothing(self):
+        settings.PROFILE_ENABLED = False
+        self.assertIs(profile_stage("stage")(work), work)
+        with profiled("stage"):
+            work()
+        self.assertEqual(self.reports(), [])
+
+    def test_stage_reports_and_retention(self):
+        settings.PROFILE_ENABLED = True
+        settings.PROFILE_KEEP = 3
+        stage = profile_stage("analyzer.update_contract_statistics")(work)
+        for _ in range(5):
+            self.assertEqual(stage(), work())
+
+        reports = self.reports()
+        self.assertEqual(len(reports), 3)
+        self.assertTrue(all(r.endswith("-analyzer.update_contract_statistics.prof") for r in reports))
+        summary = (Path(self.tmp.name) / reports[-1]).with_suffix(".txt").read_text()
+        self.assertIn("analyzer.update_contract_statistics", summary)
+        self.assertIn("cumulative", summary)
+
+    def test_nested_profiles_are_skipped(self):
+        settings.PROFILE_ENABLED = True
+        with Profiler("outer"):
+            with profiled("inner"):
+                work()
+        self.assertEqual(len(self.reports()), 1)
+
+    def test_admin_request_profile(self):
+        settings.PROFILE_ENABLED = False
+        settings.ADMIN_TOKEN = "secret"
+        app = FastAPI()
+        app.add_middleware(ProfilingMiddleware)
+
+        @app.get("/work")
+        async def endpoint():
+            return {"total": work()}
+
+        client = TestClient(app)
+        self.assertNotIn("x-profile-report", client.get("/work?profile=1").headers)
+        self.assertNotIn("x-profile-report", client.get("/work?profile=1", headers={"X-Admin-Token": "wrong"}).headers)
+        self.assertEqual(self.reports(), [])
+
+        response = client.get("/work?profile=1", headers={"X-Admin-Token": "secret"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.reports(), [response.headers["x-profile-report"] + ".prof"])
+
+
+if __name__ == '__main__':
+    unittest.main()
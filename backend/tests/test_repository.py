@@ -0,0 +1,92 @@
+import unittest
+import sys
+import os
+from datetime import date, timedelta
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.db.repository import get_latest_reports, get_reports_by_date, get_previous_alert_z_scores
+from app.models.report import WeeklyReport
+from app.models.alert import WhaleAlert
+
+
+class TestRepository(unittest.TestCase):
+    """Window-function batch reads (sqlite)"""
+    def setUp(self):
+        engine = create_engine("sqlite://")
+        for model in (WeeklyReport, WhaleAlert):
+            model.__table__.create(engine)
+        self.db = sessionmaker(bind=engine)()
+
+        self.start = date(2024, 1, 2)
+        # Contract 1: five weeks, contract 2: two weeks, contract 3: none
+        for contract_id, weeks in ((1, 5), (2, 2)):
+            for i in range(weeks):
+                self.db.add(WeeklyReport(
+                    id=contract_id * 100 + i, contract_id=contract_id,
+                    report_date=self.start + timedelta(weeks=i), open_interest=1000 + i
+                ))
+        # Alerts: contract 1 on weeks 0, 2, 3; contract 2 on week 1 only
+        for alert_id, contract_id, week, z_score in ((1, 1, 0, 2.1), (2, 1, 2, -2.4), (3, 1, 3, 3.0), (4, 2, 1, 2.2)):
+            self.db.add(WhaleAlert(
+                id=alert_id, contract_id=contract_id,
+                report_date=self.start + timedelta(weeks=week), z_score=z_score
+            ))
+        self.db.commit()
+
+    def tearDown(self):
+        self.db.close()
+
+    def week(self, i):
+        return self.start + timedelta(weeks=i)
+
+    def test_latest_reports_newest_first(self):
+        latest = get_latest_reports(self.db, [1, 2], k=3)
+        self.assertEqual([r.report_date for r in latest[1]], [self.week(4), self.week(3), self.week(2)])
+        # Fewer than k reports: all of them
+        self.assertEqual([r.report_date for r in latest[2]], [self.week(1), self.week(0)])
+
+    def test_latest_reports_contract_filter(self):
+        self.assertEqual(get_latest_reports(self.db, [], k=2), {})
+        # Contracts without reports are omitted
+        self.assertEqual(list(get_latest_reports(self.db, [2, 3], k=1)), [2])
+        # None means every contract
+        self.assertEqual(sorted(get_latest_reports(self.db, None, k=1)), [1, 2])
+
+    def test_reports_by_date(self):
+        keys = [(1, self.week(1)), (2, self.week(1)), (1, self.week(1)), (2, self.week(4))]
+        reports = get_reports_by_date(self.db, keys)
+        self.assertEqual(sorted(reports), [(1, self.week(1)), (2, self.week(1))])
+        self.assertEqual(reports[(2, self.week(1))].id, 201)
+        self.assertEqual(get_reports_by_date(self.db, []), {})
+
+    def test_previous_alert_z_scores(self):
+        previous = get_previous_alert_z_scores(self.db, [1, 2, 3, 4])
+        # LAG is per contract: each contract's first alert has no previous one
+        self.assertIsNone(previous[1])
+        self.assertIsNone(previous[4])
+        self.assertAlmostEqual(float(previous[2]), 2.1)
+        self.assertAlmostEqual(float(previous[3]), -2.4)
+
+        # Earlier alerts count even when they are not requested
+        self.assertEqual(list(get_previous_alert_z_scores(self.db, [3])), [3])
+        self.assertAlmostEqual(float(get_previous_alert_z_scores(self.db, [3])[3]), -2.4)
+        self.assertEqual(get_previous_alert_z_scores(self.db, []), {})
+
+    def test_previous_alert_z_scores_same_week(self):
+        # Two alerts in one week (reports are unique per week, alerts are not):
+        # ties are ordered by id
+        self.db.add(WhaleAlert(id=5, contract_id=1, report_date=self.week(3), z_score=-1.5))
+        self.db.commit()
+
+        previous = get_previous_alert_z_scores(self.db, [3, 5])
+        self.assertAlmostEqual(float(previous[3]), -2.4)
+        self.assertAlmostEqual(float(previous[5]), 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+
+from sqlalchemy import create_engine, exc, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+# Fix path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+
+from app.db import session
+from app.db.pool_metrics import MeteredAsyncQueuePool
+
+
+class TestRunConcurrently(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        # One connection: a request holding it while fanning out can never proceed
+        self.engine = create_async_engine(
+            f"sqlite+aiosqlite:///{self.tmp.name}/pool.db",
+            poolclass=MeteredAsyncQueuePool, pool_size=1, max_overflow=0, pool_timeout=0.2
+        )
+        self.original = session.AsyncSessionLocal
+        session.AsyncSessionLocal = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def asyncTearDown(self):
+        session.AsyncSessionLocal = self.original
+        await self.engine.dispose()
+        self.tmp.cleanup()
+
+    async def test_release_returns_request_connection_first(self):
+        query = lambda s: s.execute(text("SELECT 1")).scalar()
+        async with session.AsyncSessionLocal() as db:
+            await db.execute(text("SELECT 1"))
+            with self.assertRaises(exc.TimeoutError):
+                await session.run_concurrently(query)
+
+            self.assertEqual(await session.run_concurrently(query, query, release=db), [1, 1])
+            # The request session is still usable afterwards
+            self.assertEqual((await db.execute(text("SELECT 2"))).scalar(), 2)
+
+
+class TestRunInThreads(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.engine = create_engine(f"sqlite:///{self.tmp.name}/threads.db")
+        self.original = session.SessionLocal
+        session.SessionLocal = sessionmaker(bind=self.engine)
+
+    async def asyncTearDown(self):
+        session.SessionLocal = self.original
+        self.engine.dispose()
+        self.tmp.cleanup()
+
+    async def test_calls_run_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        results = await session.run_in_threads(
+            lambda s: (s.execute(text("SELECT 1")).scalar(), threading.get_ident()),
+            lambda s: (s.execute(text("SELECT 2")).scalar(), threading.get_ident())
+        )
+        self.assertEqual([value for value, _ in results], [1, 2])
+        self.assertTrue(all(thread != loop_thread for _, thread in results))
+
+
+if __name__ == '__main__':
+    unittest.main()
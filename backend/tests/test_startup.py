@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import json
+import logging
+import subprocess
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '../'))
+
+# Libraries that must load on first use, not when the app starts
+HEAVY_MODULES = ["pandas", "numpy", "scipy", "yfinance", "pandas_ta", "pyarrow"]
+
+logger = logging.getLogger(__name__)
+
+# Runs in a fresh interpreter so earlier test imports don't skew the numbers
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+from app.main import app
+import_seconds = time.perf_counter() - started
+app.openapi()
+startup_seconds = time.perf_counter() - started
+for name in sys.argv[1:]:
+    __import__(name)
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    import resource  # peak RSS, KB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    "import_seconds": import_seconds,
+    "startup_seconds": startup_seconds,
+    "rss_mb": rss_kb() / 1024,
+    "loaded": [m for m in %r if m in sys.modules],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def probe(*extra_imports):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, *extra_imports],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        raise AssertionError(result.stderr)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+class TestStartupBenchmark(unittest.TestCase):
+    """
+    Import time and resident memory after app creation (local benchmark).
+    Numbers are logged: pytest --log-cli-level=INFO shows them.
+    """
+
+    def test_app_starts_without_heavy_libraries(self):
+        lazy = probe()
+        self.assertEqual(lazy["loaded"], [])
+
+        # Same process after the first analysis request pulls pandas/numpy in
+        eager = probe("app.services.analysis.heatmap")
+        logger.info(
+            "startup: import %.0f ms, app + openapi %.0f ms, RSS %.0f MB "
+            "(after first analysis import: RSS %.0f MB)",
+            lazy["import_seconds"] * 1000, lazy["startup_seconds"] * 1000, lazy["rss_mb"], eager["rss_mb"]
+        )
+        self.assertIn("pandas", eager["loaded"])
+        self.assertLess(lazy["rss_mb"], eager["rss_mb"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,18 +18,32 @@ const FullReportsTable: React.FC<FullReportsTableProps> = ({ contractId }) => {
     const [reports, setReports] = useState<Report[]>([]);
     const [totalCount, setTotalCount] = useState(0);
     const [page, setPage] = useState(0);
+    // cursors[n] fetches page n (keyset pagination); page 0 has none
+    const [cursors, setCursors] = useState<(string | null)[]>([null]);
     const [loading, setLoading] = useState(true);
     const limit = 20;
 
+    useEffect(() => {
+        setPage(0);
+        setCursors([null]);
+    }, [contractId]);
+
     useEffect(() => {
         const fetchReports = async () => {
             try {
                 setLoading(true);
-                const offset = page * limit;
-                const response = await fetch(`http://localhost:8000/api/v1/contracts/${contractId}/reports?limit=${limit}&offset=${offset}`);
+                const cursor = cursors[page];
+                const params = new URLSearchParams({ limit: String(limit) });
+                if (cursor) params.set('cursor', cursor);
+                const response = await fetch(`http://localhost:8000/api/v1/contracts/${contractId}/reports?${params}`);
                 const result = await response.json();
                 setReports(result.reports || []);
                 setTotalCount(result.total_count || 0);
+                setCursors(prev => {
+                    const next = prev.slice(0, page + 1);
+                    next[page + 1] = result.next_cursor ?? null;
+                    return next;
+                });
             } catch (error) {
                 console.error('Failed to fetch reports:', error);
             } finally {
@@ -40,7 +54,8 @@ const FullReportsTable: React.FC<FullReportsTableProps> = ({ contractId }) => {
         fetchReports();
     }, [contractId, page]);
 
-    const totalPages = Math.ceil(totalCount / limit);
+    const totalPages = Math.max(1, Math.ceil(totalCount / limit));
+    const hasNext = Boolean(cursors[page + 1]);
 
     if (loading && reports.length === 0) {
         return <div className="text-center py-8 text-gray-500">Loading reports...</div>;
@@ -64,8 +79,8 @@ const FullReportsTable: React.FC<FullReportsTableProps> = ({ contractId }) => {
                         Page {page + 1} of {totalPages}
                     </span>
                     <button
-                        onClick={() => setPage(p => Math.min(totalPages - 1, p + 1))}
-                        disabled={page >= totalPages - 1}
+                        onClick={() => setPage(p => p + 1)}
+                        disabled={!hasNext || loading}
                         className="p-2 rounded-lg border border-gray-300 dark:border-white/10 disabled:opacity-30 hover:bg-gray-100 dark:hover:bg-white/5"
                     >
                         <ChevronRight size={16} />
@@ -18,13 +18,11 @@ const Dashboard: React.FC = () => {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const [alertsData, contractsData] = await Promise.all([
-                    api.getAlerts(),
-                    api.getContracts()
-                ]);
+                // One bundled request instead of /alerts + /contracts
+                const bundle = await api.getDashboard();
 
-                setAlerts(alertsData);
-                setContracts(contractsData);
+                setAlerts(bundle.alerts);
+                setContracts(bundle.contracts);
 
                 // Get unique contract count
 
@@ -36,6 +34,14 @@ const Dashboard: React.FC = () => {
         };
 
         fetchData();
+
+        // Refetch when the pipeline finishes or new alerts land, instead of polling
+        const events = api.subscribeEvents(['alert', 'pipeline_stage'], (event) => {
+            if (event.type === 'alert' || event.data.stage === 'completed') {
+                fetchData();
+            }
+        });
+        return () => events.close();
     }, []);
 
     // Calculate latest COT date from alerts and contracts
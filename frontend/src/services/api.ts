@@ -1,5 +1,5 @@
 import axios from 'axios';
-import { WhaleAlert, Contract } from '../types/api';
+import { WhaleAlert, Contract, DashboardBundle, ServerEvent, SyncResponse } from '../types/api';
 
 const API_URL = 'http://localhost:8000/api/v1';
 
@@ -38,5 +38,27 @@ export const api = {
     getSmartMoneyRadar: async (): Promise<any> => {
         const response = await apiClient.get<any>('/analysis/radar');
         return response.data;
+    },
+
+    getDashboard: async (): Promise<DashboardBundle> => {
+        const response = await apiClient.get<DashboardBundle>('/dashboard/');
+        return response.data;
+    },
+
+    getChanges: async (since: number, ids?: number[]): Promise<SyncResponse> => {
+        const params = new URLSearchParams();
+        params.append('since', since.toString());
+        if (ids && ids.length) params.append('ids', ids.join(','));
+
+        const response = await apiClient.get<SyncResponse>(`/sync/?${params.toString()}`);
+        return response.data;
+    },
+
+    subscribeEvents: (types: string[], onEvent: (event: ServerEvent) => void): EventSource => {
+        const source = new EventSource(`${API_URL}/events/?types=${types.join(',')}`);
+        types.forEach(type => source.addEventListener(type, (message) => {
+            onEvent(JSON.parse((message as MessageEvent).data));
+        }));
+        return source;
     }
 };
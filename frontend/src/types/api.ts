@@ -107,3 +107,26 @@ export interface WhaleAlert {
         ema_200?: number;
     };
 }
+
+export interface DashboardBundle {
+    contracts: Contract[];
+    alerts: WhaleAlert[];
+    heatmap: any;
+    radar: any;
+}
+
+export interface ServerEvent {
+    type: 'pipeline_stage' | 'reports_loaded' | 'alert';
+    data: Record<string, any>;
+    published_at: string;
+}
+
+// Rows changed since a data version, keyed by (contract_id, report_date)
+export interface SyncResponse {
+    since: number;
+    version: number;
+    full_resync: boolean;
+    reports: Record<string, any>[];
+    alerts: Record<string, any>[];
+    prices: Record<string, any>[];
+}